@@ -12,8 +12,7 @@ from fastapi import (
     Request,
 )
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from loguru import logger
@@ -33,8 +32,8 @@ from src.db.models.user import User, Guardian
 from src.db.models.school import School, SchoolStudent, SchoolStaff
 from src.db.models.professor import SchoolProfessor
 from src.core.security import (
-    verify_password,
-    get_password_hash,
+    averify_and_update_password,
+    aget_password_hash,
     create_access_token,
     create_refresh_token,
 )
@@ -42,7 +41,6 @@ from src.core.security import (
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 # Security setup
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token")
 
 
@@ -112,7 +110,7 @@ async def get_current_user(
         token_data = TokenData(
             username=username, user_type=user_type, school_id=school_id
         )
-    except JWTError as e:
+    except jwt.InvalidTokenError as e:
         logger.error(f"JWT error: {str(e)}")
         raise credentials_exception
 
@@ -302,7 +300,7 @@ async def register(
                 detail=f"Password must be at least {settings.MIN_PASSWORD_LENGTH} characters",
             )
 
-        hashed_password = get_password_hash(user_create.password)
+        hashed_password = await aget_password_hash(user_create.password)
 
         # Create user object
         db_user = User(
@@ -350,7 +348,13 @@ async def login(
         user = result.scalars().first()
 
         # Check if user exists and password is correct
-        if not user or not verify_password(user_data.password, user.hashed_password):
+        password_valid, new_hash = False, None
+        if user:
+            password_valid, new_hash = await averify_and_update_password(
+                user_data.password, user.hashed_password
+            )
+
+        if not password_valid:
             # Update failed login attempts for rate limiting
             if user:
                 user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
@@ -380,6 +384,10 @@ async def login(
                 detail="Account is locked. Please contact support.",
             )
 
+        # Upgrade hashes using a deprecated scheme or parameters
+        if new_hash:
+            user.hashed_password = new_hash
+
         # Reset failed login counter on successful login
         user.failed_login_attempts = 0
         user.last_login = datetime.utcnow()
@@ -598,7 +606,10 @@ async def school_login(
             )
 
         # Check if password is correct
-        if not verify_password(login_data.password, user.hashed_password):
+        password_valid, new_hash = await averify_and_update_password(
+            login_data.password, user.hashed_password
+        )
+        if not password_valid:
             logger.warning(f"Invalid password for user: {user.username}")
 
             # Update failed login attempts for rate limiting
@@ -627,6 +638,10 @@ async def school_login(
                 detail="Account is locked. Please contact your school administrator.",
             )
 
+        # Upgrade hashes using a deprecated scheme or parameters
+        if new_hash:
+            user.hashed_password = new_hash
+
         # Reset failed login counter on successful login
         user.failed_login_attempts = 0
         user.last_login = datetime.utcnow()
@@ -952,7 +967,7 @@ async def refresh_token(
 
         return {"access_token": access_token, "token_type": "bearer"}
 
-    except JWTError:
+    except jwt.InvalidTokenError:
         raise credentials_exception
     except Exception as e:
         logger.error(f"Error during token refresh: {str(e)}")
@@ -11,7 +11,8 @@ from typing import List, Optional, Dict
 import json
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
 from sqlalchemy.engine import Result
 
 from ...db.models.community import (
@@ -20,6 +21,7 @@ from ...db.models.community import (
     ForumPost,
     ForumReply,
     CommunityFeedItem,
+    get_or_create_tags,
 )
 from ...db.models.user import User
 from ...core.security import decode_access_token
@@ -355,37 +357,31 @@ async def get_recent_feed_items(db: AsyncSession, user_id: int, limit: int = 20)
 
 @router.get("/study-groups")
 async def get_study_groups(db: AsyncSession = Depends(get_session)):
-    stmt = select(StudyGroup)
+    # Load subjects and creators with the groups instead of once per group
+    stmt = select(StudyGroup).options(
+        selectinload(StudyGroup.subject), selectinload(StudyGroup.creator)
+    )
     result = await db.execute(stmt)
     groups = result.scalars().all()
 
+    # Count members of all groups in one query
+    member_count_stmt = select(StudyGroupMember.group_id, func.count()).group_by(
+        StudyGroupMember.group_id
+    )
+    member_counts = dict((await db.execute(member_count_stmt)).all())
+
     # Convert to response model
     response = []
     for group in groups:
-        # Count members
-        member_count_stmt = select(StudyGroupMember).where(
-            StudyGroupMember.group_id == group.id
+        subject = (
+            {"id": group.subject.id, "name": group.subject.name}
+            if group.subject
+            else None
         )
-        member_result = await db.execute(member_count_stmt)
-        member_count = len(member_result.scalars().all())
-
-        # Get subject if available
-        subject = None
-        if group.subject_id:
-            from ...db.models.content import Subject
-
-            subject_stmt = select(Subject).where(Subject.id == group.subject_id)
-            subject_result = await db.execute(subject_stmt)
-            subject_obj = subject_result.scalar_one_or_none()
-            if subject_obj:
-                subject = {"id": subject_obj.id, "name": subject_obj.name}
-
-        # Get creator info
-        creator_stmt = select(User).where(User.id == group.created_by)
-        creator_result = await db.execute(creator_stmt)
-        creator = creator_result.scalar_one_or_none()
         creator_info = (
-            {"id": creator.id, "full_name": creator.full_name} if creator else None
+            {"id": group.creator.id, "full_name": group.creator.full_name}
+            if group.creator
+            else None
         )
 
         response.append(
@@ -393,7 +389,7 @@ async def get_study_groups(db: AsyncSession = Depends(get_session)):
                 "id": group.id,
                 "name": group.name,
                 "description": group.description,
-                "member_count": member_count,
+                "member_count": member_counts.get(group.id, 0),
                 "is_private": group.is_private,
                 "subject": subject,
                 "created_by": creator_info,
@@ -522,13 +518,19 @@ async def get_forum_posts(db: AsyncSession = Depends(get_session)):
     )
 
     result: Result[Tuple[ForumPost, User]] = await db.execute(stmt)
+    rows = result.all()
+
+    # Count replies of all listed posts in one query
+    reply_count_stmt = (
+        select(ForumReply.post_id, func.count())
+        .where(ForumReply.post_id.in_([post.id for post, _ in rows]))
+        .group_by(ForumReply.post_id)
+    )
+    reply_counts = dict((await db.execute(reply_count_stmt)).all())
 
     posts = []
-    for post, author in result:
-        # Get reply count
-        reply_stmt = select(ForumReply).where(ForumReply.post_id == post.id)
-        reply_result = await db.execute(reply_stmt)
-        reply_count = len(reply_result.scalars().all())
+    for post, author in rows:
+        reply_count = reply_counts.get(post.id, 0)
 
         posts.append(
             {
@@ -545,7 +547,7 @@ async def get_forum_posts(db: AsyncSession = Depends(get_session)):
                 "view_count": post.view_count,
                 "upvote_count": post.upvote_count,
                 "reply_count": reply_count,
-                "tags": post.tags,
+                "tags": [tag.name for tag in post.tags],
                 "is_pinned": post.is_pinned,
             }
         )
@@ -566,7 +568,7 @@ async def create_forum_post(
         content=data["content"],
         subject_id=data.get("subject_id"),
         topic_id=data.get("topic_id"),
-        tags=data.get("tags", []),
+        tags=await get_or_create_tags(db, data.get("tags", [])),
     )
 
     db.add(new_post)
@@ -17,7 +17,7 @@ from datetime import datetime, timedelta
 import asyncio
 import logging
 
-from src.db.postgresql import get_session
+from src.db.postgresql import get_session, postgres_db
 from src.db.models.user import User
 from src.db.models.school import SchoolCourse, SchoolStaff, Department
 from src.api.endpoints.auth import get_current_active_user
@@ -27,7 +27,10 @@ from src.core.security import decode_access_token
 from starlette.websockets import WebSocketState
 
 from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 from src.db.models import (
+    CourseGenerationMessage,
     CourseGenerationSession,
     SchoolProfessor,
     Assignment,
@@ -45,6 +48,9 @@ active_connections: Dict[str, Dict[str, WebSocket]] = {}
 # Maintain active generation sessions
 active_sessions: Dict[str, Dict[str, Any]] = {}
 
+# Messages kept queued per session while the database is unreachable
+MAX_PENDING_MESSAGES = 200
+
 
 # Models
 class CourseGenerationRequest(BaseModel):
@@ -233,10 +239,15 @@ class CourseGenerator:
                 "data": data,
                 "course_data": None,
                 "messages": [],
+                # Messages not yet written to course_generation_messages
+                "pending_messages": [],
                 "files": [],
                 "start_time": datetime.utcnow(),
             }
 
+        # The transcript is stored against the session row, so make sure it exists
+        await CourseGenerator.ensure_session_record(session_id, user_id, data, db)
+
         # Add generation task to background tasks
         background_tasks.add_task(
             CourseGenerator.generate_course,
@@ -253,6 +264,37 @@ class CourseGenerator:
             "message": "Course generation has been started in the background.",
         }
 
+    @staticmethod
+    async def ensure_session_record(
+        session_id: str, user_id: str, data: Dict[str, Any], db: AsyncSession
+    ):
+        """Insert the session row for a generation started without one."""
+        if await db.get(CourseGenerationSession, session_id):
+            return
+
+        # /start sends snake_case fields, the websocket client camelCase ones
+        def field(snake: str, camel: str, default: Optional[str] = None):
+            return data.get(snake) or data.get(camel) or default
+
+        db.add(
+            CourseGenerationSession(
+                id=session_id,
+                user_id=int(user_id),
+                subject=field("subject_area", "subjectArea", ""),
+                education_level=field("education_level", "educationLevel", ""),
+                duration=field("course_duration", "courseDuration", "semester"),
+                difficulty=field("difficulty_level", "difficultyLevel", "intermediate"),
+                preferences={
+                    "key_topics": field("key_topics", "keyTopics"),
+                    "additional_context": field(
+                        "additional_context", "additionalContext"
+                    ),
+                },
+                status="brainstorming",
+            )
+        )
+        await db.commit()
+
     @staticmethod
     async def generate_course(
         session_id: str, user_id: str, data: Dict[str, Any], db: AsyncSession
@@ -727,6 +769,7 @@ class CourseGenerator:
                 "assistant",
                 "I've completed the course generation! You can now review, edit, and save the course. Feel free to ask if you need any adjustments.",
             )
+            await CourseGenerator.flush_messages(session_id)
 
             await llm.close()
 
@@ -755,6 +798,9 @@ class CourseGenerator:
             active_sessions[session_id]["progress"] = progress
             active_sessions[session_id]["current_step"] = step
 
+            # Status changes are the checkpoints queued messages are written at
+            await CourseGenerator.flush_messages(session_id)
+
             # Broadcast status update
             await ConnectionManager.broadcast(
                 session_id,
@@ -778,6 +824,9 @@ class CourseGenerator:
             }
 
             active_sessions[session_id]["messages"].append(message)
+            active_sessions[session_id].setdefault("pending_messages", []).append(
+                message
+            )
 
             # Only broadcast non-user messages to prevent duplicates
             # User messages are already shown optimistically in the frontend
@@ -786,6 +835,46 @@ class CourseGenerator:
                     session_id, {"type": "message", **message}
                 )
 
+    @staticmethod
+    async def flush_messages(session_id: str):
+        """Write the session's queued messages to its stored transcript at once."""
+        if session_id not in active_sessions:
+            return
+
+        pending = active_sessions[session_id].get("pending_messages")
+        if not pending:
+            return
+
+        messages = list(pending)
+        pending.clear()
+        try:
+            async with postgres_db.get_session() as db:
+                db.add_all(
+                    [
+                        CourseGenerationMessage(
+                            session_id=session_id,
+                            message_id=message["messageId"],
+                            role=message["role"],
+                            content=message["content"],
+                        )
+                        for message in messages
+                    ]
+                )
+                await db.commit()
+        except IntegrityError as e:
+            # Retrying can't succeed, e.g. the session row is gone
+            logger.error(f"Dropping messages for session {session_id}: {e}")
+        except Exception as e:
+            logger.error(f"Failed to store messages for session {session_id}: {e}")
+            # Keep them queued for the next checkpoint, up to a bound
+            pending[:0] = messages
+            if len(pending) > MAX_PENDING_MESSAGES:
+                logger.warning(
+                    f"Dropping {len(pending) - MAX_PENDING_MESSAGES} queued "
+                    f"messages for session {session_id}"
+                )
+                del pending[:-MAX_PENDING_MESSAGES]
+
     @staticmethod
     async def process_user_message(
         session_id: str, user_id: str, content: str, db: AsyncSession
@@ -881,8 +970,9 @@ class CourseGenerator:
             # Generate response
             response_text = await llm.generate(messages, config)
 
-            # Add AI response to session
+            # Add AI response to session and store the exchange in one write
             await CourseGenerator.add_message(session_id, "assistant", response_text)
+            await CourseGenerator.flush_messages(session_id)
 
             # Check if we need to update the course based on the user message
             update_course = False
@@ -1115,6 +1205,7 @@ class CourseGenerator:
 
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}")
+            await CourseGenerator.flush_messages(session_id)
             await ConnectionManager.broadcast(
                 session_id,
                 {
@@ -1602,7 +1693,9 @@ async def get_course_generation_session(
 ):
     """Get a specific course generation session."""
     result = await db.execute(
-        select(CourseGenerationSession).where(
+        select(CourseGenerationSession)
+        .options(selectinload(CourseGenerationSession.messages))
+        .where(
             and_(
                 CourseGenerationSession.id == session_id,
                 CourseGenerationSession.user_id == current_user.id,
@@ -1615,6 +1708,15 @@ async def get_course_generation_session(
         raise HTTPException(status_code=404, detail="Session not found")
 
     course_data = session.course_data or {}
+    messages = [
+        {
+            "messageId": message.message_id,
+            "role": message.role,
+            "content": message.content,
+            "timestamp": message.created_at.isoformat(),
+        }
+        for message in session.messages
+    ]
 
     return {
         "sessionId": session.id,
@@ -1622,7 +1724,7 @@ async def get_course_generation_session(
         "progress": session.progress,
         "currentStep": session.current_step,
         "courseData": course_data,
-        "messages": session.messages,
+        "messages": messages,
         "error": session.error_message,
         "subject": session.subject,
         "educationLevel": session.education_level,
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from sqlalchemy.orm import selectinload
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -378,10 +379,15 @@ async def get_recommendations(
 ):
     """Get personalized recommendations for the user"""
     try:
-        # Get user's recommendations
+        # Get user's recommendations with their subject, topic and course
         result = await db.execute(
             select(Recommendation)
             .where(Recommendation.user_id == current_user.id)
+            .options(
+                selectinload(Recommendation.subject),
+                selectinload(Recommendation.topic),
+                selectinload(Recommendation.course),
+            )
             .order_by(Recommendation.priority, Recommendation.created_at.desc())
             .offset(offset)
             .limit(limit)
@@ -401,38 +407,28 @@ async def get_recommendations(
             }
 
             # Add subject, topic, or course info if available
-            if rec.subject_id:
-                result = await db.execute(
-                    select(Subject).where(Subject.id == rec.subject_id)
+            subject = rec.subject
+            if subject:
+                formatted_rec["subject"] = subject.name
+                formatted_rec["icon"] = get_subject_icon(subject.name)
+                formatted_rec["colorClass"] = get_subject_color_class(subject.name)
+
+            topic = rec.topic
+            if topic:
+                formatted_rec["topic"] = topic.name
+
+            course = rec.course
+            if course:
+                formatted_rec["category"] = course.title
+                formatted_rec["level"] = f"Niveau {course.difficulty_level}"
+                formatted_rec["duration"] = (
+                    f"{course.meta_data.get('duration_hours', 0)} heures"
+                    if course.meta_data
+                    else None
                 )
-                subject = result.scalars().first()
-                if subject:
-                    formatted_rec["subject"] = subject.name
-                    formatted_rec["icon"] = get_subject_icon(subject.name)
-                    formatted_rec["colorClass"] = get_subject_color_class(subject.name)
-
-            if rec.topic_id:
-                result = await db.execute(select(Topic).where(Topic.id == rec.topic_id))
-                topic = result.scalars().first()
-                if topic:
-                    formatted_rec["topic"] = topic.name
-
-            if rec.course_id:
-                result = await db.execute(
-                    select(Course).where(Course.id == rec.course_id)
+                formatted_rec["tags"] = (
+                    course.meta_data.get("tags", []) if course.meta_data else []
                 )
-                course = result.scalars().first()
-                if course:
-                    formatted_rec["category"] = course.title
-                    formatted_rec["level"] = f"Niveau {course.difficulty_level}"
-                    formatted_rec["duration"] = (
-                        f"{course.meta_data.get('duration_hours', 0)} heures"
-                        if course.meta_data
-                        else None
-                    )
-                    formatted_rec["tags"] = (
-                        course.meta_data.get("tags", []) if course.meta_data else []
-                    )
 
             formatted_recommendations.append(formatted_rec)
 
@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, Background
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import or_, and_, desc, asc, delete
+from sqlalchemy.exc import IntegrityError
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field, EmailStr
 from typing import Optional, List, Dict, Any
 from datetime import datetime
@@ -11,7 +13,13 @@ import json
 
 from src.db.postgresql import get_session
 from src.db.models.user import User
-from src.db.models.notes import Note, NoteFolder, NoteCollaborator, AISuggestion
+from src.db.models.notes import (
+    Note,
+    NoteFolder,
+    NoteCollaborator,
+    AISuggestion,
+    NoteRenderCache,
+)
 from src.api.endpoints.auth import get_current_active_user
 from src.services.note_ai_service import NoteAIService
 
@@ -25,7 +33,7 @@ router = APIRouter(prefix="/notes", tags=["notes"])
 class NoteBase(BaseModel):
     title: str
     content: str
-    folder_id: Optional[str] = None
+    folder_id: Optional[uuid.UUID] = None
     tags: Optional[List[str]] = None
     ai_enhanced: Optional[bool] = None
 
@@ -37,13 +45,13 @@ class NoteCreate(NoteBase):
 class NoteUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
-    folder_id: Optional[str] = None
+    folder_id: Optional[uuid.UUID] = None
     tags: Optional[List[str]] = None
     ai_enhanced: Optional[bool] = None
 
 
 class NoteResponse(NoteBase):
-    id: str
+    id: uuid.UUID
     owner_id: str
     created_at: datetime
     updated_at: datetime
@@ -58,7 +66,7 @@ class NoteResponse(NoteBase):
 
 class FolderBase(BaseModel):
     name: str
-    parent_id: Optional[str] = None
+    parent_id: Optional[uuid.UUID] = None
 
 
 class FolderCreate(FolderBase):
@@ -67,11 +75,11 @@ class FolderCreate(FolderBase):
 
 class FolderUpdate(BaseModel):
     name: Optional[str] = None
-    parent_id: Optional[str] = None
+    parent_id: Optional[uuid.UUID] = None
 
 
 class FolderResponse(FolderBase):
-    id: str
+    id: uuid.UUID
     owner_id: str
     created_at: datetime
     updated_at: datetime
@@ -105,7 +113,7 @@ class AISuggestionCreate(BaseModel):
 
 
 class AISuggestionResponse(BaseModel):
-    id: str
+    id: uuid.UUID
     content: str
     type: str
     created_at: datetime
@@ -131,14 +139,14 @@ class FoldersList(BaseModel):
 
 
 # Helper functions
-async def get_note_by_id(note_id: str, db: AsyncSession) -> Optional[Note]:
+async def get_note_by_id(note_id: uuid.UUID, db: AsyncSession) -> Optional[Note]:
     """Get note by ID."""
     result = await db.execute(select(Note).where(Note.id == note_id))
     return result.scalars().first()
 
 
 async def check_note_access(
-    note_id: str, user_id: int, required_permission: str, db: AsyncSession
+    note_id: uuid.UUID, user_id: int, required_permission: str, db: AsyncSession
 ) -> Note:
     """Check if user has access to the note with specified permission level."""
     note = await get_note_by_id(note_id, db)
@@ -186,14 +194,16 @@ async def check_note_access(
     )
 
 
-async def get_folder_by_id(folder_id: str, db: AsyncSession) -> Optional[NoteFolder]:
+async def get_folder_by_id(
+    folder_id: uuid.UUID, db: AsyncSession
+) -> Optional[NoteFolder]:
     """Get folder by ID."""
     result = await db.execute(select(NoteFolder).where(NoteFolder.id == folder_id))
     return result.scalars().first()
 
 
 async def check_folder_access(
-    folder_id: str, user_id: int, db: AsyncSession
+    folder_id: uuid.UUID, user_id: int, db: AsyncSession
 ) -> NoteFolder:
     """Check if user has access to the folder."""
     folder = await get_folder_by_id(folder_id, db)
@@ -220,31 +230,22 @@ async def get_user_by_email(email: str, db: AsyncSession) -> Optional[User]:
 
 async def format_note_response(note: Note, db: AsyncSession) -> Dict[str, Any]:
     """Format note response with collaborators and other related data."""
-    # Get collaborators
-    result = await db.execute(
-        select(NoteCollaborator).where(NoteCollaborator.note_id == note.id)
-    )
-    collaborators = result.scalars().all()
-
-    collaborator_data = []
-    for collab in collaborators:
-        # Get user info
-        user_result = await db.execute(select(User).where(User.id == collab.user_id))
-        user = user_result.scalars().first()
-
-        if user:
-            collaborator_data.append(
-                {
-                    "id": str(collab.id),
-                    "user_id": str(collab.user_id),
-                    "note_id": str(collab.note_id),
-                    "permissions": collab.permissions,
-                    "joined_at": collab.joined_at,
-                    "name": user.full_name,
-                    "email": user.email,
-                    # You can add avatar if you have it in your user model
-                }
-            )
+    # Collaborators and their users are eager-loaded with the note
+    collaborators = note.collaborators
+
+    collaborator_data = [
+        {
+            "id": str(collab.id),
+            "user_id": str(collab.user_id),
+            "note_id": str(collab.note_id),
+            "permissions": collab.permissions,
+            "joined_at": collab.joined_at,
+            "name": collab.user.full_name,
+            "email": collab.user.email,
+            # You can add avatar if you have it in your user model
+        }
+        for collab in collaborators
+    ]
 
     # Format note data
     note_data = {
@@ -334,7 +335,13 @@ async def get_notes(
         )
 
     if folder_id:
-        base_query = base_query.where(Note.folder_id == folder_id)
+        try:
+            folder_uuid = uuid.UUID(folder_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid folder ID"
+            )
+        base_query = base_query.where(Note.folder_id == folder_uuid)
     elif folder_id == "":  # Explicitly looking for root notes
         base_query = base_query.where(Note.folder_id.is_(None))
 
@@ -420,7 +427,7 @@ async def create_note(
 
     # Create new note
     new_note = Note(
-        id=str(uuid.uuid4()),
+        id=uuid.uuid4(),
         title=note_data.title,
         content=note_data.content,
         folder_id=note_data.folder_id,
@@ -443,7 +450,7 @@ async def create_note(
 
 @router.get("/{note_id}", response_model=NoteResponse)
 async def get_note(
-    note_id: str,
+    note_id: uuid.UUID,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_session),
 ):
@@ -451,14 +458,33 @@ async def get_note(
     # Check access (read permission)
     note = await check_note_access(note_id, current_user.id, "read", db)
 
-    # Format response
-    formatted_note = await format_note_response(note, db)
+    # Serve the pre-rendered payload while it matches the note's render version
+    cached = await db.get(NoteRenderCache, note.id)
+    if cached and cached.version == note.render_version:
+        return cached.payload
+
+    # Format response and cache it for the next read
+    formatted_note = jsonable_encoder(await format_note_response(note, db))
+    if cached:
+        cached.payload = formatted_note
+        cached.version = note.render_version
+    else:
+        db.add(
+            NoteRenderCache(
+                note_id=note.id, payload=formatted_note, version=note.render_version
+            )
+        )
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent read cached the note first
+        await db.rollback()
     return formatted_note
 
 
 @router.put("/{note_id}", response_model=NoteResponse)
 async def update_note(
-    note_id: str,
+    note_id: uuid.UUID,
     note_data: NoteUpdate,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_session),
@@ -493,7 +519,7 @@ async def update_note(
 
 @router.delete("/{note_id}", status_code=status.HTTP_200_OK)
 async def delete_note(
-    note_id: str,
+    note_id: uuid.UUID,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_session),
 ):
@@ -558,7 +584,7 @@ async def create_folder(
 
     # Create new folder
     new_folder = NoteFolder(
-        id=str(uuid.uuid4()),
+        id=uuid.uuid4(),
         name=folder_data.name,
         parent_id=folder_data.parent_id,
         owner_id=current_user.id,
@@ -575,7 +601,7 @@ async def create_folder(
 
 @router.put("/folders/{folder_id}", response_model=FolderResponse)
 async def update_folder(
-    folder_id: str,
+    folder_id: uuid.UUID,
     folder_data: FolderUpdate,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_session),
@@ -627,7 +653,7 @@ async def update_folder(
 
 @router.delete("/folders/{folder_id}", status_code=status.HTTP_200_OK)
 async def delete_folder(
-    folder_id: str,
+    folder_id: uuid.UUID,
     recursive: bool = False,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_session),
@@ -713,7 +739,7 @@ async def delete_folder(
     status_code=status.HTTP_201_CREATED,
 )
 async def share_note(
-    note_id: str,
+    note_id: uuid.UUID,
     collaborator_data: CollaboratorCreate,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_session),
@@ -748,7 +774,7 @@ async def share_note(
     else:
         # Create new collaborator
         collaborator = NoteCollaborator(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4(),
             note_id=note_id,
             user_id=user.id,
             permissions=collaborator_data.permissions,
@@ -772,7 +798,7 @@ async def share_note(
 
 @router.delete("/{note_id}/collaborators/{user_id}", status_code=status.HTTP_200_OK)
 async def remove_collaborator(
-    note_id: str,
+    note_id: uuid.UUID,
     user_id: int,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_session),
@@ -804,7 +830,7 @@ async def remove_collaborator(
 # AI suggestions endpoints
 @router.get("/{note_id}/ai-suggestions", response_model=AISuggestionsList)
 async def get_ai_suggestions(
-    note_id: str,
+    note_id: uuid.UUID,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_session),
 ):
@@ -832,7 +858,7 @@ async def get_ai_suggestions(
     status_code=status.HTTP_201_CREATED,
 )
 async def create_ai_suggestion(
-    note_id: str,
+    note_id: uuid.UUID,
     suggestion_data: AISuggestionCreate,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_session),
@@ -848,7 +874,7 @@ async def create_ai_suggestion(
 
     # Create suggestion
     suggestion = AISuggestion(
-        id=str(uuid.uuid4()),
+        id=uuid.uuid4(),
         note_id=note_id,
         content=suggestion_data.content,
         type=suggestion_data.type,
@@ -902,7 +928,7 @@ async def note_suggestions_websocket(
             user_id = user.id
             if note_id:
                 try:
-                    await check_note_access(note_id, user_id, "write", db)
+                    await check_note_access(uuid.UUID(note_id), user_id, "write", db)
                 except HTTPException as e:
                     await websocket.close(code=1008, reason=f"Access denied: {str(e)}")
                     return
@@ -978,7 +1004,7 @@ async def note_suggestions_websocket(
 
 @router.post("/{note_id}/generate-suggestions", response_model=AISuggestionsList)
 async def generate_ai_suggestions(
-    note_id: str,
+    note_id: uuid.UUID,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_session),
@@ -1012,8 +1038,8 @@ async def generate_ai_suggestions(
     "/{note_id}/ai-suggestions/{suggestion_id}/apply", response_model=NoteResponse
 )
 async def apply_ai_suggestion(
-    note_id: str,
-    suggestion_id: str,
+    note_id: uuid.UUID,
+    suggestion_id: uuid.UUID,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_session),
 ):
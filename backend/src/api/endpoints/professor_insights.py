@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from sqlmodel import select, func
 
 from src.api.endpoints.auth import get_current_user
@@ -29,7 +30,6 @@ from src.db.models import (
     ClassSchedule,
     ProfessorClassCourses,
 )
-from src.db.qdrant import QdrantClientWrapper
 from src.core.ai.analytics_engine import AnalyticsEngine
 
 # Import Pydantic models for request/response
@@ -42,12 +42,9 @@ from src.api.models.professor_student_analytics import (
     VisualizationDataResponse,
 )
 
-from qdrant_client import models
-
 router = APIRouter(prefix="/professor/insights", tags=["professor_insights"])
 
 # Initialize clients
-qdrant_client = QdrantClientWrapper()
 analytics_engine = AnalyticsEngine()
 
 
@@ -702,41 +699,8 @@ async def get_visualization_data(
     for i, topic_id in enumerate(topic_map.keys()):
         topic_colors[topic_id] = graph_colors[i % len(graph_colors)]
 
-    # Initialize Qdrant client if not already initialized
-    if not qdrant_client.client:
-        await qdrant_client.init_client()
-
-    # Get embeddings from Qdrant
-    session_embeddings = []
-    for session in sessions:
-        # Query Qdrant for session embeddings
-        # Build filter condition for session ID
-        filter_condition = models.Filter(
-            must=[
-                models.FieldCondition(
-                    key="session_id", match=models.MatchValue(value=str(session.id))
-                )
-            ]
-        )
-
-        # Search for the session in Qdrant
-        embedding_results = await qdrant_client.search_similar(
-            collection_name="tutoring_sessions",
-            query_vector=None,  # Not using similarity search here
-            limit=1,
-            filter_condition=filter_condition,
-        )
-
-        if embedding_results:
-            embedding = embedding_results[0]
-            session_embeddings.append(
-                {
-                    "id": str(session.id),
-                    "topic_id": str(session.topic_id),
-                    "embedding": embedding.get("embedding", []),
-                    "label": f"{session.topic_name}: {session.initial_query[:50]}...",
-                }
-            )
+    # Get embeddings from Qdrant for all sessions at once
+    session_embeddings = await analytics_engine.fetch_session_embeddings(sessions)
 
     # If we don't have embeddings, use PCA to create 3D visualization from session data
     if not session_embeddings:
@@ -776,13 +740,16 @@ async def get_visualization_data(
             topic_map=topic_map,
             topic_colors=topic_colors,
             sessions=sessions,
+            cache_key=(class_id, student_id, time_range),
         )
 
         return visualization_data
 
     # Use analytics engine to create PCA from embeddings
     visualization_data = await analytics_engine.process_embeddings(
-        embeddings=session_embeddings, topic_map=topic_map, topic_colors=topic_colors
+        embeddings=session_embeddings,
+        topic_map=topic_map,
+        topic_colors=topic_colors,
     )
 
     return visualization_data
@@ -819,7 +786,13 @@ async def export_insights_report(
     # Get student details if specified
     student_details = None
     if student_id:
-        student_query = select(SchoolStudent).where(SchoolStudent.id == student_id)
+        # Eager-load the user; the report is rendered off the event loop where
+        # lazy loads cannot run
+        student_query = (
+            select(SchoolStudent)
+            .options(selectinload(SchoolStudent.user))
+            .where(SchoolStudent.id == student_id)
+        )
         student_result = await db.execute(student_query)
         student_details = student_result.scalar_one_or_none()
 
@@ -18,7 +18,12 @@ from ..models.professor import (
     CourseResponse,
     CourseItem,
 )
-from ...db.models.professor import SchoolProfessor, ProfessorCourse, CourseMaterial
+from ...db.models.professor import (
+    SchoolProfessor,
+    ProfessorCourse,
+    CourseMaterial,
+    replace_professor_availability,
+)
 from ...db.models.school import (
     SchoolCourse,
     ClassSchedule,
@@ -167,6 +172,9 @@ async def update_onboarding_availability(
     professor.contact_preferences = availability_data.contact_preferences
     professor.tutoring_availability = availability_data.tutoring_availability
     professor.max_students = availability_data.max_students
+    await replace_professor_availability(
+        session, professor.id, availability_data.office_hours
+    )
 
     # Update onboarding status
     professor.onboarding_step = "courses"
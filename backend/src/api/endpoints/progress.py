@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
 from sqlmodel import Session, select
+from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 
 from src.db import get_session
@@ -19,6 +20,7 @@ from src.api.models.progress import (
 )
 from src.db.models.progress import Enrollment, Activity
 from src.db.models.content import Subject, Lesson, Topic
+from src.db.views import user_progress_summary
 from src.db.models.user import User, Guardian
 from src.api.endpoints.auth import get_current_active_user
 from src.api.dependencies import get_authorized_student
@@ -444,7 +446,11 @@ async def update_activity(
     Update a learning activity with progress, results, or status changes.
     """
     # Get the activity
-    activity = session.get(Activity, activity_id)
+    activity = (
+        (await session.execute(select(Activity).where(Activity.id == activity_id)))
+        .scalars()
+        .first()
+    )
     if not activity:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Activity not found"
@@ -857,25 +863,48 @@ async def get_progress_summary(
 
     result = await session.execute(query)
     enrollments = result.scalars().all()
+    subject_ids = [enrollment.subject_id for enrollment in enrollments]
+
+    # Lesson counts for all enrolled subjects in one query
+    lesson_counts_query = (
+        select(Topic.subject_id, func.count(Lesson.id))
+        .join(Lesson, Lesson.topic_id == Topic.id)
+        .where(Topic.subject_id.in_(subject_ids))
+        .group_by(Topic.subject_id)
+    )
+    lesson_counts = dict((await session.execute(lesson_counts_query)).all())
+
+    # All-time totals and last activity per subject come precomputed from the
+    # user_progress_summary materialized view (refreshed periodically)
+    summary_query = select(user_progress_summary).where(
+        user_progress_summary.c.user_id == current_user.id
+    )
+    summaries = {row.subject_id: row for row in await session.execute(summary_query)}
+
+    # Time spent within the period still needs the live activity rows
+    period_seconds = {}
+    if start_date:
+        period_seconds_query = (
+            select(Topic.subject_id, func.sum(Activity.duration_seconds))
+            .join(Lesson, Lesson.id == Activity.lesson_id)
+            .join(Topic, Topic.id == Lesson.topic_id)
+            .where(
+                Activity.user_id == current_user.id,
+                Activity.start_time >= start_date,
+                Topic.subject_id.in_(subject_ids),
+            )
+            .group_by(Topic.subject_id)
+        )
+        period_seconds = dict((await session.execute(period_seconds_query)).all())
 
     subject_progress_list = []
 
     for enrollment in enrollments:
         subject = enrollment.subject
-
-        # Get topics for this subject
-        topics_query = select(Topic).where(Topic.subject_id == subject.id)
-        topics_result = await session.execute(topics_query)
-        topics = topics_result.scalars().all()
-
-        # Get lessons for these topics
-        topic_ids = [topic.id for topic in topics]
-        lessons_query = select(Lesson).where(Lesson.topic_id.in_(topic_ids))
-        lessons_result = await session.execute(lessons_query)
-        lessons = lessons_result.scalars().all()
+        summary = summaries.get(subject.id)
 
         # Total lessons in subject
-        total_lessons = len(lessons)
+        total_lessons = lesson_counts.get(subject.id, 0)
 
         # Get completed lessons from progress data
         completed_lesson_ids = enrollment.progress_data.get("completed_lessons", [])
@@ -886,33 +915,11 @@ async def get_progress_summary(
             (completed_lessons / total_lessons * 100) if total_lessons > 0 else 0
         )
 
-        # Get activities for this subject's lessons
-        lesson_ids = [lesson.id for lesson in lessons]
-
-        # Activity query with date filter if applicable
-        activity_query = select(Activity).where(
-            Activity.user_id == current_user.id, Activity.lesson_id.in_(lesson_ids)
-        )
-
-        if start_date:
-            activity_query = activity_query.where(Activity.start_time >= start_date)
-
-        activities_result = await session.execute(activity_query)
-        activities = activities_result.scalars().all()
-
         # Calculate time spent on this subject in the specified period
-        total_time_spent = sum(a.duration_seconds or 0 for a in activities)
-
-        # Get the most recent activity for this subject
-        recent_activity_query = (
-            select(Activity)
-            .where(Activity.user_id == current_user.id)
-            .where(Activity.lesson_id.in_(lesson_ids))
-            .order_by(Activity.start_time.desc())
-            .limit(1)
-        )
-        recent_activity_result = await session.execute(recent_activity_query)
-        recent_activity = recent_activity_result.scalar_one_or_none()
+        if start_date:
+            total_time_spent = period_seconds.get(subject.id) or 0
+        else:
+            total_time_spent = summary.total_seconds if summary else 0
 
         # Create subject progress object
         subject_progress = SubjectProgress(
@@ -922,7 +929,7 @@ async def get_progress_summary(
             completed_lessons=completed_lessons,
             completion_percentage=completion_percentage,
             time_spent_seconds=total_time_spent,
-            last_activity_date=recent_activity.start_time if recent_activity else None,
+            last_activity_date=summary.last_activity_at if summary else None,
         )
 
         subject_progress_list.append(subject_progress)
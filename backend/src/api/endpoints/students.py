@@ -21,7 +21,7 @@ from ...db.models.school import (
 )
 from ...db.models.professor import SchoolProfessor, ProfessorCourse
 from ...db.models.user import User
-from ...db.models.communication import Notification
+from ...db.models.communication import NotificationType, bulk_create_notifications
 from ...db.models.progress import ScheduleEntry
 from ...db.postgresql import get_session
 from .auth import get_current_user
@@ -413,25 +413,22 @@ async def send_notifications(
 
     # Create notifications
     now = datetime.utcnow()
-    notifications = []
-
-    for user_id in student_user_ids:
-        notifications.append(
-            Notification(
-                user_id=user_id,
-                title=notification.title,
-                content=notification.content,
-                type="professor",
-                is_read=False,
-                created_at=now,
-                priority=notification.priority or "normal",
-                action_type=notification.action_type,
-                action_data=notification.action_data or {},
-            )
-        )
+    notifications = [
+        {
+            "user_id": user_id,
+            "title": notification.title,
+            "content": notification.content,
+            "type": NotificationType.PROFESSOR,
+            "is_read": False,
+            "created_at": now,
+            "action_type": notification.action_type,
+            "action_data": notification.action_data or {},
+        }
+        for user_id in student_user_ids
+    ]
 
     # Add notifications to database
-    session.add_all(notifications)
+    await bulk_create_notifications(session, notifications)
     await session.commit()
 
     return {"success": True, "count": len(notifications)}
@@ -561,16 +558,16 @@ async def assign_homework(
 
     # Verify students are enrolled in the course
     students = await session.execute(
-        select(SchoolStudent.id)
+        select(SchoolStudent.user_id)
         .join(CourseEnrollment, CourseEnrollment.student_id == SchoolStudent.id)
         .where(
             SchoolStudent.id.in_(homework.student_ids),
             CourseEnrollment.course_id == homework.course_id,
         )
     )
-    enrolled_student_ids = [row[0] for row in students.all()]
+    enrolled_user_ids = [row[0] for row in students.all()]
 
-    if not enrolled_student_ids:
+    if not enrolled_user_ids:
         raise HTTPException(
             status_code=404, detail="No valid students enrolled in this course"
         )
@@ -600,29 +597,21 @@ async def assign_homework(
     await session.refresh(assignment)
 
     # Create notifications for the students
-    notifications = []
-    for student_id in enrolled_student_ids:
-        # Get student user_id
-        student_result = await session.execute(
-            select(SchoolStudent.user_id).where(SchoolStudent.id == student_id)
-        )
-        user_id = student_result.scalar_one()
-
-        notifications.append(
-            Notification(
-                user_id=user_id,
-                title=f"New Homework Assigned: {homework.title}",
-                content=f"Due date: {due_date.strftime('%Y-%m-%d')}",
-                type="assignment",
-                is_read=False,
-                created_at=now,
-                priority="normal",
-                action_type="view_assignment",
-                action_data={"assignment_id": assignment.id},
-            )
-        )
-
-    session.add_all(notifications)
+    notifications = [
+        {
+            "user_id": user_id,
+            "title": f"New Homework Assigned: {homework.title}",
+            "content": f"Due date: {due_date.strftime('%Y-%m-%d')}",
+            "type": NotificationType.ASSIGNMENT,
+            "is_read": False,
+            "created_at": now,
+            "action_type": "view_assignment",
+            "action_data": {"assignment_id": assignment.id},
+        }
+        for user_id in enrolled_user_ids
+    ]
+
+    await bulk_create_notifications(session, notifications)
     await session.commit()
 
     return {"success": True, "assignmentId": assignment.id}
@@ -835,7 +835,7 @@ async def get_llm_options():
 
 # Create a new model for flashcards
 class Flashcard(BaseModel):
-    id: str
+    id: uuid.UUID
     session_id: str
     front: str
     back: str
@@ -850,7 +850,7 @@ class FlashcardCreate(BaseModel):
 
 
 class FlashcardUpdate(BaseModel):
-    id: str
+    id: uuid.UUID
     front: Optional[str] = None
     back: Optional[str] = None
     tags: Optional[List[str]] = None
@@ -940,7 +940,7 @@ async def create_flashcard(
         from src.db.models.flashcard import Flashcard as FlashcardModel
 
         new_flashcard = FlashcardModel(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4(),
             session_id=session_id,
             front=flashcard.front,
             back=flashcard.back,
@@ -1038,7 +1038,7 @@ async def update_flashcard(
 @router.delete("/session/{session_id}/flashcards/{flashcard_id}")
 async def delete_flashcard(
     session_id: str,
-    flashcard_id: str,
+    flashcard_id: uuid.UUID,
     db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -1169,7 +1169,7 @@ async def generate_flashcards(
         created_flashcards = []
         for card_data in generated_cards:
             new_card = FlashcardModel(
-                id=str(uuid.uuid4()),
+                id=uuid.uuid4(),
                 session_id=session_id,
                 front=card_data["front"],
                 back=card_data["back"],
@@ -7,7 +7,7 @@ from datetime import datetime
 
 from src.db.postgresql import get_session
 from src.db.models.user import User, Guardian
-from src.core.security import get_password_hash, verify_password
+from src.core.security import aget_password_hash, averify_password
 from src.api.endpoints.auth import get_current_user
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -104,7 +104,7 @@ async def change_password(
 ):
     """Change user password"""
     # Verify current password
-    if not verify_password(
+    if not await averify_password(
         password_data.current_password, current_user.hashed_password
     ):
         raise HTTPException(
@@ -113,7 +113,7 @@ async def change_password(
         )
 
     # Update password
-    current_user.hashed_password = get_password_hash(password_data.new_password)
+    current_user.hashed_password = await aget_password_hash(password_data.new_password)
     current_user.updated_at = datetime.utcnow()
 
     # Save changes
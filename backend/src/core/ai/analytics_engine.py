@@ -8,22 +8,36 @@ This module handles the complex analytics processing, including:
 4. Embedding-based content analysis
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from collections import Counter, OrderedDict, defaultdict
+from functools import lru_cache
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from datetime import datetime
+from string import Template
+from xml.sax.saxutils import escape
+import asyncio
+import hashlib
+import math
 import numpy as np
-import json
 import logging
+import orjson
+import threading
+import time
 import uuid
 from sklearn.decomposition import PCA
 from sklearn.feature_extraction.text import TfidfVectorizer
 import base64
 import io
-from fpdf import FPDF
-import matplotlib.pyplot as plt
+from fpdf import FPDF, XPos, YPos
+from json_repair import repair_json
 
-from src.db.qdrant import QdrantClientWrapper
+from qdrant_client import models
+
+from src.db.postgresql import postgres_db
+from src.db.qdrant import get_qdrant_client
+from src.core.ai.embeddings import EmbeddingModel
 from src.core.llm import LLM
 from src.db.models import (
     SchoolCourse,
@@ -39,8 +53,198 @@ from src.db.models import (
     Assignment,
 )
 
+
 logger = logging.getLogger(__name__)
 
+# Model fields included in the course data snapshot built by gather_course_data
+COURSE_FIELDS = frozenset(
+    {
+        "id",
+        "title",
+        "description",
+        "education_level",
+        "academic_track",
+        "syllabus",
+        "learning_objectives",
+        "start_date",
+        "end_date",
+        "status",
+    }
+)
+ENROLLMENT_FIELDS = frozenset(
+    {
+        "id",
+        "student_id",
+        "enrollment_date",
+        "status",
+        "grade",
+        "grade_letter",
+        "attendance_percentage",
+        "completion_date",
+    }
+)
+ASSIGNMENT_FIELDS = frozenset(
+    {
+        "id",
+        "title",
+        "description",
+        "assignment_type",
+        "assigned_date",
+        "due_date",
+        "points_possible",
+        "grading_criteria",
+        "is_published",
+    }
+)
+SUBMISSION_FIELDS = frozenset(
+    {
+        "id",
+        "assignment_id",
+        "student_id",
+        "submission_date",
+        "status",
+        "grade",
+        "feedback",
+        "graded_at",
+    }
+)
+TUTORING_SESSION_FIELDS = frozenset(
+    {
+        "id",
+        "session_type",
+        "interaction_mode",
+        "start_time",
+        "end_time",
+        "duration_seconds",
+        "initial_query",
+        "status",
+        "concepts_learned",
+    }
+)
+
+# Sessions + exchanges above which insight aggregation runs in a worker thread
+AGGREGATE_IN_THREAD_MIN_ROWS = 1000
+
+# Maximum number of fitted TF-IDF/PCA projections kept in memory
+VIZ_CACHE_MAXSIZE = 32
+
+# In-memory cache of session embeddings, held as uint8 codes (4x smaller than
+# float32) and dequantized before PCA
+SESSION_EMBEDDING_CACHE_TTL_SECONDS = 3600
+SESSION_EMBEDDING_CACHE_MAXSIZE = 20000
+
+# Charts with more points than this are rendered with matplotlib instead of SVG
+SVG_CHART_MAX_POINTS = 60
+
+# Insight types rendered in PDF reports, in order, with their section headings
+PDF_INSIGHT_SECTIONS = (
+    ("classroom", "Recommended Classroom Activities"),
+    ("strength", "Areas of Strength"),
+    ("improvement", "Areas for Improvement"),
+)
+
+# Raster settings for the matplotlib charts; fast zlib level since the PDF
+# recompresses embedded images anyway
+CHART_DPI = 80
+CHART_PNG_COMPRESS_LEVEL = 1
+
+# In-memory cache of rendered charts keyed by a hash of their input data
+CHART_CACHE_TTL_SECONDS = 900
+CHART_CACHE_MAXSIZE = 256
+
+# Document skeleton shared by the SVG charts embedded in PDF reports
+SVG_CHART_TEMPLATE = Template(
+    '<svg xmlns="http://www.w3.org/2000/svg" width="$width" height="$height" '
+    'viewBox="0 0 $width $height" font-family="Helvetica" font-size="12">'
+    '<rect x="0" y="0" width="$width" height="$height" fill="#ffffff"/>'
+    '<text x="$title_x" y="28" font-size="16" text-anchor="middle">$title</text>'
+    "$body</svg>"
+)
+
+# Prompt used to turn aggregated tutoring data into insights
+INSIGHTS_PROMPT_TEMPLATE = Template("""
+As an AI teaching assistant, you are analyzing tutoring data for $student_or_class in $class_name.
+
+Class details:
+- Education level: $education_level
+- Academic track: $academic_track
+
+Analysis period: $time_range
+Total tutoring sessions analyzed: $total_sessions
+
+Popular topics:
+$popular_topics
+
+Points of confusion:
+$confusion_points
+
+Learning achievements:
+$learning_achievements
+
+Based on this data, please generate THREE different types of insights:
+
+1. "strength" - Areas where $student_or_class shows strengths or good understanding
+2. "improvement" - Areas where $student_or_class needs improvement or has misconceptions
+3. "classroom" - Recommendations for classroom activities that would help address identified gaps
+
+For each insight, provide:
+- A concise but specific title
+- A helpful description with specific details
+- Relevant subject IDs from the data
+- A relevance score from 1-10
+
+Format your response as a JSON array of insight objects:
+[
+    {
+        "id": "unique-id-1",
+        "title": "Insight title",
+        "description": "Detailed description with specific recommendations",
+        "type": "strength|improvement|classroom",
+        "subject_ids": [list of relevant subject IDs],
+        "relevance": relevance_score
+    },
+    ...
+]
+
+Include 2-3 insights for each type (strength, improvement, classroom).
+""")
+
+# Minimum cosine similarity between a learning objective and a topic to count
+# the objective as covered
+OBJECTIVE_COVERAGE_SIMILARITY_THRESHOLD = 0.75
+
+# Misunderstanding signal above which a tutoring exchange counts as confusion
+CONFUSION_SIGNAL_THRESHOLD = 0.6
+
+# In-memory exact-match cache of insights keyed by prompt hash
+INSIGHTS_EXACT_CACHE_TTL_SECONDS = 3600
+INSIGHTS_EXACT_CACHE_MAXSIZE = 256
+
+# Qdrant collection and minimum cosine similarity for reusing generated insights
+INSIGHTS_CACHE_COLLECTION = "insights_cache"
+INSIGHTS_CACHE_SIMILARITY_THRESHOLD = 0.95
+# Semantic matches older than this are ignored so insights track new activity
+INSIGHTS_CACHE_TTL_SECONDS = 24 * 3600
+# Exact-cache misses a scope needs before signatures are embedded for it
+INSIGHTS_CACHE_MIN_EXACT_MISSES = 2
+
+
+@lru_cache(maxsize=128)
+def _build_clusters_cached(
+    topics: Tuple[Tuple[str, str, int], ...], topic_colors: Tuple[Tuple[str, str], ...]
+) -> Tuple[Dict[str, Any], ...]:
+    """Build cluster descriptors from (id, name, count) topics and topic colors"""
+    colors = dict(topic_colors)
+    return tuple(
+        {
+            "id": topic_id,
+            "name": name,
+            "count": count,
+            "color": colors.get(topic_id, "#808080"),
+        }
+        for topic_id, name, count in topics
+    )
+
 
 class AnalyticsEngine:
     """Core engine for processing analytics data and generating insights"""
@@ -48,7 +252,27 @@ class AnalyticsEngine:
     def __init__(self):
         """Initialize the analytics engine with necessary components"""
         self.llm = LLM()  # Assuming an LLM client is already defined in the project
-        self.qdrant_client = QdrantClientWrapper()
+        self.qdrant_client = get_qdrant_client()
+        self.embedding_model = EmbeddingModel()
+        # LRU of prompt hash -> (expiry, serialized insights)
+        self._insights_cache: OrderedDict[str, Tuple[float, bytes]] = OrderedDict()
+        # None until the semantic insights cache has been initialized (or failed to)
+        self._semantic_cache_available: Optional[bool] = None
+        # LRU of cache scope -> exact-cache misses, gating the embedding calls
+        self._exact_misses: OrderedDict[str, int] = OrderedDict()
+        # LRU of session id -> (expiry, uint8 codes, offset, scale)
+        self._embedding_cache: OrderedDict[
+            str, Tuple[float, np.ndarray, np.float32, np.float32]
+        ] = OrderedDict()
+        # LRU of cache_key -> (vectorizer, pca, {(session_id, text hash): coords})
+        self._viz_cache: OrderedDict[
+            Tuple, Tuple[Any, Any, Dict[Tuple[str, bytes], np.ndarray]]
+        ] = OrderedDict()
+        # Reusable Agg figures for the matplotlib charts, keyed by chart name
+        self._chart_figures: Dict[str, Tuple[Any, Any]] = {}
+        self._chart_lock = threading.Lock()
+        # LRU of chart payload hash -> (expiry, PNG data URI)
+        self._chart_cache: OrderedDict[bytes, Tuple[float, str]] = OrderedDict()
 
     async def gather_course_data(
         self, course_id: int, db: AsyncSession
@@ -91,80 +315,25 @@ class AnalyticsEngine:
         tutoring_result = await db.execute(tutoring_query)
         tutoring_sessions = tutoring_result.scalars().all()
 
-        # Compile all data
+        # Compile all data; JSON-mode dumps serialize datetimes and None natively
         course_data = {
-            "course": {
-                "id": course.id,
-                "title": course.title,
-                "description": course.description,
-                "education_level": course.education_level,
-                "academic_track": course.academic_track,
-                "syllabus": course.syllabus,
-                "learning_objectives": course.learning_objectives,
-                "start_date": course.start_date.isoformat()
-                if course.start_date
-                else None,
-                "end_date": course.end_date.isoformat() if course.end_date else None,
-                "status": course.status,
-            },
+            "course": course.model_dump(mode="json", include=COURSE_FIELDS),
             "enrollments": [
-                {
-                    "id": enrollment.id,
-                    "student_id": enrollment.student_id,
-                    "enrollment_date": enrollment.enrollment_date.isoformat(),
-                    "status": enrollment.status,
-                    "grade": enrollment.grade,
-                    "grade_letter": enrollment.grade_letter,
-                    "attendance_percentage": enrollment.attendance_percentage,
-                    "completion_date": enrollment.completion_date.isoformat()
-                    if enrollment.completion_date
-                    else None,
-                }
+                enrollment.model_dump(mode="json", include=ENROLLMENT_FIELDS)
                 for enrollment in enrollments
             ],
             "assignments": [
-                {
-                    "id": assignment.id,
-                    "title": assignment.title,
-                    "description": assignment.description,
-                    "assignment_type": assignment.assignment_type,
-                    "assigned_date": assignment.assigned_date.isoformat(),
-                    "due_date": assignment.due_date.isoformat(),
-                    "points_possible": assignment.points_possible,
-                    "grading_criteria": assignment.grading_criteria,
-                    "is_published": assignment.is_published,
-                }
+                assignment.model_dump(mode="json", include=ASSIGNMENT_FIELDS)
                 for assignment in assignments
             ],
             "submissions": [
-                {
-                    "id": submission.id,
-                    "assignment_id": submission.assignment_id,
-                    "student_id": submission.student_id,
-                    "submission_date": submission.submission_date.isoformat(),
-                    "status": submission.status,
-                    "grade": submission.grade,
-                    "feedback": submission.feedback,
-                    "graded_at": submission.graded_at.isoformat()
-                    if submission.graded_at
-                    else None,
-                }
+                submission.model_dump(mode="json", include=SUBMISSION_FIELDS)
                 for submission in submissions
             ],
             "tutoring_sessions": [
                 {
-                    "id": session.id,
                     "student_id": session.user_id,
-                    "session_type": session.session_type,
-                    "interaction_mode": session.interaction_mode,
-                    "start_time": session.start_time.isoformat(),
-                    "end_time": session.end_time.isoformat()
-                    if session.end_time
-                    else None,
-                    "duration_seconds": session.duration_seconds,
-                    "initial_query": session.initial_query,
-                    "status": session.status,
-                    "concepts_learned": session.concepts_learned,
+                    **session.model_dump(mode="json", include=TUTORING_SESSION_FIELDS),
                 }
                 for session in tutoring_sessions
             ],
@@ -197,65 +366,117 @@ class AnalyticsEngine:
         if not session_ids:
             return []
 
-        # Fetch details for the specified sessions
+        # Independent lookups run concurrently, each on its own pooled session
+        # since an AsyncSession cannot execute queries concurrently
         sessions_query = select(DetailedTutoringSession).where(
             DetailedTutoringSession.id.in_(session_ids)
         )
-
-        sessions_result = await db.execute(sessions_query)
-        sessions = sessions_result.scalars().all()
-
-        # Fetch exchanges for these sessions
         exchanges_query = (
             select(TutoringExchange)
             .where(TutoringExchange.session_id.in_(session_ids))
             .order_by(TutoringExchange.session_id, TutoringExchange.sequence)
         )
-
-        exchanges_result = await db.execute(exchanges_query)
-        exchanges = exchanges_result.scalars().all()
-
-        # Group exchanges by session
-        session_exchanges: Dict[str, List[TutoringExchange]] = {}
-        for exchange in exchanges:
-            session_id = str(exchange.session_id)
-            if session_id not in session_exchanges:
-                session_exchanges[session_id] = []
-            session_exchanges[session_id].append(exchange)
-
-        # Get class details
         class_query = select(SchoolClass).where(SchoolClass.id == class_id)
-        class_result = await db.execute(class_query)
-        class_details = class_result.scalar_one_or_none()
-
-        # Get student details if specified
-        student_details = None
-        if student_id:
-            student_query = (
-                select(SchoolStudent)
-                .join(User, SchoolStudent.user_id == User.id)
-                .where(SchoolStudent.id == student_id)
-            )
-            student_result = await db.execute(student_query)
-            student_details = student_result.scalar_one_or_none()
+        student_query = (
+            select(SchoolStudent)
+            .join(User, SchoolStudent.user_id == User.id)
+            .options(selectinload(SchoolStudent.user))
+            .where(SchoolStudent.id == student_id)
+        )
+
+        sessions, exchanges, class_rows, student_rows = await asyncio.gather(
+            self._fetch_all(sessions_query, db),
+            self._fetch_all(exchanges_query),
+            self._fetch_all(class_query),
+            self._fetch_all(student_query) if student_id else asyncio.sleep(0, []),
+        )
+        class_details = class_rows[0] if class_rows else None
+        student_details = student_rows[0] if student_rows else None
 
         # Extract topics from sessions
         topic_ids = list(
             set([session.topic_id for session in sessions if session.topic_id])
         )
 
-        # Get topic details
-        topic_query = select(Topic).where(Topic.id.in_(topic_ids))
+        # Fetch topics together with their subjects in a single query
+        topic_query = (
+            select(Topic, Subject)
+            .join(Subject, Topic.subject_id == Subject.id, isouter=True)
+            .where(Topic.id.in_(topic_ids))
+        )
         topic_result = await db.execute(topic_query)
-        topics = {topic.id: topic for topic in topic_result.scalars().all()}
+        topics = {}
+        subjects = {}
+        for topic, subject in topic_result.all():
+            topics[topic.id] = topic
+            if subject:
+                subjects[subject.id] = subject
+
+        # Aggregate off the event loop when there is enough work to justify it
+        aggregate_args = (sessions, exchanges, topics, subjects)
+        if len(exchanges) + len(sessions) >= AGGREGATE_IN_THREAD_MIN_ROWS:
+            aggregated = await asyncio.to_thread(self._aggregate_sync, *aggregate_args)
+        else:
+            aggregated = self._aggregate_sync(*aggregate_args)
+        confusion_points, learning_achievements, popular_topics = aggregated
 
-        # Get subject details for topics
-        subject_ids = list(
-            set([topic.subject_id for topic in topics.values() if topic.subject_id])
-        )
-        subject_query = select(Subject).where(Subject.id.in_(subject_ids))
-        subject_result = await db.execute(subject_query)
-        subjects = {subject.id: subject for subject in subject_result.scalars().all()}
+        # Prepare data for LLM analysis
+        analysis_data = {
+            "class_details": {
+                "id": class_details.id,
+                "name": class_details.name,
+                "education_level": class_details.education_level,
+                "academic_track": class_details.academic_track,
+            }
+            if class_details
+            else {},
+            "student_details": {
+                "id": student_details.id,
+                "name": student_details.user.full_name
+                if hasattr(student_details, "user")
+                else "Unknown",
+                "education_level": student_details.education_level,
+                "academic_track": student_details.academic_track,
+            }
+            if student_details
+            else {"id": None, "name": "All Students"},
+            "time_range": time_range,
+            "total_sessions": len(sessions),
+            "popular_topics": popular_topics,
+            "confusion_points": confusion_points[:10],  # Limit to top 10
+            "learning_achievements": learning_achievements[:10],  # Limit to top 10
+            "cache_scope": f"{class_id}:{student_id or 'all'}:{time_range}",
+        }
+
+        # Generate insights using LLM
+        insights = await self._generate_llm_insights(analysis_data)
+
+        return insights
+
+    def _aggregate_sync(
+        self,
+        sessions: List[DetailedTutoringSession],
+        exchanges: List[TutoringExchange],
+        topics: Dict[int, Topic],
+        subjects: Dict[int, Subject],
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Aggregate fetched sessions and exchanges into insight inputs
+
+        Args:
+            sessions: Tutoring sessions being analyzed
+            exchanges: Exchanges of those sessions
+            topics: Topics by ID
+            subjects: Subjects by ID
+
+        Returns:
+            Tuple of (confusion points, learning achievements, popular topics)
+        """
+        # Index sessions by ID and group exchanges by session
+        session_by_id = {str(session.id): session for session in sessions}
+        session_exchanges: Dict[str, List[TutoringExchange]] = defaultdict(list)
+        for exchange in exchanges:
+            session_exchanges[str(exchange.session_id)].append(exchange)
 
         # Extract confusion points
         confusion_points = []
@@ -271,9 +492,7 @@ class AnalyticsEngine:
                     )
                     if misunderstanding_score > 0.5:  # Threshold for confusion
                         # Find the session for this exchange
-                        session = next(
-                            (s for s in sessions if str(s.id) == session_id), None
-                        )
+                        session = session_by_id.get(session_id)
                         if session:
                             topic = topics.get(session.topic_id)
                             subject = subjects.get(topic.subject_id) if topic else None
@@ -319,15 +538,11 @@ class AnalyticsEngine:
                     )
 
         # Count sessions by topic
-        topic_counts = {}
-        for session in sessions:
-            if session.topic_id:
-                topic_counts[session.topic_id] = (
-                    topic_counts.get(session.topic_id, 0) + 1
-                )
+        topic_counts = Counter(
+            session.topic_id for session in sessions if session.topic_id
+        )
 
-        # Sort topics by frequency
-        sorted_topics = sorted(topic_counts.items(), key=lambda x: x[1], reverse=True)
+        # Top 5 topics by frequency
         popular_topics = [
             {
                 "topic_id": topic_id,
@@ -342,40 +557,31 @@ class AnalyticsEngine:
                 if topic_id in topics and topics.get(topic_id).subject_id in subjects
                 else "Unknown Subject",
             }
-            for topic_id, count in sorted_topics[:5]  # Top 5 topics
+            for topic_id, count in topic_counts.most_common(5)
         ]
 
-        # Prepare data for LLM analysis
-        analysis_data = {
-            "class_details": {
-                "id": class_details.id,
-                "name": class_details.name,
-                "education_level": class_details.education_level,
-                "academic_track": class_details.academic_track,
-            }
-            if class_details
-            else {},
-            "student_details": {
-                "id": student_details.id,
-                "name": student_details.user.full_name
-                if hasattr(student_details, "user")
-                else "Unknown",
-                "education_level": student_details.education_level,
-                "academic_track": student_details.academic_track,
-            }
-            if student_details
-            else {"id": None, "name": "All Students"},
-            "time_range": time_range,
-            "total_sessions": len(sessions),
-            "popular_topics": popular_topics,
-            "confusion_points": confusion_points[:10],  # Limit to top 10
-            "learning_achievements": learning_achievements[:10],  # Limit to top 10
-        }
+        return confusion_points, learning_achievements, popular_topics
 
-        # Generate insights using LLM
-        insights = await self._generate_llm_insights(analysis_data)
+    async def _fetch_all(
+        self, query: Any, db: Optional[AsyncSession] = None
+    ) -> List[Any]:
+        """
+        Execute a query and return all scalar results
 
-        return insights
+        Args:
+            query: Select statement to execute
+            db: Session to run the query on; a new pooled session is used if omitted
+
+        Returns:
+            List of result objects
+        """
+        if db is not None:
+            result = await db.execute(query)
+            return result.scalars().all()
+
+        async with postgres_db.get_session() as session:
+            result = await session.execute(query)
+            return result.scalars().all()
 
     async def _generate_llm_insights(
         self, analysis_data: Dict[str, Any]
@@ -396,66 +602,72 @@ class AnalyticsEngine:
             if is_individual
             else "the entire class"
         )
+        class_details = analysis_data["class_details"]
+
+        prompt = INSIGHTS_PROMPT_TEMPLATE.substitute(
+            student_or_class=student_or_class,
+            class_name=class_details.get("name", "a class"),
+            education_level=class_details.get("education_level", "Not specified"),
+            academic_track=class_details.get("academic_track", "Not specified"),
+            time_range=analysis_data["time_range"],
+            total_sessions=analysis_data["total_sessions"],
+            popular_topics=orjson.dumps(
+                analysis_data["popular_topics"], default=str
+            ).decode(),
+            confusion_points=orjson.dumps(
+                analysis_data["confusion_points"], default=str
+            ).decode(),
+            learning_achievements=orjson.dumps(
+                analysis_data["learning_achievements"], default=str
+            ).decode(),
+        )
 
-        prompt = f"""
-        As an AI teaching assistant, you are analyzing tutoring data for {student_or_class} in {analysis_data['class_details'].get('name', 'a class')}.
-
-        Class details:
-        - Education level: {analysis_data['class_details'].get('education_level', 'Not specified')}
-        - Academic track: {analysis_data['class_details'].get('academic_track', 'Not specified')}
-
-        Analysis period: {analysis_data['time_range']}
-        Total tutoring sessions analyzed: {analysis_data['total_sessions']}
-
-        Popular topics:
-        {json.dumps(analysis_data['popular_topics'], indent=2)}
-
-        Points of confusion:
-        {json.dumps(analysis_data['confusion_points'], indent=2)}
-
-        Learning achievements:
-        {json.dumps(analysis_data['learning_achievements'], indent=2)}
-
-        Based on this data, please generate THREE different types of insights:
-
-        1. "strength" - Areas where {student_or_class} shows strengths or good understanding
-        2. "improvement" - Areas where {student_or_class} needs improvement or has misconceptions
-        3. "classroom" - Recommendations for classroom activities that would help address identified gaps
-
-        For each insight, provide:
-        - A concise but specific title
-        - A helpful description with specific details
-        - Relevant subject IDs from the data
-        - A relevance score from 1-10
-
-        Format your response as a JSON array of insight objects:
-        [
-            {
-                "id": "unique-id-1",
-                "title": "Insight title",
-                "description": "Detailed description with specific recommendations",
-                "type": "strength|improvement|classroom",
-                "subject_ids": [list of relevant subject IDs],
-                "relevance": relevance_score
-            },
-            ...
-        ]
-
-        Include 2-3 insights for each type (strength, improvement, classroom).
-        """
+        # Identical prompts for the same scope are served from memory
+        exact_key = hashlib.blake2b(
+            f"{analysis_data['cache_scope']}|{prompt}".encode(), digest_size=16
+        ).hexdigest()
+        cached_insights = self._exact_cache_lookup(exact_key)
+        if cached_insights is not None:
+            return cached_insights
+
+        # Reuse insights generated for a near-identical analysis, only paying
+        # for an embedding once the scope keeps missing the exact cache
+        signature = self._insights_signature(analysis_data)
+        signature_embedding = None
+        if self._record_exact_miss(analysis_data["cache_scope"]):
+            signature_embedding = await self._embed_signature(signature)
+        if signature_embedding is not None:
+            cached_insights = await self._semantic_lookup(
+                signature_embedding, analysis_data["cache_scope"]
+            )
+            if cached_insights is not None:
+                self._exact_cache_store(exact_key, cached_insights)
+                return cached_insights
 
         try:
             # Call the LLM
             llm_response = await self.llm.generate_text(prompt)
 
-            # Parse the JSON response
-            insights = json.loads(llm_response)
+            # Parse the JSON response, repairing truncated or malformed output
+            try:
+                insights = orjson.loads(llm_response)
+            except orjson.JSONDecodeError:
+                insights = orjson.loads(repair_json(llm_response))
 
             # Add unique IDs if missing
             for insight in insights:
                 if "id" not in insight or not insight["id"]:
                     insight["id"] = str(uuid.uuid4())
 
+            self._exact_cache_store(exact_key, insights)
+            if signature_embedding is not None:
+                await self._semantic_store(
+                    signature_embedding,
+                    signature,
+                    analysis_data["cache_scope"],
+                    insights,
+                )
+
             return insights
 
         except Exception as e:
@@ -473,12 +685,152 @@ class AnalyticsEngine:
                 }
             ]
 
+    def _exact_cache_lookup(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return unexpired insights cached under an exact prompt key"""
+        entry = self._insights_cache.get(key)
+        if entry is None:
+            return None
+
+        expires_at, payload = entry
+        if expires_at < time.monotonic():
+            del self._insights_cache[key]
+            return None
+
+        self._insights_cache.move_to_end(key)
+        return orjson.loads(payload)
+
+    def _exact_cache_store(self, key: str, insights: List[Dict[str, Any]]) -> None:
+        """Cache insights under an exact prompt key, evicting the oldest entries"""
+        self._insights_cache[key] = (
+            time.monotonic() + INSIGHTS_EXACT_CACHE_TTL_SECONDS,
+            orjson.dumps(insights, default=str),
+        )
+        self._insights_cache.move_to_end(key)
+        if len(self._insights_cache) > INSIGHTS_EXACT_CACHE_MAXSIZE:
+            self._insights_cache.popitem(last=False)
+
+    def _record_exact_miss(self, scope: str) -> bool:
+        """Count an exact-cache miss and return whether the scope misses repeatedly"""
+        misses = self._exact_misses.pop(scope, 0) + 1
+        self._exact_misses[scope] = misses
+        if len(self._exact_misses) > INSIGHTS_EXACT_CACHE_MAXSIZE:
+            self._exact_misses.popitem(last=False)
+
+        return misses >= INSIGHTS_CACHE_MIN_EXACT_MISSES
+
+    @staticmethod
+    def _insights_signature(analysis_data: Dict[str, Any]) -> str:
+        """Build a canonical text signature of the aggregates that drive insights"""
+        return orjson.dumps(
+            {
+                "topics": [
+                    [t["topic_name"], t["count"]]
+                    for t in analysis_data["popular_topics"]
+                ],
+                "confusion_topics": sorted(
+                    {c["topic_name"] for c in analysis_data["confusion_points"]}
+                ),
+                "concepts": sorted(
+                    {str(a["concept"]) for a in analysis_data["learning_achievements"]}
+                ),
+            },
+            option=orjson.OPT_SORT_KEYS,
+        ).decode()
+
+    async def _init_semantic_cache(self) -> bool:
+        """Lazily connect the embedding model and Qdrant used by the insights cache"""
+        if self._semantic_cache_available is None:
+            try:
+                if not self.embedding_model.client:
+                    await self.embedding_model.init_client()
+                if not self.qdrant_client.client:
+                    await self.qdrant_client.init_client()
+                self._semantic_cache_available = True
+            except Exception as e:
+                logger.warning(f"Semantic insights cache unavailable: {str(e)}")
+                self._semantic_cache_available = False
+
+        return self._semantic_cache_available
+
+    async def _embed_signature(self, signature: str) -> Optional[np.ndarray]:
+        """Embed an insights signature, or return None if the cache is unavailable"""
+        if not await self._init_semantic_cache():
+            return None
+
+        try:
+            return await self.embedding_model.generate_embedding(signature)
+        except Exception as e:
+            logger.warning(f"Error embedding insights signature: {str(e)}")
+            return None
+
+    async def _semantic_lookup(
+        self, signature_embedding: np.ndarray, scope: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up previously generated insights for a similar analysis
+
+        Args:
+            signature_embedding: Embedding of the analysis signature
+            scope: Class/student/time-range scope the insights must belong to
+
+        Returns:
+            Unexpired cached insight objects, or None on a cache miss
+        """
+        results = await self.qdrant_client.search_similar(
+            collection_name=INSIGHTS_CACHE_COLLECTION,
+            query_vector=signature_embedding,
+            limit=1,
+            filter_condition=models.Filter(
+                must=[
+                    models.FieldCondition(
+                        key="scope", match=models.MatchValue(value=scope)
+                    ),
+                    models.FieldCondition(
+                        key="created_ts",
+                        range=models.Range(
+                            gte=time.time() - INSIGHTS_CACHE_TTL_SECONDS
+                        ),
+                    ),
+                ]
+            ),
+            score_threshold=INSIGHTS_CACHE_SIMILARITY_THRESHOLD,
+        )
+
+        if results:
+            return results[0].get("insights")
+
+        return None
+
+    async def _semantic_store(
+        self,
+        signature_embedding: np.ndarray,
+        signature: str,
+        scope: str,
+        insights: List[Dict[str, Any]],
+    ) -> None:
+        """Store generated insights in the semantic cache"""
+        await self.qdrant_client.upsert_vectors(
+            collection_name=INSIGHTS_CACHE_COLLECTION,
+            vectors=[signature_embedding],
+            ids=[str(uuid.uuid5(uuid.NAMESPACE_URL, f"{scope}|{signature}"))],
+            payloads=[
+                {
+                    "scope": scope,
+                    "signature": signature,
+                    "insights": insights,
+                    "created_at": datetime.utcnow().isoformat(),
+                    "created_ts": time.time(),
+                }
+            ],
+        )
+
     async def generate_visualization(
         self,
         session_texts: Dict[str, List[str]],
         topic_map: Dict[str, Dict[str, Any]],
         topic_colors: Dict[str, str],
         sessions: List[Any],
+        cache_key: Optional[Tuple] = None,
     ) -> Dict[str, Any]:
         """
         Generate 3D visualization data from session texts when embeddings aren't available
@@ -488,6 +840,8 @@ class AnalyticsEngine:
             topic_map: Dictionary mapping topic IDs to topic information
             topic_colors: Dictionary mapping topic IDs to colors
             sessions: List of session objects
+            cache_key: Optional key (e.g. class/student/time range) under which the
+                fitted projection is cached and reused on subsequent calls
 
         Returns:
             Visualization data for 3D plots
@@ -508,26 +862,23 @@ class AnalyticsEngine:
             return {"points": [], "centers": [], "clusters": []}
 
         try:
-            # Create TF-IDF vectors
-            vectorizer = TfidfVectorizer(max_features=1000, stop_words="english")
             session_ids = list(session_combined_texts.keys())
             texts = [session_combined_texts[sid] for sid in session_ids]
 
-            # Fit and transform texts to vectors
-            tfidf_matrix = vectorizer.fit_transform(texts)
-
-            # Apply PCA for dimensionality reduction to 3D
-            pca = PCA(n_components=3)
-            coords_3d = pca.fit_transform(tfidf_matrix.toarray())
+            # Project texts to 3D, reusing a cached fit when available
+            coords_3d = self._project_session_texts(cache_key, session_ids, texts)
 
             # Prepare points data for visualization
             points = []
+            point_indices = []
             for i, session_id in enumerate(session_ids):
                 topic_id = session_to_topic.get(session_id)
 
                 if not topic_id:
                     continue
 
+                point_indices.append(i)
+
                 topic_info = topic_map.get(topic_id, {})
                 topic_name = topic_info.get("name", "Unknown Topic")
                 color = topic_colors.get(
@@ -547,50 +898,15 @@ class AnalyticsEngine:
                 )
 
             # Calculate cluster centers
-            topic_points = {}
-            for point in points:
-                topic_id = point["cluster_id"]
-                if topic_id not in topic_points:
-                    topic_points[topic_id] = []
-                topic_points[topic_id].append((point["x"], point["y"], point["z"]))
-
-            centers = []
-            for topic_id, coords in topic_points.items():
-                if not coords:
-                    continue
-
-                # Calculate mean coordinates
-                coord_array = np.array(coords)
-                mean_x = float(np.mean(coord_array[:, 0]))
-                mean_y = float(np.mean(coord_array[:, 1]))
-                mean_z = float(np.mean(coord_array[:, 2]))
-
-                topic_info = topic_map.get(topic_id, {})
-                topic_name = topic_info.get("name", "Unknown Topic")
-                color = topic_colors.get(topic_id, "#808080")
-
-                centers.append(
-                    {
-                        "id": topic_id,
-                        "name": topic_name,
-                        "x": mean_x,
-                        "y": mean_y,
-                        "z": mean_z,
-                        "color": color,
-                    }
-                )
+            centers = self._compute_cluster_centers(
+                coords_3d[point_indices],
+                [point["cluster_id"] for point in points],
+                topic_map,
+                topic_colors,
+            )
 
             # Format clusters information
-            clusters = []
-            for topic_id, info in topic_map.items():
-                clusters.append(
-                    {
-                        "id": topic_id,
-                        "name": info.get("name", "Unknown Topic"),
-                        "count": info.get("count", 0),
-                        "color": topic_colors.get(topic_id, "#808080"),
-                    }
-                )
+            clusters = self._build_clusters(topic_map, topic_colors)
 
             return {"points": points, "centers": centers, "clusters": clusters}
 
@@ -598,6 +914,294 @@ class AnalyticsEngine:
             logger.error(f"Error generating visualization: {str(e)}")
             return {"points": [], "centers": [], "clusters": []}
 
+    @staticmethod
+    def _unique_sparse_rows(matrix: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the distinct rows of a CSR matrix
+
+        Args:
+            matrix: scipy CSR matrix
+
+        Returns:
+            Tuple of (index of the first occurrence of each distinct row,
+            index into those rows for every original row)
+        """
+        first_rows: Dict[bytes, int] = {}
+        unique_rows = []
+        inverse = np.empty(matrix.shape[0], dtype=np.intp)
+
+        for i, (start, end) in enumerate(zip(matrix.indptr[:-1], matrix.indptr[1:])):
+            key = matrix.indices[start:end].tobytes() + matrix.data[start:end].tobytes()
+            if key not in first_rows:
+                first_rows[key] = len(unique_rows)
+                unique_rows.append(i)
+            inverse[i] = first_rows[key]
+
+        return np.asarray(unique_rows, dtype=np.intp), inverse
+
+    def _project_session_texts(
+        self, cache_key: Optional[Tuple], session_ids: List[str], texts: List[str]
+    ) -> np.ndarray:
+        """
+        Project session texts to 3D coordinates with TF-IDF + PCA
+
+        When a fitted projection is cached under ``cache_key``, sessions that were
+        already projected with the same text reuse their coordinates and only new
+        or changed sessions are passed through ``transform()``. The projection is
+        refitted once those outnumber the sessions it was fitted on.
+
+        Args:
+            cache_key: Cache key for the fitted projection, or None to disable caching
+            session_ids: Session IDs, aligned with ``texts``
+            texts: Combined exchange text per session
+
+        Returns:
+            Array of shape (len(session_ids), 3)
+        """
+        cached = self._viz_cache.get(cache_key) if cache_key is not None else None
+
+        # A session that gained exchanges since it was projected has new text
+        coord_keys = [
+            (sid, hashlib.blake2b(text.encode(), digest_size=16).digest())
+            for sid, text in zip(session_ids, texts)
+        ]
+
+        if cached is not None:
+            vectorizer, pca, session_coords = cached
+            new_indices = [
+                i for i, key in enumerate(coord_keys) if key not in session_coords
+            ]
+
+            if len(new_indices) <= len(session_coords):
+                self._viz_cache.move_to_end(cache_key)
+
+                if new_indices:
+                    new_coords = pca.transform(
+                        vectorizer.transform([texts[i] for i in new_indices]).toarray()
+                    )
+                    for row, i in enumerate(new_indices):
+                        session_coords[coord_keys[i]] = new_coords[row]
+
+                return np.vstack([session_coords[key] for key in coord_keys])
+
+        # Fit TF-IDF vectors and reduce to 3D with PCA
+        vectorizer = TfidfVectorizer(max_features=1000, stop_words="english")
+        tfidf_matrix = vectorizer.fit_transform(texts)
+        pca = PCA(n_components=3)
+
+        # Identical rows (e.g. repeated "hi"/"thanks" sessions) only need to be
+        # projected once; fit on the unique rows and scatter the results back
+        unique_rows, inverse = self._unique_sparse_rows(tfidf_matrix)
+        if len(unique_rows) >= pca.n_components:
+            coords_3d = pca.fit_transform(tfidf_matrix[unique_rows].toarray())[inverse]
+        else:
+            coords_3d = pca.fit_transform(tfidf_matrix.toarray())
+
+        if cache_key is not None:
+            self._viz_cache[cache_key] = (
+                vectorizer,
+                pca,
+                dict(zip(coord_keys, coords_3d)),
+            )
+            self._viz_cache.move_to_end(cache_key)
+            if len(self._viz_cache) > VIZ_CACHE_MAXSIZE:
+                self._viz_cache.popitem(last=False)
+
+        return coords_3d
+
+    @staticmethod
+    def _build_clusters(
+        topic_map: Dict[str, Dict[str, Any]], topic_colors: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        """Format topic clusters for visualization, memoized on their contents"""
+        return list(
+            _build_clusters_cached(
+                tuple(
+                    (topic_id, info.get("name", "Unknown Topic"), info.get("count", 0))
+                    for topic_id, info in topic_map.items()
+                ),
+                tuple(topic_colors.items()),
+            )
+        )
+
+    @staticmethod
+    def _compute_cluster_centers(
+        coords: np.ndarray,
+        cluster_ids: List[str],
+        topic_map: Dict[str, Dict[str, Any]],
+        topic_colors: Dict[str, str],
+    ) -> List[Dict[str, Any]]:
+        """
+        Compute the mean 3D position of each topic cluster
+
+        Points are sorted by cluster once and the per-cluster sums are taken in a
+        single ``np.add.reduceat`` pass instead of grouping them in Python.
+
+        Args:
+            coords: Array of shape (n_points, 3)
+            cluster_ids: Topic ID of each point, aligned with ``coords``
+            topic_map: Dictionary mapping topic IDs to topic information
+            topic_colors: Dictionary mapping topic IDs to colors
+
+        Returns:
+            List of cluster center objects
+        """
+        if not cluster_ids:
+            return []
+
+        cluster_arr = np.asarray(cluster_ids)
+        order = np.argsort(cluster_arr, kind="stable")
+        sorted_ids = cluster_arr[order]
+
+        # Start offset of each run of identical cluster IDs
+        starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+        counts = np.diff(np.append(starts, len(sorted_ids)))
+        means = np.add.reduceat(coords[order], starts, axis=0) / counts[:, None]
+
+        centers = []
+        for topic_id, (mean_x, mean_y, mean_z) in zip(sorted_ids[starts], means):
+            topic_id = str(topic_id)
+            topic_info = topic_map.get(topic_id, {})
+
+            centers.append(
+                {
+                    "id": topic_id,
+                    "name": topic_info.get("name", "Unknown Topic"),
+                    "x": float(mean_x),
+                    "y": float(mean_y),
+                    "z": float(mean_z),
+                    "color": topic_colors.get(topic_id, "#808080"),
+                }
+            )
+
+        return centers
+
+    @staticmethod
+    def _quantize_rows(
+        vectors: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Scalar-quantize each row of an embedding matrix to uint8
+
+        Args:
+            vectors: Float array of shape (n, dim)
+
+        Returns:
+            Tuple of (uint8 codes, per-row offset, per-row scale)
+        """
+        offset = vectors.min(axis=1)
+        scale = (vectors.max(axis=1) - offset) / 255
+        scale[scale == 0] = 1.0  # Constant rows quantize to 0
+
+        codes = np.clip(np.rint((vectors - offset[:, None]) / scale[:, None]), 0, 255)
+        return (
+            codes.astype(np.uint8),
+            offset.astype(np.float32),
+            scale.astype(np.float32),
+        )
+
+    @staticmethod
+    def _dequantize_rows(
+        codes: np.ndarray, offset: np.ndarray, scale: np.ndarray
+    ) -> np.ndarray:
+        """Restore a float32 embedding matrix from uint8 codes in one broadcast"""
+        return codes.astype(np.float32) * scale[:, None] + offset[:, None]
+
+    async def fetch_session_embeddings(
+        self, sessions: List[Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch stored embeddings for tutoring sessions
+
+        Embeddings are cached in memory as uint8 codes between requests, so
+        only sessions missing from the cache are fetched from Qdrant, in a
+        single request. The returned vectors are dequantized float32 rows
+        ready for PCA.
+
+        Args:
+            sessions: Session rows with id, topic_id, topic_name and initial_query
+
+        Returns:
+            Session embedding objects in the format expected by process_embeddings
+        """
+        sessions_by_id = {str(session.id): session for session in sessions}
+
+        now = time.monotonic()
+        cached = {}
+        for session_id in sessions_by_id:
+            entry = self._embedding_cache.get(session_id)
+            if entry is not None and entry[0] >= now:
+                self._embedding_cache.move_to_end(session_id)
+                cached[session_id] = entry[1:]
+
+        missing = [
+            session_id for session_id in sessions_by_id if session_id not in cached
+        ]
+        if missing:
+            if not self.qdrant_client.client:
+                await self.qdrant_client.init_client()
+
+            points = await self.qdrant_client.retrieve_by_field(
+                collection_name="tutoring_sessions",
+                field_name="session_id",
+                values=missing,
+            )
+
+            fetched_ids, vectors = [], []
+            for point in points:
+                session_id = point.get("session_id")
+                vector = point.get("vector") or point.get("embedding")
+                if session_id in sessions_by_id and vector:
+                    fetched_ids.append(session_id)
+                    vectors.append(vector)
+
+            if vectors:
+                codes, offsets, scales = self._quantize_rows(
+                    np.asarray(vectors, dtype=np.float32)
+                )
+                expires_at = now + SESSION_EMBEDDING_CACHE_TTL_SECONDS
+                for session_id, code, offset, scale in zip(
+                    fetched_ids, codes, offsets, scales
+                ):
+                    cached[session_id] = (code, offset, scale)
+                    self._embedding_cache[session_id] = (
+                        expires_at,
+                        code,
+                        offset,
+                        scale,
+                    )
+                    self._embedding_cache.move_to_end(session_id)
+
+                while len(self._embedding_cache) > SESSION_EMBEDDING_CACHE_MAXSIZE:
+                    self._embedding_cache.popitem(last=False)
+
+        session_ids = [
+            session_id for session_id in sessions_by_id if session_id in cached
+        ]
+        if not session_ids:
+            return []
+
+        codes, offsets, scales = zip(
+            *(cached[session_id] for session_id in session_ids)
+        )
+        vectors = self._dequantize_rows(
+            np.stack(codes), np.asarray(offsets), np.asarray(scales)
+        )
+
+        session_embeddings = []
+        for session_id, vector in zip(session_ids, vectors):
+            session = sessions_by_id[session_id]
+            session_embeddings.append(
+                {
+                    "id": session_id,
+                    "topic_id": str(session.topic_id),
+                    "label": f"{session.topic_name}: {session.initial_query[:50]}...",
+                    "embedding": vector,
+                }
+            )
+
+        return session_embeddings
+
     async def process_embeddings(
         self,
         embeddings: List[Dict[str, Any]],
@@ -627,7 +1231,7 @@ class AnalyticsEngine:
             labels = [e["label"] for e in embeddings]
 
             # Convert to numpy array
-            embedding_array = np.array(embedding_vectors)
+            embedding_array = np.asarray(embedding_vectors, dtype=np.float32)
 
             # Apply PCA for dimensionality reduction to 3D
             pca = PCA(n_components=3)
@@ -654,50 +1258,12 @@ class AnalyticsEngine:
                 )
 
             # Calculate cluster centers
-            topic_points = {}
-            for point in points:
-                topic_id = point["cluster_id"]
-                if topic_id not in topic_points:
-                    topic_points[topic_id] = []
-                topic_points[topic_id].append((point["x"], point["y"], point["z"]))
-
-            centers = []
-            for topic_id, coords in topic_points.items():
-                if not coords:
-                    continue
-
-                # Calculate mean coordinates
-                coord_array = np.array(coords)
-                mean_x = float(np.mean(coord_array[:, 0]))
-                mean_y = float(np.mean(coord_array[:, 1]))
-                mean_z = float(np.mean(coord_array[:, 2]))
-
-                topic_info = topic_map.get(topic_id, {})
-                topic_name = topic_info.get("name", "Unknown Topic")
-                color = topic_colors.get(topic_id, "#808080")
-
-                centers.append(
-                    {
-                        "id": topic_id,
-                        "name": topic_name,
-                        "x": mean_x,
-                        "y": mean_y,
-                        "z": mean_z,
-                        "color": color,
-                    }
-                )
+            centers = self._compute_cluster_centers(
+                coords_3d, topic_ids, topic_map, topic_colors
+            )
 
             # Format clusters information
-            clusters = []
-            for topic_id, info in topic_map.items():
-                clusters.append(
-                    {
-                        "id": topic_id,
-                        "name": info.get("name", "Unknown Topic"),
-                        "count": info.get("count", 0),
-                        "color": topic_colors.get(topic_id, "#808080"),
-                    }
-                )
+            clusters = self._build_clusters(topic_map, topic_colors)
 
             return {"points": points, "centers": centers, "clusters": clusters}
 
@@ -728,13 +1294,35 @@ class AnalyticsEngine:
         Returns:
             PDF document as bytes
         """
+        # Layout, chart rendering and encoding are CPU-bound; keep them off the
+        # event loop
+        return await asyncio.to_thread(
+            self._build_pdf_report,
+            class_details,
+            student_details,
+            activity_data,
+            subject_activity,
+            insights,
+            time_range,
+        )
+
+    def _build_pdf_report(
+        self,
+        class_details: Any,
+        student_details: Optional[Any],
+        activity_data: List[Dict[str, Any]],
+        subject_activity: List[Dict[str, Any]],
+        insights: List[Dict[str, Any]],
+        time_range: str,
+    ) -> bytes:
+        """Build the PDF report synchronously, see generate_pdf_report"""
         try:
             # Create PDF document
             pdf = FPDF()
             pdf.add_page()
 
             # Set up fonts
-            pdf.set_font("Arial", "B", 16)
+            pdf.set_font("Helvetica", "B", 16)
 
             # Title
             if student_details:
@@ -742,7 +1330,8 @@ class AnalyticsEngine:
                     0,
                     10,
                     f"Student AI Insights Report: {student_details.user.full_name if hasattr(student_details, 'user') else 'Unknown'}",
-                    ln=True,
+                    new_x=XPos.LMARGIN,
+                    new_y=YPos.NEXT,
                     align="C",
                 )
             else:
@@ -750,12 +1339,13 @@ class AnalyticsEngine:
                     0,
                     10,
                     f"Class AI Insights Report: {class_details.name}",
-                    ln=True,
+                    new_x=XPos.LMARGIN,
+                    new_y=YPos.NEXT,
                     align="C",
                 )
 
             # Subtitle with date range
-            pdf.set_font("Arial", "I", 12)
+            pdf.set_font("Helvetica", "I", 12)
             time_range_text = {
                 "7days": "Last 7 Days",
                 "30days": "Last 30 Days",
@@ -763,182 +1353,144 @@ class AnalyticsEngine:
                 "semester": "This Semester",
             }.get(time_range, time_range)
 
-            pdf.cell(0, 10, f"Period: {time_range_text}", ln=True, align="C")
+            pdf.cell(
+                0,
+                10,
+                f"Period: {time_range_text}",
+                new_x=XPos.LMARGIN,
+                new_y=YPos.NEXT,
+                align="C",
+            )
 
             # Class details
-            pdf.set_font("Arial", "B", 14)
-            pdf.cell(0, 15, "Class Information", ln=True)
-            pdf.set_font("Arial", "", 12)
-            pdf.cell(0, 8, f"Class Name: {class_details.name}", ln=True)
-            pdf.cell(0, 8, f"Education Level: {class_details.education_level}", ln=True)
+            pdf.set_font("Helvetica", "B", 14)
+            pdf.cell(0, 15, "Class Information", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.set_font("Helvetica", "", 12)
+            pdf.cell(
+                0,
+                8,
+                f"Class Name: {class_details.name}",
+                new_x=XPos.LMARGIN,
+                new_y=YPos.NEXT,
+            )
+            pdf.cell(
+                0,
+                8,
+                f"Education Level: {class_details.education_level}",
+                new_x=XPos.LMARGIN,
+                new_y=YPos.NEXT,
+            )
             if class_details.academic_track:
                 pdf.cell(
-                    0, 8, f"Academic Track: {class_details.academic_track}", ln=True
+                    0,
+                    8,
+                    f"Academic Track: {class_details.academic_track}",
+                    new_x=XPos.LMARGIN,
+                    new_y=YPos.NEXT,
                 )
 
             # Add student details if applicable
             if student_details:
-                pdf.set_font("Arial", "B", 14)
-                pdf.cell(0, 15, "Student Information", ln=True)
-                pdf.set_font("Arial", "", 12)
+                pdf.set_font("Helvetica", "B", 14)
+                pdf.cell(
+                    0, 15, "Student Information", new_x=XPos.LMARGIN, new_y=YPos.NEXT
+                )
+                pdf.set_font("Helvetica", "", 12)
                 pdf.cell(
                     0,
                     8,
                     f"Student Name: {student_details.user.full_name if hasattr(student_details, 'user') else 'Unknown'}",
-                    ln=True,
+                    new_x=XPos.LMARGIN,
+                    new_y=YPos.NEXT,
                 )
                 pdf.cell(
-                    0, 8, f"Education Level: {student_details.education_level}", ln=True
+                    0,
+                    8,
+                    f"Education Level: {student_details.education_level}",
+                    new_x=XPos.LMARGIN,
+                    new_y=YPos.NEXT,
                 )
                 if student_details.academic_track:
                     pdf.cell(
                         0,
                         8,
                         f"Academic Track: {student_details.academic_track}",
-                        ln=True,
+                        new_x=XPos.LMARGIN,
+                        new_y=YPos.NEXT,
                     )
 
             # Activity overview
-            pdf.set_font("Arial", "B", 14)
-            pdf.cell(0, 15, "AI Tutoring Activity", ln=True)
+            pdf.set_font("Helvetica", "B", 14)
+            pdf.cell(0, 15, "AI Tutoring Activity", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
             # Generate activity chart
             if activity_data:
-                activity_chart = self._create_activity_chart(activity_data)
+                if len(activity_data) <= SVG_CHART_MAX_POINTS:
+                    activity_chart = self._create_activity_svg(activity_data)
+                else:
+                    activity_chart = self._create_activity_chart(activity_data)
                 if activity_chart:
                     pdf.image(activity_chart, x=10, y=None, w=190)
 
             # Add some spacing
-            pdf.cell(0, 10, "", ln=True)
+            pdf.cell(0, 10, "", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
             # Subject activity
-            pdf.set_font("Arial", "B", 14)
-            pdf.cell(0, 15, "Subject Activity", ln=True)
+            pdf.set_font("Helvetica", "B", 14)
+            pdf.cell(0, 15, "Subject Activity", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
             if subject_activity:
                 # Generate subject activity chart
-                subject_chart = self._create_subject_chart(subject_activity)
+                if len(subject_activity) <= SVG_CHART_MAX_POINTS:
+                    subject_chart = self._create_subject_svg(subject_activity)
+                else:
+                    subject_chart = self._create_subject_chart(subject_activity)
                 if subject_chart:
                     pdf.image(subject_chart, x=10, y=None, w=190)
             else:
-                pdf.set_font("Arial", "I", 12)
+                pdf.set_font("Helvetica", "I", 12)
                 pdf.cell(
                     0,
                     10,
                     "No subject activity data available for this period.",
-                    ln=True,
+                    new_x=XPos.LMARGIN,
+                    new_y=YPos.NEXT,
                 )
 
             # Start a new page for insights
             pdf.add_page()
 
             # AI-Generated Insights
-            pdf.set_font("Arial", "B", 16)
-            pdf.cell(0, 15, "AI-Generated Insights", ln=True)
-
-            # Filter insights by type
-            strength_insights = [
-                i for i in insights if i.get("recommendationType") == "strength"
-            ]
-            improvement_insights = [
-                i for i in insights if i.get("recommendationType") == "improvement"
-            ]
-            classroom_insights = [
-                i for i in insights if i.get("recommendationType") == "classroom"
-            ]
-
-            # Classroom Activities
-            if classroom_insights:
-                pdf.set_font("Arial", "B", 14)
-                pdf.cell(0, 15, "Recommended Classroom Activities", ln=True)
-
-                for insight in classroom_insights:
-                    pdf.set_font("Arial", "B", 12)
-                    pdf.cell(0, 10, insight.get("title", ""), ln=True)
-
-                    pdf.set_font("Arial", "", 12)
-
-                    # Word wrap for description
-                    description = insight.get("description", "")
-                    # Wrap long lines
-                    pdf.multi_cell(0, 8, description)
-
-                    if insight.get("subjects"):
-                        pdf.set_font("Arial", "I", 10)
-                        pdf.cell(
-                            0,
-                            8,
-                            f"Relevant subjects: {', '.join(insight.get('subjects', []))}",
-                            ln=True,
-                        )
-
-                    pdf.cell(0, 5, "", ln=True)
-
-            # Areas of Strength
-            if strength_insights:
-                pdf.set_font("Arial", "B", 14)
-                pdf.cell(0, 15, "Areas of Strength", ln=True)
-
-                for insight in strength_insights:
-                    pdf.set_font("Arial", "B", 12)
-                    pdf.cell(0, 10, insight.get("title", ""), ln=True)
-
-                    pdf.set_font("Arial", "", 12)
-
-                    # Word wrap for description
-                    description = insight.get("description", "")
-                    pdf.multi_cell(0, 8, description)
-
-                    if insight.get("subjects"):
-                        pdf.set_font("Arial", "I", 10)
-                        pdf.cell(
-                            0,
-                            8,
-                            f"Relevant subjects: {', '.join(insight.get('subjects', []))}",
-                            ln=True,
-                        )
-
-                    pdf.cell(0, 5, "", ln=True)
-
-            # Areas for Improvement
-            if improvement_insights:
-                pdf.set_font("Arial", "B", 14)
-                pdf.cell(0, 15, "Areas for Improvement", ln=True)
-
-                for insight in improvement_insights:
-                    pdf.set_font("Arial", "B", 12)
-                    pdf.cell(0, 10, insight.get("title", ""), ln=True)
-
-                    pdf.set_font("Arial", "", 12)
-
-                    # Word wrap for description
-                    description = insight.get("description", "")
-                    pdf.multi_cell(0, 8, description)
+            pdf.set_font("Helvetica", "B", 16)
+            pdf.cell(
+                0, 15, "AI-Generated Insights", new_x=XPos.LMARGIN, new_y=YPos.NEXT
+            )
 
-                    if insight.get("subjects"):
-                        pdf.set_font("Arial", "I", 10)
-                        pdf.cell(
-                            0,
-                            8,
-                            f"Relevant subjects: {', '.join(insight.get('subjects', []))}",
-                            ln=True,
-                        )
+            # Group insights by type in a single pass, then render each section
+            insights_by_type = defaultdict(list)
+            for insight in insights:
+                insights_by_type[insight.get("recommendationType")].append(insight)
 
-                    pdf.cell(0, 5, "", ln=True)
+            for insight_type, heading in PDF_INSIGHT_SECTIONS:
+                if insights_by_type[insight_type]:
+                    self._render_insight_section(
+                        pdf, heading, insights_by_type[insight_type]
+                    )
 
             # Footer
             pdf.set_y(-20)
-            pdf.set_font("Arial", "I", 8)
+            pdf.set_font("Helvetica", "I", 8)
             pdf.cell(
                 0,
                 10,
                 f"Generated on {datetime.utcnow().strftime('%Y-%m-%d')} - AI Tutoring Insights",
-                ln=True,
+                new_x=XPos.LMARGIN,
+                new_y=YPos.NEXT,
                 align="C",
             )
 
             # Output the PDF
-            return pdf.output(dest="S").encode("latin1")
+            return bytes(pdf.output())
 
         except Exception as e:
             logger.error(f"Error generating PDF report: {str(e)}")
@@ -946,56 +1498,356 @@ class AnalyticsEngine:
             # Create a simple error PDF
             pdf = FPDF()
             pdf.add_page()
-            pdf.set_font("Arial", "B", 16)
-            pdf.cell(0, 10, "Error Generating Report", ln=True, align="C")
-            pdf.set_font("Arial", "", 12)
-            pdf.cell(0, 10, "An error occurred while generating this report.", ln=True)
+            pdf.set_font("Helvetica", "B", 16)
+            pdf.cell(
+                0,
+                10,
+                "Error Generating Report",
+                new_x=XPos.LMARGIN,
+                new_y=YPos.NEXT,
+                align="C",
+            )
+            pdf.set_font("Helvetica", "", 12)
+            pdf.cell(
+                0,
+                10,
+                "An error occurred while generating this report.",
+                new_x=XPos.LMARGIN,
+                new_y=YPos.NEXT,
+            )
             pdf.cell(
                 0,
                 10,
                 "Please try again later or contact support if the issue persists.",
-                ln=True,
+                new_x=XPos.LMARGIN,
+                new_y=YPos.NEXT,
+            )
+
+            return bytes(pdf.output())
+
+    @staticmethod
+    def _render_insight_section(
+        pdf: FPDF, heading: str, insights: List[Dict[str, Any]]
+    ) -> None:
+        """Write a titled section of insights, switching fonts only on style changes"""
+        pdf.set_font("Helvetica", "B", 14)
+        pdf.cell(0, 15, heading, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+        current_font = None
+        for insight in insights:
+            blocks = [
+                (("Helvetica", "B", 12), 10, insight.get("title", ""), False),
+                (("Helvetica", "", 12), 8, insight.get("description", ""), True),
+            ]
+            if insight.get("subjects"):
+                blocks.append(
+                    (
+                        ("Helvetica", "I", 10),
+                        8,
+                        f"Relevant subjects: {', '.join(insight['subjects'])}",
+                        False,
+                    )
+                )
+
+            for font, line_height, text, wrap in blocks:
+                if font != current_font:
+                    pdf.set_font(*font)
+                    current_font = font
+                if wrap:
+                    # Word wrap for description
+                    pdf.multi_cell(
+                        0, line_height, text, new_x=XPos.LMARGIN, new_y=YPos.NEXT
+                    )
+                else:
+                    pdf.cell(0, line_height, text, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+            pdf.ln(5)
+
+    @staticmethod
+    def _svg_axes(
+        width: int,
+        height: int,
+        y_max: float,
+        x_positions: List[float],
+        x_labels: List[str],
+        x_title: str,
+        y_title: str,
+    ) -> List[str]:
+        """Build the grid, axes and tick labels shared by the SVG charts"""
+        left, right, top, bottom = 70, width - 20, 50, height - 110
+        elements = []
+
+        # Horizontal grid lines with y tick labels
+        for step in range(6):
+            value = y_max * step / 5
+            y = bottom - (bottom - top) * step / 5
+            elements.append(
+                f'<line x1="{left}" y1="{y:.1f}" x2="{right}" y2="{y:.1f}" '
+                'stroke="#cccccc" stroke-dasharray="4 3"/>'
+                f'<text x="{left - 8}" y="{y + 4:.1f}" text-anchor="end">'
+                f"{value:g}</text>"
+            )
+
+        # Axes
+        elements.append(
+            f'<line x1="{left}" y1="{top}" x2="{left}" y2="{bottom}" stroke="#333333"/>'
+            f'<line x1="{left}" y1="{bottom}" x2="{right}" y2="{bottom}" '
+            'stroke="#333333"/>'
+        )
+
+        # X tick labels, thinned out so they don't overlap
+        label_every = max(1, math.ceil(len(x_labels) / 30))
+        for i, (x, label) in enumerate(zip(x_positions, x_labels)):
+            if i % label_every:
+                continue
+            elements.append(
+                f'<text x="{x:.1f}" y="{bottom + 16}" text-anchor="end" '
+                f'transform="rotate(-45 {x:.1f} {bottom + 16})">'
+                f"{escape(str(label))}</text>"
+            )
+
+        # Axis titles
+        elements.append(
+            f'<text x="{(left + right) / 2:.1f}" y="{height - 8}" '
+            f'text-anchor="middle">{escape(x_title)}</text>'
+            f'<text x="16" y="{(top + bottom) / 2:.1f}" text-anchor="middle" '
+            f'transform="rotate(-90 16 {(top + bottom) / 2:.1f})">'
+            f"{escape(y_title)}</text>"
+        )
+
+        return elements
+
+    @staticmethod
+    def _svg_legend(width: int, series: List[Tuple[str, str]]) -> List[str]:
+        """Build a legend in the top right corner of an SVG chart"""
+        elements = []
+        for i, (label, color) in enumerate(series):
+            y = 58 + i * 18
+            elements.append(
+                f'<rect x="{width - 190}" y="{y - 10}" width="12" height="12" '
+                f'fill="{color}"/>'
+                f'<text x="{width - 172}" y="{y}">{escape(label)}</text>'
+            )
+        return elements
+
+    def _create_activity_svg(
+        self, activity_data: List[Dict[str, Any]]
+    ) -> Optional[bytes]:
+        """Create activity line chart as an SVG document"""
+        try:
+            width, height = 1000, 500
+            left, right, top, bottom = 70, width - 20, 50, height - 110
+
+            dates = [item.get("date") for item in activity_data]
+            series = [
+                ("Total Activity", "#1f77b4", "total"),
+                ("Questions", "#ff7f0e", "questions"),
+                ("Practice", "#2ca02c", "practice"),
+            ]
+            values = {
+                key: [item.get(key) or 0 for item in activity_data]
+                for _, _, key in series
+            }
+            y_max = max([max(v) for v in values.values()] + [1])
+
+            step = (right - left) / len(dates)
+            x_positions = [left + (i + 0.5) * step for i in range(len(dates))]
+
+            body = self._svg_axes(
+                width,
+                height,
+                y_max,
+                x_positions,
+                dates,
+                "Date",
+                "Number of Sessions",
+            )
+            for _, color, key in series:
+                points = [
+                    (x, bottom - (bottom - top) * v / y_max)
+                    for x, v in zip(x_positions, values[key])
+                ]
+                body.append(
+                    '<polyline fill="none" stroke-width="2" '
+                    f'stroke="{color}" points="'
+                    + " ".join(f"{x:.1f},{y:.1f}" for x, y in points)
+                    + '"/>'
+                )
+                body.extend(
+                    f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3" fill="{color}"/>'
+                    for x, y in points
+                )
+            body.extend(
+                self._svg_legend(width, [(label, color) for label, color, _ in series])
+            )
+
+            svg = SVG_CHART_TEMPLATE.substitute(
+                width=width,
+                height=height,
+                title_x=width // 2,
+                title="AI Tutoring Activity Over Time",
+                body="".join(body),
             )
+            return svg.encode("utf-8")
+
+        except Exception as e:
+            logger.error(f"Error creating activity SVG chart: {str(e)}")
+            return None
+
+    def _create_subject_svg(
+        self, subject_data: List[Dict[str, Any]]
+    ) -> Optional[bytes]:
+        """Create subject activity bar chart as an SVG document"""
+        try:
+            width, height = 1000, 600
+            left, right, top, bottom = 70, width - 20, 50, height - 110
+
+            subjects = [item.get("subject") for item in subject_data]
+            series = [
+                ("Activity Level", "#4f46e5", "activity"),
+                ("Strengths", "#0891b2", "strength"),
+                ("Areas for Improvement", "#f59e0b", "improvement"),
+            ]
+            values = {
+                key: [item.get(key) or 0 for item in subject_data]
+                for _, _, key in series
+            }
+            y_max = max([max(v) for v in values.values()] + [1])
 
-            return pdf.output(dest="S").encode("latin1")
+            step = (right - left) / len(subjects)
+            bar_width = step * 0.25
+            x_positions = [left + (i + 0.5) * step for i in range(len(subjects))]
+
+            body = self._svg_axes(
+                width, height, y_max, x_positions, subjects, "Subject", "Score"
+            )
+            for offset, (_, color, key) in zip((-1, 0, 1), series):
+                for x, v in zip(x_positions, values[key]):
+                    bar_height = (bottom - top) * v / y_max
+                    body.append(
+                        f'<rect x="{x + (offset - 0.5) * bar_width:.1f}" '
+                        f'y="{bottom - bar_height:.1f}" width="{bar_width:.1f}" '
+                        f'height="{bar_height:.1f}" fill="{color}"/>'
+                    )
+            body.extend(
+                self._svg_legend(width, [(label, color) for label, color, _ in series])
+            )
+
+            svg = SVG_CHART_TEMPLATE.substitute(
+                width=width,
+                height=height,
+                title_x=width // 2,
+                title="Subject Activity Analysis",
+                body="".join(body),
+            )
+            return svg.encode("utf-8")
+
+        except Exception as e:
+            logger.error(f"Error creating subject SVG chart: {str(e)}")
+            return None
+
+    def _chart_axes(self, name: str, figsize: Tuple[int, int]) -> Tuple[Any, Any]:
+        """Return the reusable Agg figure and cleared axes for a chart
+
+        Callers must hold ``self._chart_lock`` while drawing on the figure.
+        """
+        figure = self._chart_figures.get(name)
+        if figure is None:
+            # Draw through the Agg canvas directly so no GUI backend or pyplot
+            # figure manager is ever involved
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+
+            fig = Figure(figsize=figsize, dpi=CHART_DPI)
+            FigureCanvasAgg(fig)
+            figure = self._chart_figures[name] = (fig, fig.add_subplot())
+
+        figure[1].clear()
+        return figure
+
+    @staticmethod
+    def _figure_png(fig: Any) -> bytes:
+        """Rasterize a figure on its Agg canvas and encode it as PNG with Pillow"""
+        from PIL import Image
+
+        fig.canvas.draw()
+        # buffer_rgba() exposes the Agg pixel buffer without copying it
+        pixels = np.asarray(fig.canvas.buffer_rgba())
+        img_buffer = io.BytesIO()
+        Image.fromarray(pixels, "RGBA").save(
+            img_buffer, format="PNG", compress_level=CHART_PNG_COMPRESS_LEVEL
+        )
+        return img_buffer.getvalue()
+
+    @staticmethod
+    def _chart_cache_key(chart: str, data: List[Dict[str, Any]]) -> bytes:
+        """Hash a chart name and its input data into a stable cache key"""
+        return hashlib.blake2b(
+            chart.encode()
+            + orjson.dumps(data, option=orjson.OPT_SORT_KEYS, default=str),
+            digest_size=16,
+        ).digest()
+
+    def _chart_cache_lookup(self, key: bytes) -> Optional[str]:
+        """Return an unexpired rendered chart cached under key"""
+        with self._chart_lock:
+            entry = self._chart_cache.get(key)
+            if entry is None:
+                return None
+
+            expires_at, chart = entry
+            if expires_at < time.monotonic():
+                del self._chart_cache[key]
+                return None
+
+            self._chart_cache.move_to_end(key)
+            return chart
+
+    def _chart_cache_store(self, key: bytes, chart: str) -> None:
+        """Cache a rendered chart under key, evicting the oldest entries"""
+        with self._chart_lock:
+            self._chart_cache[key] = (time.monotonic() + CHART_CACHE_TTL_SECONDS, chart)
+            self._chart_cache.move_to_end(key)
+            if len(self._chart_cache) > CHART_CACHE_MAXSIZE:
+                self._chart_cache.popitem(last=False)
 
     def _create_activity_chart(
         self, activity_data: List[Dict[str, Any]]
     ) -> Optional[str]:
         """Create activity chart and return as base64 image"""
         try:
+            cache_key = self._chart_cache_key("activity", activity_data)
+            cached = self._chart_cache_lookup(cache_key)
+            if cached is not None:
+                return cached
+
             # Extract data
             dates = [item.get("date") for item in activity_data]
             total = [item.get("total") for item in activity_data]
             questions = [item.get("questions") for item in activity_data]
             practice = [item.get("practice") for item in activity_data]
 
-            # Create the figure and axis
-            plt.figure(figsize=(10, 5))
-            plt.plot(dates, total, marker="o", label="Total Activity")
-            plt.plot(dates, questions, marker="s", label="Questions")
-            plt.plot(dates, practice, marker="^", label="Practice")
-
-            # Add labels and title
-            plt.xlabel("Date")
-            plt.ylabel("Number of Sessions")
-            plt.title("AI Tutoring Activity Over Time")
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            plt.legend()
-            plt.grid(True, linestyle="--", alpha=0.7)
-
-            # Save to in-memory file
-            img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format="png")
-            plt.close()
+            with self._chart_lock:
+                fig, ax = self._chart_axes("activity", (10, 5))
+                ax.plot(dates, total, marker="o", label="Total Activity")
+                ax.plot(dates, questions, marker="s", label="Questions")
+                ax.plot(dates, practice, marker="^", label="Practice")
+
+                # Add labels and title
+                ax.set_xlabel("Date")
+                ax.set_ylabel("Number of Sessions")
+                ax.set_title("AI Tutoring Activity Over Time")
+                ax.tick_params(axis="x", labelrotation=45)
+                ax.legend()
+                ax.grid(True, linestyle="--", alpha=0.7)
+                fig.tight_layout()
+
+                png = self._figure_png(fig)
 
             # Encode as base64
-            img_buffer.seek(0)
-            return (
-                "data:image/png;base64,"
-                + base64.b64encode(img_buffer.getvalue()).decode()
-            )
+            chart = "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+            self._chart_cache_store(cache_key, chart)
+            return chart
 
         except Exception as e:
             logger.error(f"Error creating activity chart: {str(e)}")
@@ -1006,55 +1858,54 @@ class AnalyticsEngine:
     ) -> Optional[str]:
         """Create subject activity chart and return as base64 image"""
         try:
+            cache_key = self._chart_cache_key("subject", subject_data)
+            cached = self._chart_cache_lookup(cache_key)
+            if cached is not None:
+                return cached
+
             # Extract data
             subjects = [item.get("subject") for item in subject_data]
             activity = [item.get("activity") for item in subject_data]
             strength = [item.get("strength") for item in subject_data]
             improvement = [item.get("improvement") for item in subject_data]
 
-            # Create the figure and axis
-            plt.figure(figsize=(10, 6))
-
             # Adjust color for better contrast in PDF
             bar_width = 0.25
             x = np.arange(len(subjects))
 
-            plt.bar(
-                x - bar_width,
-                activity,
-                width=bar_width,
-                label="Activity Level",
-                color="#4f46e5",
-            )
-            plt.bar(x, strength, width=bar_width, label="Strengths", color="#0891b2")
-            plt.bar(
-                x + bar_width,
-                improvement,
-                width=bar_width,
-                label="Areas for Improvement",
-                color="#f59e0b",
-            )
+            with self._chart_lock:
+                fig, ax = self._chart_axes("subject", (10, 6))
+                ax.bar(
+                    x - bar_width,
+                    activity,
+                    width=bar_width,
+                    label="Activity Level",
+                    color="#4f46e5",
+                )
+                ax.bar(x, strength, width=bar_width, label="Strengths", color="#0891b2")
+                ax.bar(
+                    x + bar_width,
+                    improvement,
+                    width=bar_width,
+                    label="Areas for Improvement",
+                    color="#f59e0b",
+                )
 
-            # Add labels and title
-            plt.xlabel("Subject")
-            plt.ylabel("Score")
-            plt.title("Subject Activity Analysis")
-            plt.xticks(x, subjects, rotation=45, ha="right")
-            plt.tight_layout()
-            plt.legend()
-            plt.grid(True, linestyle="--", alpha=0.7)
+                # Add labels and title
+                ax.set_xlabel("Subject")
+                ax.set_ylabel("Score")
+                ax.set_title("Subject Activity Analysis")
+                ax.set_xticks(x, subjects, rotation=45, ha="right")
+                ax.legend()
+                ax.grid(True, linestyle="--", alpha=0.7)
+                fig.tight_layout()
 
-            # Save to in-memory file
-            img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format="png")
-            plt.close()
+                png = self._figure_png(fig)
 
             # Encode as base64
-            img_buffer.seek(0)
-            return (
-                "data:image/png;base64,"
-                + base64.b64encode(img_buffer.getvalue()).decode()
-            )
+            chart = "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+            self._chart_cache_store(cache_key, chart)
+            return chart
 
         except Exception as e:
             logger.error(f"Error creating subject chart: {str(e)}")
@@ -1077,60 +1928,53 @@ class AnalyticsEngine:
         )
 
         # Calculate grade statistics
-        grades = [
-            e["grade"] for e in course_data["enrollments"] if e["grade"] is not None
-        ]
-        avg_grade = sum(grades) / len(grades) if grades else 0
+        grades = np.fromiter(
+            (e["grade"] for e in course_data["enrollments"] if e["grade"] is not None),
+            dtype=np.float64,
+        )
+        avg_grade = float(grades.mean()) if grades.size else 0
 
         # Calculate engagement metrics
-        submissions_per_student = {}
-        tutoring_per_student = {}
-
-        for submission in course_data["submissions"]:
-            student_id = submission["student_id"]
-            submissions_per_student[student_id] = (
-                submissions_per_student.get(student_id, 0) + 1
-            )
-
-        for session in course_data["tutoring_sessions"]:
-            student_id = session["student_id"]
-            tutoring_per_student[student_id] = (
-                tutoring_per_student.get(student_id, 0) + 1
-            )
+        submissions_per_student = Counter(
+            s["student_id"] for s in course_data["submissions"]
+        )
+        tutoring_per_student = Counter(
+            s["student_id"] for s in course_data["tutoring_sessions"]
+        )
 
         avg_submissions = (
-            sum(submissions_per_student.values()) / total_students
+            submissions_per_student.total() / total_students
             if total_students > 0
             else 0
         )
         avg_tutoring = (
-            sum(tutoring_per_student.values()) / total_students
-            if total_students > 0
-            else 0
+            tutoring_per_student.total() / total_students if total_students > 0 else 0
         )
 
         # Calculate an engagement score (0-10)
         engagement_score = min(10, round((avg_submissions * 2 + avg_tutoring * 3) / 2))
 
-        # Calculate assignment completion rates
+        # Calculate assignment completion rates from a single-pass index of
+        # submissions by assignment
+        submissions_by_assignment = defaultdict(list)
+        for submission in course_data["submissions"]:
+            submissions_by_assignment[submission["assignment_id"]].append(submission)
+
         assignment_completion = {}
         for assignment in course_data["assignments"]:
             assignment_id = assignment["id"]
-            submissions = [
-                s
-                for s in course_data["submissions"]
-                if s["assignment_id"] == assignment_id
-            ]
+            submissions = submissions_by_assignment.get(assignment_id, ())
             completion_rate = (
                 len(submissions) / total_students if total_students > 0 else 0
             )
+            submission_grades = np.fromiter(
+                (s["grade"] for s in submissions if s["grade"] is not None),
+                dtype=np.float64,
+            )
             assignment_completion[assignment_id] = {
                 "title": assignment["title"],
                 "completion_rate": completion_rate,
-                "avg_grade": sum(
-                    [s["grade"] for s in submissions if s["grade"] is not None]
-                )
-                / len(submissions)
+                "avg_grade": float(submission_grades.sum()) / len(submissions)
                 if submissions
                 else 0,
             }
@@ -1152,40 +1996,97 @@ class AnalyticsEngine:
 
         return metrics
 
+    async def _objective_coverage(
+        self, objectives: List[str], topic_names: List[str]
+    ) -> List[bool]:
+        """
+        Flag which learning objectives are covered by the discussed topics
+
+        Objectives and topics are embedded in one batch and an objective counts as
+        covered when its best cosine similarity to any topic reaches
+        OBJECTIVE_COVERAGE_SIMILARITY_THRESHOLD. Falls back to case-insensitive
+        substring matching when embeddings are unavailable.
+
+        Args:
+            objectives: Learning objectives of the course
+            topic_names: Names of the topics discussed in tutoring sessions
+
+        Returns:
+            One coverage flag per objective
+        """
+        if not objectives or not topic_names:
+            return [False] * len(objectives)
+
+        try:
+            if not self.embedding_model.client:
+                await self.embedding_model.init_client()
+
+            embeddings = await self.embedding_model.generate_embeddings(
+                objectives + topic_names
+            )
+            similarity = self.embedding_model.pairwise_cosine_similarity(
+                embeddings[: len(objectives)], embeddings[len(objectives) :]
+            )
+            return (
+                similarity.max(axis=1) >= OBJECTIVE_COVERAGE_SIMILARITY_THRESHOLD
+            ).tolist()
+
+        except Exception as e:
+            logger.warning(f"Falling back to substring objective matching: {str(e)}")
+            # Lowercase the topics once and join them with a separator no objective
+            # contains, so each objective is a single substring search
+            topic_index = "\0".join(topic.lower() for topic in topic_names)
+            return [objective.lower() in topic_index for objective in objectives]
+
     async def analyze_content_embeddings(
         self, course_id: int, db: AsyncSession
     ) -> Dict[str, Any]:
         """Analyze course content using embeddings"""
         try:
-            # Get course details
+            # Fetch the course and its tutoring sessions concurrently, the sessions
+            # on their own pooled session with topics and exchanges eager-loaded
             course_query = select(SchoolCourse).where(SchoolCourse.id == course_id)
-            course_result = await db.execute(course_query)
-            course = course_result.scalar_one_or_none()
+            tutoring_query = (
+                select(DetailedTutoringSession)
+                .options(
+                    selectinload(DetailedTutoringSession.topic),
+                    selectinload(DetailedTutoringSession.exchanges),
+                )
+                .where(DetailedTutoringSession.related_course_id == course_id)
+            )
+            courses, tutoring_sessions = await asyncio.gather(
+                self._fetch_all(course_query, db=db),
+                self._fetch_all(tutoring_query),
+            )
+            course = courses[0] if courses else None
 
             if not course:
                 raise ValueError(f"Course with ID {course_id} not found")
 
-            # Get all tutoring sessions related to this course
-            tutoring_query = select(DetailedTutoringSession).where(
-                DetailedTutoringSession.related_course_id == course_id
-            )
-            tutoring_result = await db.execute(tutoring_query)
-            tutoring_sessions = tutoring_result.scalars().all()
-
-            # Count topics by frequency
-            topic_counts = {}
+            # Count topics by frequency and high-confusion exchanges per topic in
+            # a single pass, collecting the eager-loaded topics along the way
+            topic_counts = Counter()
+            confusion_counts = Counter()
+            topics_by_id = {}
             for session in tutoring_sessions:
-                if session.topic_id:
-                    topic_counts[session.topic_id] = (
-                        topic_counts.get(session.topic_id, 0) + 1
-                    )
+                topic_id = session.topic_id
+                if not topic_id:
+                    continue
+
+                topic_counts[topic_id] += 1
+                if session.topic is not None:
+                    topics_by_id[topic_id] = session.topic
+                for exchange in session.exchanges:
+                    signals = exchange.learning_signals
+                    if (
+                        signals
+                        and signals.get("misunderstanding", 0)
+                        > CONFUSION_SIGNAL_THRESHOLD
+                    ):
+                        confusion_counts[topic_id] += 1
 
-            # Get topics from database
             if topic_counts:
-                topic_ids = list(topic_counts.keys())
-                topics_query = select(Topic).where(Topic.id.in_(topic_ids))
-                topics_result = await db.execute(topics_query)
-                topics = topics_result.scalars().all()
+                topics = list(topics_by_id.values())
 
                 # Analyze topic cohesion and gaps
                 topic_names = [topic.name for topic in topics]
@@ -1196,11 +2097,11 @@ class AnalyticsEngine:
                 # Compare learning objectives with covered topics
                 covered_objectives = []
                 missing_objectives = []
+                coverage = await self._objective_coverage(
+                    learning_objectives, topic_names
+                )
 
-                for objective in learning_objectives:
-                    is_covered = any(
-                        objective.lower() in topic.lower() for topic in topic_names
-                    )
+                for objective, is_covered in zip(learning_objectives, coverage):
                     if is_covered:
                         covered_objectives.append(objective)
                     else:
@@ -1214,10 +2115,10 @@ class AnalyticsEngine:
                 )
 
                 # Identify strengths based on frequently discussed topics
-                sorted_topics = sorted(
-                    topic_counts.items(), key=lambda x: x[1], reverse=True
-                )
-                top_topic_ids = [topic_id for topic_id, _ in sorted_topics[:3]]
+                # most_common(n) keeps a bounded heap instead of sorting every topic
+                top_topic_ids = [
+                    topic_id for topic_id, _ in topic_counts.most_common(3)
+                ]
                 strength_topics = [
                     topic for topic in topics if topic.id in top_topic_ids
                 ]
@@ -1230,34 +2131,14 @@ class AnalyticsEngine:
                         f"Add more content covering '{objective}'"
                     )
 
-                if len(tutoring_sessions) > 0:
-                    # Check for topics with high confusion indicators
-                    confusion_counts = {}
-                    for session in tutoring_sessions:
-                        if session.topic_id and hasattr(session, "exchanges"):
-                            for exchange in session.exchanges:
-                                if (
-                                    exchange.learning_signals
-                                    and exchange.learning_signals.get(
-                                        "misunderstanding", 0
-                                    )
-                                    > 0.6
-                                ):
-                                    confusion_counts[session.topic_id] = (
-                                        confusion_counts.get(session.topic_id, 0) + 1
-                                    )
-
-                    # Find topics with high confusion
-                    if confusion_counts:
-                        confused_topics = sorted(
-                            confusion_counts.items(), key=lambda x: x[1], reverse=True
-                        )
-                        for topic_id, count in confused_topics[:2]:
-                            topic = next((t for t in topics if t.id == topic_id), None)
-                            if topic:
-                                improvement_suggestions.append(
-                                    f"Improve explanations for '{topic.name}' to address student confusion"
-                                )
+                # Find topics with high confusion
+                if confusion_counts:
+                    for topic_id, count in confusion_counts.most_common(2):
+                        topic = topics_by_id.get(topic_id)
+                        if topic:
+                            improvement_suggestions.append(
+                                f"Improve explanations for '{topic.name}' to address student confusion"
+                            )
 
                 return {
                     "content_coherence": content_coherence,
@@ -5,8 +5,11 @@ This module handles the embedding generation using OpenAI's embedding models.
 It provides a consistent interface for generating embeddings for text.
 """
 
+import asyncio
+import hashlib
 import numpy as np
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Set, Tuple, Union
 import logging
 import httpx
 import tenacity
@@ -26,17 +29,31 @@ class EmbeddingModel:
         embedding_dimension: Optional[int] = None,
         max_retries: int = 3,
         timeout: float = 30.0,
+        max_batch_size: int = 96,
+        max_batch_wait: float = 0.005,
+        cache_size: int = 4096,
     ):
         """Initialize the embedding model"""
         self.model_name = model_name or settings.EMBEDDING_MODEL
         self.api_key = api_key or settings.OPENAI_API_KEY
-        self.embedding_dimension = embedding_dimension or int(
-            settings.EMBEDDING_DIMENSION
-        )
+        self.embedding_dimension = embedding_dimension or settings.EMBEDDING_DIMENSION
         self.max_retries = max_retries
         self.timeout = timeout
         self.client = None
 
+        # Single-text requests are coalesced into batches of up to
+        # max_batch_size texts, waiting at most max_batch_wait seconds
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_worker: Optional[asyncio.Task] = None
+        self._inflight_batches: Set[asyncio.Task] = set()
+
+        # Embeddings are deterministic per (model, text), so recent ones are kept
+        # as float16 in an LRU keyed by a hash of both
+        self.cache_size = cache_size
+        self._cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+
         # Client will be initialized at application startup
 
     async def init_client(self):
@@ -52,6 +69,7 @@ class EmbeddingModel:
             self.client = AsyncOpenAI(
                 api_key=self.api_key, timeout=httpx.Timeout(self.timeout)
             )
+            self._start_batch_worker()
 
             # Test the client with a simple embedding request
             test_result = await self.generate_embedding("Test embedding")
@@ -70,16 +88,100 @@ class EmbeddingModel:
             logger.error(f"Failed to initialize embedding model: {str(e)}")
             raise
 
-    @tenacity.retry(
-        retry=tenacity.retry_if_exception_type(Exception),
-        wait=tenacity.wait_exponential(multiplier=1, min=2, max=10),
-        stop=tenacity.stop_after_attempt(3),
-        reraise=True,
-    )
+    def _start_batch_worker(self):
+        """Start the background task that coalesces single-text requests"""
+        if self._batch_worker is None or self._batch_worker.done():
+            self._queue = asyncio.Queue()
+            self._batch_worker = asyncio.create_task(self._run_batch_worker())
+
+    async def _run_batch_worker(self):
+        """Collect queued texts into batches and dispatch them concurrently"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch: List[Tuple[str, asyncio.Future]] = [await self._queue.get()]
+            deadline = loop.time() + self.max_batch_wait
+
+            try:
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(
+                            await asyncio.wait_for(self._queue.get(), remaining)
+                        )
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Don't strand the texts collected so far
+                self._fail_pending(batch)
+                raise
+
+            # Dispatch without waiting so the next batch can start filling
+            task = asyncio.create_task(self._embed_batch(batch))
+            self._inflight_batches.add(task)
+            task.add_done_callback(self._inflight_batches.discard)
+
+    async def _embed_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        """Embed a batch of queued texts and resolve their futures"""
+        pending = [(text, future) for text, future in batch if not future.done()]
+        if not pending:
+            return
+
+        try:
+            embeddings = await self.generate_embeddings([text for text, _ in pending])
+        except asyncio.CancelledError:
+            # Cancelled by close() while the request was in flight
+            self._fail_pending(pending)
+            raise
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(pending, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+    @staticmethod
+    def _fail_pending(batch: List[Tuple[str, asyncio.Future]]):
+        """Fail the futures of a batch that will never be embedded"""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("Embedding model closed"))
+
+    def _cache_key(self, text: str) -> bytes:
+        """Hash the model name and text into an embedding cache key"""
+        return hashlib.blake2b(
+            f"{self.model_name}\0{text}".encode(), digest_size=16
+        ).digest()
+
+    def _cache_lookup(self, key: bytes) -> Optional[np.ndarray]:
+        """Return a cached embedding as float32, marking it as recently used"""
+        embedding = self._cache.get(key)
+        if embedding is None:
+            return None
+
+        self._cache.move_to_end(key)
+        return embedding.astype(np.float32)
+
+    def _cache_store(self, key: bytes, embedding: np.ndarray) -> None:
+        """Cache an embedding, evicting the least recently used entries"""
+        # float16 halves the footprint; the rounding error is far below what
+        # changes similarity rankings
+        self._cache[key] = embedding.astype(np.float16)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
     async def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text
 
+        Concurrent calls are coalesced into a single batched API request.
+
         Args:
             text: Input text
 
@@ -89,62 +191,112 @@ class EmbeddingModel:
         if not self.client:
             raise ValueError("Embedding model client not initialized")
 
-        try:
-            # Call the OpenAI API
-            response = await self.client.embeddings.create(
-                model=self.model_name, input=text, encoding_format="float"
-            )
+        cached = self._cache_lookup(self._cache_key(text))
+        if cached is not None:
+            return cached
 
-            # Extract the embedding
-            embedding = response.data[0].embedding
+        self._start_batch_worker()
 
-            # Convert to numpy array
-            return np.array(embedding, dtype=np.float32)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
 
+        try:
+            return await future
         except Exception as e:
             logger.error(f"Failed to generate embedding: {str(e)}")
             raise
 
-    @tenacity.retry(
-        retry=tenacity.retry_if_exception_type(Exception),
-        wait=tenacity.wait_exponential(multiplier=1, min=2, max=10),
-        stop=tenacity.stop_after_attempt(3),
-        reraise=True,
-    )
-    async def generate_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+    async def close(self):
+        """Stop the batching worker, fail pending requests and close the client"""
+        tasks = list(self._inflight_batches)
+        if self._batch_worker:
+            tasks.append(self._batch_worker)
+            self._batch_worker = None
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Texts still queued were never picked up by the worker
+        if self._queue:
+            while not self._queue.empty():
+                self._fail_pending([self._queue.get_nowait()])
+            self._queue = None
+
+        if self.client:
+            await self.client.close()
+            self.client = None
+
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for multiple texts
 
+        Only texts missing from the embedding cache are sent to the API.
+
         Args:
             texts: List of input texts
 
         Returns:
-            List[numpy.ndarray]: List of embedding vectors
+            numpy.ndarray: float32 matrix of shape (len(texts), dim), one row per text
         """
         if not self.client:
             raise ValueError("Embedding model client not initialized")
 
         if not texts:
-            return []
+            return np.empty((0, self.embedding_dimension), dtype=np.float32)
+
+        keys = [self._cache_key(text) for text in texts]
+        embeddings = {key: self._cache_lookup(key) for key in keys}
+
+        # Request each distinct missing text once
+        missing: Dict[bytes, str] = {
+            key: text for key, text in zip(keys, texts) if embeddings[key] is None
+        }
+        if missing:
+            # Split large requests into chunks that stay under the API's per-request
+            # limits and keep them in flight concurrently
+            missing_texts = list(missing.values())
+            chunks = [
+                missing_texts[i : i + self.max_batch_size]
+                for i in range(0, len(missing_texts), self.max_batch_size)
+            ]
+            try:
+                fetched = np.concatenate(
+                    await asyncio.gather(
+                        *(self._request_embeddings(chunk) for chunk in chunks)
+                    )
+                )
+            except Exception as e:
+                logger.error(f"Failed to generate embeddings: {str(e)}")
+                raise
 
-        try:
-            # Call the OpenAI API
-            response = await self.client.embeddings.create(
-                model=self.model_name, input=texts, encoding_format="float"
-            )
+            for key, embedding in zip(missing, fetched):
+                self._cache_store(key, embedding)
+                embeddings[key] = embedding
 
-            # Extract embeddings and sort them by index to preserve original order
-            embeddings_dict = {item.index: item.embedding for item in response.data}
-            embeddings = [embeddings_dict[i] for i in range(len(texts))]
+        return np.stack([embeddings[key] for key in keys])
+
+    @tenacity.retry(
+        retry=tenacity.retry_if_exception_type(Exception),
+        wait=tenacity.wait_exponential(multiplier=1, min=2, max=10),
+        stop=tenacity.stop_after_attempt(3),
+        reraise=True,
+    )
+    async def _request_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Call the OpenAI embeddings API for texts, preserving their order"""
+        response = await self.client.embeddings.create(
+            model=self.model_name, input=texts, encoding_format="float"
+        )
 
-            # Convert to numpy arrays
-            return [np.array(emb, dtype=np.float32) for emb in embeddings]
+        # Extract embeddings and sort them by index to preserve original order
+        embeddings_dict = {item.index: item.embedding for item in response.data}
 
-        except Exception as e:
-            logger.error(f"Failed to generate embeddings: {str(e)}")
-            raise
+        # One contiguous (n, dim) allocation
+        return np.asarray(
+            [embeddings_dict[i] for i in range(len(texts))], dtype=np.float32
+        )
 
-    async def cosine_similarity(
+    def cosine_similarity(
         self, embedding1: np.ndarray, embedding2: np.ndarray
     ) -> float:
         """
@@ -157,40 +309,96 @@ class EmbeddingModel:
         Returns:
             float: Cosine similarity score (0-1)
         """
-        # Calculate dot product
+        # Dot products are cheaper than np.linalg.norm for a single pair
         dot_product = np.dot(embedding1, embedding2)
-
-        # Calculate magnitudes
-        magnitude1 = np.linalg.norm(embedding1)
-        magnitude2 = np.linalg.norm(embedding2)
+        squared_norms = np.dot(embedding1, embedding1) * np.dot(embedding2, embedding2)
 
         # Calculate cosine similarity
-        if magnitude1 == 0 or magnitude2 == 0:
+        if squared_norms == 0:
             return 0.0
 
-        return dot_product / (magnitude1 * magnitude2)
+        return float(dot_product / np.sqrt(squared_norms))
+
+    @staticmethod
+    def normalize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+        """
+        L2-normalize embedding vectors so dot products equal cosine similarity
+
+        Args:
+            embeddings: Embedding vector or matrix of shape (n, dim)
+
+        Returns:
+            numpy.ndarray: float32 embeddings with unit norm (zero vectors stay zero)
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        # Row-wise squared norms in one float32 pass, without a squared temporary
+        norms = np.sqrt(np.einsum("...d,...d->...", embeddings, embeddings))[
+            ..., np.newaxis
+        ]
+        return embeddings / np.where(norms == 0, 1, norms)
+
+    @classmethod
+    def pairwise_cosine_similarity(
+        cls,
+        queries: np.ndarray,
+        candidates: np.ndarray,
+        normalized: bool = False,
+    ) -> np.ndarray:
+        """
+        Calculate cosine similarity between every query and every candidate
+
+        Args:
+            queries: Query embeddings of shape (q, dim)
+            candidates: Candidate embeddings of shape (c, dim)
+            normalized: Whether both inputs already come from normalize_embeddings
+
+        Returns:
+            numpy.ndarray: (q, c) matrix of cosine similarities
+        """
+        if not normalized:
+            queries = cls.normalize_embeddings(queries)
+            candidates = cls.normalize_embeddings(candidates)
+
+        # A single float32 GEMM
+        return queries @ candidates.T
 
     async def find_most_similar(
-        self, query_embedding: np.ndarray, candidate_embeddings: List[np.ndarray]
+        self,
+        query_embedding: np.ndarray,
+        candidate_embeddings: Union[List[np.ndarray], np.ndarray],
+        top_k: Optional[int] = None,
+        normalized: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Find most similar embeddings from a list of candidates
 
         Args:
             query_embedding: Query embedding vector
-            candidate_embeddings: List of candidate embedding vectors
+            candidate_embeddings: List of candidate embedding vectors, or an
+                (n, dim) matrix
+            top_k: Only return the k most similar candidates (all if None)
+            normalized: Whether candidate_embeddings is already a matrix from
+                normalize_embeddings, so it can be reused across queries
 
         Returns:
             List of similarity scores with indices, sorted by similarity
         """
-        results = []
+        if len(candidate_embeddings) == 0:
+            return []
 
-        # Calculate similarity for each candidate
-        for i, candidate in enumerate(candidate_embeddings):
-            similarity = await self.cosine_similarity(query_embedding, candidate)
-            results.append({"index": i, "similarity": similarity})
+        # Score all candidates with a single matrix-vector product
+        candidates = (
+            candidate_embeddings
+            if normalized
+            else self.normalize_embeddings(candidate_embeddings)
+        )
+        scores = candidates @ self.normalize_embeddings(query_embedding)
 
-        # Sort by similarity (descending)
-        results.sort(key=lambda x: x["similarity"], reverse=True)
+        # Only the top k scores need sorting
+        if top_k is not None and top_k < len(scores):
+            indices = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            indices = np.arange(len(scores))
+        indices = indices[np.argsort(-scores[indices], kind="stable")]
 
-        return results
+        return [{"index": int(i), "similarity": float(scores[i])} for i in indices]
@@ -7,11 +7,21 @@ This module handles the management of course embeddings, including:
 3. Searching for similar courses based on embeddings.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterable, List, Dict, Any, Optional, Tuple
+import asyncio
 import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.db.qdrant import QdrantClientWrapper
+from src.db.qdrant import (
+    DEFAULT_INDEXING_THRESHOLD,
+    QUANTIZED_CANDIDATE_PARAMS,
+    QUANTIZED_SEARCH_PARAMS,
+    QdrantClientWrapper,
+)
 from src.core.ai.embeddings import EmbeddingModel
+from src.core.settings import settings
+
+# Candidates fetched per requested result before rescoring quantized hits
+RESCORE_OVERSAMPLING = 2
 
 
 class CourseEmbeddingsService:
@@ -36,21 +46,229 @@ class CourseEmbeddingsService:
             content: The content to generate an embedding for.
 
         Returns:
-            np.ndarray: The generated embedding.
+            np.ndarray: The generated embedding, L2-normalized.
         """
-        # Generate the embedding using the embedding model
-        embedding = await self.embeddings_service.generate_embedding(content)
+        # Generate the embedding using the embedding model, normalized so the
+        # collection can score with plain dot products
+        embedding = self.embeddings_service.normalize_embeddings(
+            await self.embeddings_service.generate_embedding(content)
+        )
 
         # Upsert the embedding into Qdrant
         await self.qdrant_client.upsert_vectors(
             collection_name="course_content",
             vectors=[embedding],
-            ids=[str(course_id)],
+            ids=[course_id],
             payloads=[{"course_id": course_id}],
         )
 
         return embedding
 
+    async def create_course_embeddings_bulk(
+        self,
+        items: List[Tuple[int, str]],
+        batch_size: Optional[int] = None,
+        wait: bool = True,
+    ) -> np.ndarray:
+        """
+        Create and store embeddings for many courses at once.
+
+        Contents are embedded in batched API calls and upserted into Qdrant
+        batch_size courses per request, instead of one round trip per course.
+
+        Args:
+            items: (course_id, content) pairs to embed.
+            batch_size: Courses per upsert request, defaults to
+                settings.COURSE_EMBEDDING_BATCH_SIZE.
+            wait: Whether each upsert waits until its points are searchable.
+                Otherwise only the final batch waits, once the others are sent.
+
+        Returns:
+            np.ndarray: The generated L2-normalized embeddings, one row per item.
+        """
+        batch_size = batch_size or settings.COURSE_EMBEDDING_BATCH_SIZE
+
+        # Generate all embeddings with batched requests
+        embeddings = self.embeddings_service.normalize_embeddings(
+            await self.embeddings_service.generate_embeddings(
+                [content for _, content in items]
+            )
+        )
+
+        # Upsert the embeddings into Qdrant in concurrent batches
+        batches = [
+            (items[start : start + batch_size], embeddings[start : start + batch_size])
+            for start in range(0, len(items), batch_size)
+        ]
+        if wait:
+            await self._upsert_concurrent(batches)
+        elif batches:
+            # Updates apply in order, so waiting on the last one fences them all
+            await self._upsert_concurrent(batches[:-1], wait=False)
+            await self._upsert_concurrent(batches[-1:])
+
+        return embeddings
+
+    async def bulk_backfill(
+        self, items: List[Tuple[int, str]], batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Embed and store a large number of courses with indexing deferred.
+
+        HNSW indexing is paused while the points are written without waiting
+        for each upsert, then restored to the collection's previous threshold
+        so the index is built once at the end.
+
+        Args:
+            items: (course_id, content) pairs to embed.
+            batch_size: Courses per upsert request, defaults to
+                settings.COURSE_EMBEDDING_BATCH_SIZE.
+
+        Returns:
+            np.ndarray: The generated L2-normalized embeddings, one row per item.
+        """
+        previous_threshold = await self.qdrant_client.get_indexing_threshold(
+            "course_content"
+        )
+        await self.qdrant_client.set_indexing_threshold("course_content", 0)
+        try:
+            embeddings = await self.create_course_embeddings_bulk(
+                items, batch_size, wait=False
+            )
+        finally:
+            await self.qdrant_client.set_indexing_threshold(
+                "course_content",
+                DEFAULT_INDEXING_THRESHOLD
+                if previous_threshold is None
+                else previous_threshold,
+            )
+
+        # Fence on all pending writes and the rebuilt index
+        await self.qdrant_client.wait_for_collection("course_content")
+
+        return embeddings
+
+    async def pipeline(
+        self,
+        courses: AsyncIterable[Tuple[int, str]],
+        embed_batch_size: Optional[int] = None,
+        upsert_batch_size: int = 256,
+        max_pending_batches: int = 4,
+    ) -> int:
+        """
+        Embed and store a stream of courses with embedding and upserts overlapped.
+
+        One worker embeds courses in batches of embed_batch_size while another
+        upserts the results in batches of upsert_batch_size, connected by a
+        bounded queue so embedding batch N+1 runs while batch N is written.
+
+        Args:
+            courses: (course_id, content) pairs to embed.
+            embed_batch_size: Courses per embeddings request, defaults to
+                settings.COURSE_EMBEDDING_BATCH_SIZE.
+            upsert_batch_size: Courses per upsert request.
+            max_pending_batches: Embedded batches buffered ahead of the upserts.
+
+        Returns:
+            int: The number of courses stored successfully.
+        """
+        embed_batch_size = embed_batch_size or settings.COURSE_EMBEDDING_BATCH_SIZE
+        embedded: asyncio.Queue = asyncio.Queue(maxsize=max_pending_batches)
+
+        async def embed(batch: List[Tuple[int, str]]):
+            vectors = self.embeddings_service.normalize_embeddings(
+                await self.embeddings_service.generate_embeddings(
+                    [content for _, content in batch]
+                )
+            )
+            await embedded.put((batch, vectors))
+
+        async def embed_worker():
+            batch: List[Tuple[int, str]] = []
+            async for course in courses:
+                batch.append(course)
+                if len(batch) >= embed_batch_size:
+                    await embed(batch)
+                    batch = []
+
+            if batch:
+                await embed(batch)
+            await embedded.put(None)
+
+        async def upsert(batch: List[Tuple[int, str]], vectors: np.ndarray) -> int:
+            stored = await self.qdrant_client.upsert_vectors(
+                collection_name="course_content",
+                vectors=vectors,
+                ids=[course_id for course_id, _ in batch],
+                payloads=[{"course_id": course_id} for course_id, _ in batch],
+            )
+            return len(batch) if stored else 0
+
+        async def upsert_worker() -> int:
+            stored = 0
+            pending: List[Tuple[int, str]] = []
+            pending_vectors: List[np.ndarray] = []
+
+            while (entry := await embedded.get()) is not None:
+                pending.extend(entry[0])
+                pending_vectors.append(entry[1])
+                if len(pending) < upsert_batch_size:
+                    continue
+
+                vectors = np.concatenate(pending_vectors)
+                while len(pending) >= upsert_batch_size:
+                    stored += await upsert(
+                        pending[:upsert_batch_size], vectors[:upsert_batch_size]
+                    )
+                    pending = pending[upsert_batch_size:]
+                    vectors = vectors[upsert_batch_size:]
+                pending_vectors = [vectors]
+
+            if pending:
+                stored += await upsert(pending, np.concatenate(pending_vectors))
+            return stored
+
+        # A failure in either stage cancels the other
+        async with asyncio.TaskGroup() as group:
+            group.create_task(embed_worker())
+            upserts = group.create_task(upsert_worker())
+
+        return upserts.result()
+
+    async def _upsert_concurrent(
+        self,
+        batches: List[Tuple[List[Tuple[int, str]], np.ndarray]],
+        max_concurrency: Optional[int] = None,
+        wait: bool = True,
+    ) -> List[bool]:
+        """
+        Upsert batches of course embeddings with bounded concurrency.
+
+        Args:
+            batches: (items, embeddings) pairs, one per upsert request.
+            max_concurrency: Maximum requests in flight, defaults to
+                settings.QDRANT_UPSERT_CONCURRENCY.
+            wait: Whether each upsert waits until its points are searchable.
+
+        Returns:
+            List[bool]: Success status of each batch.
+        """
+        semaphore = asyncio.Semaphore(
+            max_concurrency or settings.QDRANT_UPSERT_CONCURRENCY
+        )
+
+        async def upsert(batch: List[Tuple[int, str]], vectors: np.ndarray) -> bool:
+            async with semaphore:
+                return await self.qdrant_client.upsert_vectors(
+                    collection_name="course_content",
+                    vectors=vectors,
+                    ids=[course_id for course_id, _ in batch],
+                    payloads=[{"course_id": course_id} for course_id, _ in batch],
+                    wait=wait,
+                )
+
+        return await asyncio.gather(*(upsert(*batch) for batch in batches))
+
     async def get_course_embedding(self, course_id: int) -> Optional[np.ndarray]:
         """
         Retrieve the embedding for a specific course.
@@ -61,16 +279,13 @@ class CourseEmbeddingsService:
         Returns:
             np.ndarray: The course embedding, or None if not found.
         """
-        # Search for the course embedding in Qdrant
-        results = await self.qdrant_client.search_similar_courses(
-            query_vector=[course_id],  # This should be the actual embedding vector
-            limit=1,
+        # Look the point up by its ID (the course ID)
+        points = await self.qdrant_client.retrieve_points(
+            collection_name="course_content", ids=[course_id]
         )
 
-        if results:
-            return results[0][
-                "embedding"
-            ]  # Assuming the embedding is returned in the results
+        if points:
+            return np.asarray(points[0]["vector"], dtype=np.float32)
 
         return None
 
@@ -93,12 +308,82 @@ class CourseEmbeddingsService:
         if course_embedding is None:
             return []  # No embedding found for the course
 
-        # Search for similar courses
-        similar_courses = await self.qdrant_client.search_similar_courses(
-            query_vector=course_embedding, limit=limit
+        # Normalize the query like stored vectors
+        query = self.embeddings_service.normalize_embeddings(course_embedding)
+
+        # Take an oversampled candidate set from the quantized index, then
+        # rescore it here against the full-precision vectors
+        candidates = await self.qdrant_client.search_similar_courses(
+            query_vector=query,
+            limit=limit * RESCORE_OVERSAMPLING,
+            search_params=QUANTIZED_CANDIDATE_PARAMS,
+            with_vectors=True,
+        )
+
+        return self._rescore(query, candidates, limit)
+
+    @staticmethod
+    def _rescore(
+        query: np.ndarray, candidates: List[Dict[str, Any]], limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Re-rank search candidates by their exact similarity to the query.
+
+        Args:
+            query: The L2-normalized query embedding.
+            candidates: Search results including their stored "vector".
+            limit: The maximum number of results to return.
+
+        Returns:
+            List[Dict[str, Any]]: The best candidates with exact scores, without
+            their vectors.
+        """
+        if not candidates:
+            return []
+
+        # Stored vectors are normalized, so one matrix-vector product gives
+        # the cosine similarity of every candidate
+        vectors = np.asarray(
+            [candidate.pop("vector") for candidate in candidates], dtype=np.float32
+        )
+        scores = vectors @ query
+
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return [{**candidates[i], "score": float(scores[i])} for i in order]
+
+    async def search_similar_courses_batch(
+        self, course_ids: List[int], limit: int = 10
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for courses similar to each of the given courses.
+
+        The course embeddings are fetched in one request and all searches are
+        sent to Qdrant as a single batch.
+
+        Args:
+            course_ids: The IDs of the courses to find similar courses for.
+            limit: The maximum number of similar courses to return per course.
+
+        Returns:
+            List[List[Dict[str, Any]]]: Similar courses for each course ID, in
+            input order; empty for courses without an embedding.
+        """
+        # Fetch all course embeddings at once by their point IDs (the course IDs)
+        points = await self.qdrant_client.retrieve_points(
+            collection_name="course_content", ids=course_ids
+        )
+        vectors = {point["id"]: point["vector"] for point in points}
+
+        embedded_ids = [course_id for course_id in course_ids if course_id in vectors]
+        results = await self.qdrant_client.query_batch_points(
+            collection_name="course_content",
+            query_vectors=[vectors[course_id] for course_id in embedded_ids],
+            limit=limit,
+            search_params=QUANTIZED_SEARCH_PARAMS,
         )
+        similar_by_course = dict(zip(embedded_ids, results))
 
-        return similar_courses
+        return [similar_by_course.get(course_id, []) for course_id in course_ids]
 
     async def update_course_embedding(
         self, course_id: int, new_content: str
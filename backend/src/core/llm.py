@@ -1,14 +1,34 @@
 # src/core/llm.py
+from collections import OrderedDict
 from enum import Enum
-from typing import List, Optional, AsyncGenerator, Union
+from functools import wraps
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    AsyncGenerator,
+    Tuple,
+    Union,
+)
+import hashlib
+import logging
+
+import httpx
+import numpy as np
+import orjson
 from pydantic import BaseModel
 
 # Import specific provider libraries
-from openai import AsyncOpenAI
-from groq import AsyncGroq
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient as OpenAIHttpxClient
+from groq import AsyncGroq, DefaultAsyncHttpxClient as GroqHttpxClient
 
+from src.core.ai.embeddings import EmbeddingModel
 from src.core.settings import settings
 
+logger = logging.getLogger(__name__)
+
 
 class LLMProvider(str, Enum):
     """Supported LLM providers"""
@@ -33,6 +53,195 @@ class LLMConfig(BaseModel):
     top_p: float = 1.0
     frequency_penalty: float = 0.0
     presence_penalty: float = 0.0
+    # Reuse responses to semantically equivalent final messages (opt-in, since a
+    # cached answer replaces a fresh sample)
+    semantic_cache: bool = False
+
+
+class SemanticCache:
+    """
+    In-memory cache of LLM responses matched by embedding similarity of the last
+    message. Entries are partitioned by a scope covering the provider, the model
+    configuration and every earlier message, so only rewordings of the final
+    message in an otherwise identical conversation can share a response.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        max_scopes: int = 256,
+        max_entries_per_scope: int = 32,
+    ):
+        self.threshold = (
+            threshold if threshold is not None else settings.SEMANTIC_CACHE_THRESHOLD
+        )
+        self.max_scopes = max_scopes
+        self.max_entries_per_scope = max_entries_per_scope
+        self.embedding_model = EmbeddingModel()
+        # None until the embedding client has been initialized (or failed to)
+        self._available: Optional[bool] = None
+        # LRU of scope -> (normalized embeddings matrix, responses)
+        self._entries: OrderedDict[bytes, Tuple[np.ndarray, List[str]]] = OrderedDict()
+
+    @staticmethod
+    def scope(
+        provider: LLMProvider, messages: List[Message], config: LLMConfig
+    ) -> bytes:
+        """Hash everything but the last message into a cache scope"""
+        return hashlib.blake2b(
+            orjson.dumps(
+                [
+                    provider.value,
+                    config.model_dump(),
+                    [m.model_dump() for m in messages[:-1]],
+                    messages[-1].role,
+                ]
+            ),
+            digest_size=16,
+        ).digest()
+
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed a message, or return None if embeddings are unavailable"""
+        if self._available is None:
+            try:
+                await self.embedding_model.init_client()
+                self._available = True
+            except Exception as e:
+                logger.warning(f"LLM semantic cache unavailable: {str(e)}")
+                self._available = False
+
+        if not self._available:
+            return None
+
+        try:
+            return self.embedding_model.normalize_embeddings(
+                await self.embedding_model.generate_embedding(text)
+            )
+        except Exception as e:
+            logger.warning(f"Error embedding message for LLM semantic cache: {str(e)}")
+            return None
+
+    def lookup(self, scope: bytes, embedding: np.ndarray) -> Optional[str]:
+        """Return the cached response most similar to embedding above threshold"""
+        entry = self._entries.get(scope)
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(scope)
+        embeddings, responses = entry
+        scores = embeddings @ embedding
+        best = int(np.argmax(scores))
+        return responses[best] if scores[best] >= self.threshold else None
+
+    def store(self, scope: bytes, embedding: np.ndarray, response: str) -> None:
+        """Cache a response, evicting the oldest entries and scopes"""
+        embeddings, responses = self._entries.get(
+            scope, (np.empty((0, embedding.shape[0]), dtype=np.float32), [])
+        )
+        embeddings = np.vstack([embeddings, embedding])[-self.max_entries_per_scope :]
+        responses = (responses + [response])[-self.max_entries_per_scope :]
+
+        self._entries[scope] = (embeddings, responses)
+        self._entries.move_to_end(scope)
+        if len(self._entries) > self.max_scopes:
+            self._entries.popitem(last=False)
+
+
+# Shared across LLM instances, which are created per request, and only built
+# once a request opts in so the embedding model isn't set up at import
+_semantic_cache: Optional[SemanticCache] = None
+
+
+def _get_semantic_cache() -> SemanticCache:
+    """Return the shared semantic cache, creating it on first use"""
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache()
+    return _semantic_cache
+
+
+# Provider clients are shared by all LLM instances so their keep-alive
+# connection pools are reused instead of being rebuilt per request
+LLM_MAX_CONNECTIONS = 200
+LLM_MAX_KEEPALIVE_CONNECTIONS = 100
+_CLIENTS: Dict[LLMProvider, Union[AsyncOpenAI, AsyncGroq]] = {}
+
+
+def _get_client(provider: LLMProvider) -> Union[AsyncOpenAI, AsyncGroq]:
+    """Return the shared client for a provider, creating it on first use"""
+    client = _CLIENTS.get(provider)
+    if client is not None:
+        return client
+
+    # HTTP/2 multiplexes concurrent requests and streams over fewer connections
+    limits = httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+    )
+    if provider == LLMProvider.OPENAI:
+        client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=OpenAIHttpxClient(http2=True, limits=limits),
+        )
+    elif provider == LLMProvider.GROQ:
+        client = AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            http_client=GroqHttpxClient(http2=True, limits=limits),
+        )
+    else:
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+
+    _CLIENTS[provider] = client
+    return client
+
+
+async def close_clients():
+    """Close the shared provider clients and their connection pools"""
+    while _CLIENTS:
+        _, client = _CLIENTS.popitem()
+        await client.close()
+
+
+# Exact-match LRU of deterministic (temperature 0) responses keyed by request hash
+EXACT_CACHE_MAXSIZE = 512
+_exact_cache: OrderedDict[bytes, str] = OrderedDict()
+
+
+def _exact_cached(
+    generate: Callable[["LLM", List[Message], LLMConfig], Awaitable[str]],
+) -> Callable[["LLM", List[Message], LLMConfig], Awaitable[str]]:
+    """Serve repeated deterministic requests from the exact-match cache"""
+
+    @wraps(generate)
+    async def wrapper(self: "LLM", messages: List[Message], config: LLMConfig) -> str:
+        # Sampled responses are expected to vary between calls
+        if config.temperature > 0:
+            return await generate(self, messages, config)
+
+        key = hashlib.blake2b(
+            orjson.dumps(
+                [
+                    self.provider.value,
+                    config.model_dump(),
+                    [m.model_dump() for m in messages],
+                ]
+            ),
+            digest_size=16,
+        ).digest()
+        cached = _exact_cache.get(key)
+        if cached is not None:
+            _exact_cache.move_to_end(key)
+            return cached
+
+        response = await generate(self, messages, config)
+
+        _exact_cache[key] = response
+        _exact_cache.move_to_end(key)
+        if len(_exact_cache) > EXACT_CACHE_MAXSIZE:
+            _exact_cache.popitem(last=False)
+        return response
+
+    return wrapper
 
 
 class LLM:
@@ -48,16 +257,17 @@ class LLM:
             provider = LLMProvider(provider.lower())
 
         self.provider = provider
-        self._initialize_client()
+        self.client = _get_client(provider)
 
-    def _initialize_client(self):
-        """Initialize the appropriate client based on the selected provider"""
-        if self.provider == LLMProvider.OPENAI:
-            self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-        elif self.provider == LLMProvider.GROQ:
-            self.client = AsyncGroq(api_key=settings.GROQ_API_KEY)
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.provider}")
+        # Bind the provider's implementations once instead of branching per call
+        self._generate = {
+            LLMProvider.OPENAI: self._generate_openai,
+            LLMProvider.GROQ: self._generate_groq,
+        }[provider]
+        self._generate_stream = {
+            LLMProvider.OPENAI: self._generate_stream_openai,
+            LLMProvider.GROQ: self._generate_stream_groq,
+        }[provider]
 
     async def generate(self, messages: List[Message], config: LLMConfig) -> str:
         """
@@ -70,12 +280,29 @@ class LLM:
         Returns:
             Complete response text from the LLM
         """
-        if self.provider == LLMProvider.OPENAI:
-            return await self._generate_openai(messages, config)
-        elif self.provider == LLMProvider.GROQ:
-            return await self._generate_groq(messages, config)
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.provider}")
+        cache_scope, query_embedding = await self._semantic_cache_key(messages, config)
+        if query_embedding is not None:
+            cached = _get_semantic_cache().lookup(cache_scope, query_embedding)
+            if cached is not None:
+                return cached
+
+        response = await self._generate(messages, config)
+
+        if query_embedding is not None:
+            _get_semantic_cache().store(cache_scope, query_embedding, response)
+        return response
+
+    async def _semantic_cache_key(
+        self, messages: List[Message], config: LLMConfig
+    ) -> Tuple[Optional[bytes], Optional[np.ndarray]]:
+        """Return the semantic cache scope and query embedding, if caching applies"""
+        if not config.semantic_cache or not messages:
+            return None, None
+
+        return (
+            _get_semantic_cache().scope(self.provider, messages, config),
+            await _get_semantic_cache().embed(messages[-1].content),
+        )
 
     async def generate_stream(
         self, messages: List[Message], config: LLMConfig
@@ -90,15 +317,22 @@ class LLM:
         Yields:
             Chunks of the response as they become available
         """
-        if self.provider == LLMProvider.OPENAI:
-            async for chunk in self._generate_stream_openai(messages, config):
-                yield chunk
-        elif self.provider == LLMProvider.GROQ:
-            async for chunk in self._generate_stream_groq(messages, config):
-                yield chunk
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.provider}")
+        cache_scope, query_embedding = await self._semantic_cache_key(messages, config)
+        if query_embedding is not None:
+            cached = _get_semantic_cache().lookup(cache_scope, query_embedding)
+            if cached is not None:
+                yield cached
+                return
 
+        chunks = []
+        async for chunk in self._generate_stream(messages, config):
+            chunks.append(chunk)
+            yield chunk
+
+        if query_embedding is not None:
+            _get_semantic_cache().store(cache_scope, query_embedding, "".join(chunks))
+
+    @_exact_cached
     async def _generate_openai(self, messages: List[Message], config: LLMConfig) -> str:
         """Generate a response using OpenAI's API (non-streaming)"""
         try:
@@ -113,10 +347,10 @@ class LLM:
                 stream=False,
             )
             return response.choices[0].message.content
-        except Exception as e:
-            # Log and re-raise with more context
-            print(f"OpenAI API error: {str(e)}")
-            raise Exception(f"Failed to generate response from OpenAI: {str(e)}")
+        except Exception:
+            # Log with the traceback and re-raise the original exception
+            logger.exception("OpenAI API error")
+            raise
 
     async def _generate_stream_openai(
         self, messages: List[Message], config: LLMConfig
@@ -135,13 +369,17 @@ class LLM:
             )
 
             async for chunk in response:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
-        except Exception as e:
-            # Log and re-raise with more context
-            print(f"OpenAI streaming API error: {str(e)}")
-            raise Exception(f"Failed to stream response from OpenAI: {str(e)}")
+                # Usage-only chunks carry no choices; delta is always present
+                if chunk.choices:
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        yield content
+        except Exception:
+            # Log with the traceback and re-raise the original exception
+            logger.exception("OpenAI streaming API error")
+            raise
 
+    @_exact_cached
     async def _generate_groq(self, messages: List[Message], config: LLMConfig) -> str:
         """Generate a response using Groq's API (non-streaming)"""
         try:
@@ -155,10 +393,10 @@ class LLM:
             )
 
             return response.choices[0].message.content
-        except Exception as e:
-            # Log and re-raise with more context
-            print(f"Groq API error: {str(e)}")
-            raise Exception(f"Failed to generate response from Groq: {str(e)}")
+        except Exception:
+            # Log with the traceback and re-raise the original exception
+            logger.exception("Groq API error")
+            raise
 
     async def _generate_stream_groq(
         self, messages: List[Message], config: LLMConfig
@@ -175,18 +413,17 @@ class LLM:
             )
 
             async for chunk in response:
-                if (
-                    chunk.choices
-                    and hasattr(chunk.choices[0], "delta")
-                    and chunk.choices[0].delta.content
-                ):
-                    yield chunk.choices[0].delta.content
-        except Exception as e:
-            # Log and re-raise with more context
-            print(f"Groq streaming API error: {str(e)}")
-            raise Exception(f"Failed to stream response from Groq: {str(e)}")
+                # Usage-only chunks carry no choices; delta is always present
+                if chunk.choices:
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        yield content
+        except Exception:
+            # Log with the traceback and re-raise the original exception
+            logger.exception("Groq streaming API error")
+            raise
 
     async def close(self):
         """Close any open connections and resources"""
-        # The default clients usually handle their own cleanup
+        # Provider clients are shared and closed by close_clients() at shutdown
         pass
@@ -1,22 +1,90 @@
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from passlib.context import CryptContext
-from jose import jwt
-import jose
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, Tuple
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+import bcrypt
+import jwt
 from src.core.settings import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hasher. New hashes use argon2id; existing bcrypt hashes still
+# verify and are replaced on the next successful login
+password_hasher = PasswordHasher(time_cost=3, memory_cost=65536, parallelism=4)
+ARGON2_PREFIX = "$argon2"
+
+# bcrypt only reads the first 72 bytes of a password
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+# Default token lifetimes by token type
+_ACCESS_DELTA = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+_REFRESH_DELTA = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+_OTHER_DELTA = timedelta(hours=24)
+
+# Characters that satisfy the special character password requirement
+PASSWORD_SPECIAL_CHARS = frozenset("!@#$%^&*()_-+={}[]\\|:;\"'<>,.?/")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against an argon2 or bcrypt hash."""
+    if hashed_password.startswith(ARGON2_PREFIX):
+        try:
+            return password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    return bcrypt.checkpw(
+        plain_password.encode()[:BCRYPT_MAX_PASSWORD_BYTES], hashed_password.encode()
+    )
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password, re-hashing it if the stored hash is outdated.
+
+    Returns:
+        Tuple of whether the password is valid and a replacement hash when the
+        stored one is bcrypt or uses old argon2 parameters (None otherwise)
+    """
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+
+    is_argon2 = hashed_password.startswith(ARGON2_PREFIX)
+    if not is_argon2 or password_hasher.check_needs_rehash(hashed_password):
+        return True, get_password_hash(plain_password)
+
+    return True, None
 
 
 def get_password_hash(password: str) -> str:
     """Generate a password hash."""
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash without blocking the event loop."""
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
+async def averify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password without blocking the event loop, re-hashing if needed.
+
+    Returns:
+        Tuple of whether the password is valid and a replacement hash when the
+        stored one is outdated (None otherwise)
+    """
+    return await asyncio.to_thread(
+        verify_and_update_password, plain_password, hashed_password
+    )
+
+
+async def aget_password_hash(password: str) -> str:
+    """Generate a password hash without blocking the event loop."""
+    return await asyncio.to_thread(get_password_hash, password)
 
 
 def create_token(
@@ -27,27 +95,25 @@ def create_token(
     """Create a JWT token with expiration."""
     to_encode = data.copy()
 
+    # Read the clock once for both exp and iat
+    now = datetime.now(timezone.utc)
+
     # Set expiration time
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
+        expire = now + expires_delta
+    elif token_type == "access":
         # Default expiration based on token type
-        if token_type == "access":
-            expire = datetime.utcnow() + timedelta(
-                minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-            )
-        elif token_type == "refresh":
-            expire = datetime.utcnow() + timedelta(
-                days=settings.REFRESH_TOKEN_EXPIRE_DAYS
-            )
-        else:  # For password reset or other tokens
-            expire = datetime.utcnow() + timedelta(hours=24)
+        expire = now + _ACCESS_DELTA
+    elif token_type == "refresh":
+        expire = now + _REFRESH_DELTA
+    else:  # For password reset or other tokens
+        expire = now + _OTHER_DELTA
 
     # Add token claims
     to_encode.update(
         {
             "exp": expire,
-            "iat": datetime.utcnow(),  # Issued at time
+            "iat": now,  # Issued at time
             "type": token_type,
         }
     )
@@ -81,24 +147,23 @@ def is_strong_password(password: str) -> bool:
     if len(password) < settings.MIN_PASSWORD_LENGTH:
         return False
 
-    # Check for at least one uppercase letter
-    if not any(c.isupper() for c in password):
-        return False
-
-    # Check for at least one lowercase letter
-    if not any(c.islower() for c in password):
-        return False
+    # Classify each character once, collecting one bit per required class:
+    # uppercase, lowercase, digit and special character
+    flags = 0
+    for c in password:
+        if c.isupper():
+            flags |= 1
+        elif c.islower():
+            flags |= 2
+        elif c.isdigit():
+            flags |= 4
+        elif c in PASSWORD_SPECIAL_CHARS:
+            flags |= 8
 
-    # Check for at least one digit
-    if not any(c.isdigit() for c in password):
-        return False
-
-    # Check for at least one special character
-    special_chars = "!@#$%^&*()_-+={}[]\\|:;\"'<>,.?/"
-    if not any(c in special_chars for c in password):
-        return False
+        if flags == 15:
+            return True
 
-    return True
+    return False
 
 
 def decode_access_token(token: str) -> Dict[str, Any]:
@@ -112,22 +177,25 @@ def decode_access_token(token: str) -> Dict[str, Any]:
         Dict with payload data
 
     Raises:
-        jwt.JWTError: If token is invalid or expired
+        jwt.InvalidTokenError: If token is invalid or expired
     """
     try:
         # Decode the token
         payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.JWT_ALGORITHM],
+            options={"require": ["exp", "iat", "type"]},
         )
 
         # Verify token type
         if payload.get("type") != "access":
-            raise jose.JWTError("Not an access token")
+            raise jwt.InvalidTokenError("Not an access token")
 
         return payload
-    except jose.ExpiredSignatureError:
+    except jwt.ExpiredSignatureError:
         # Handle expired token specifically
-        raise jose.JWTError("Token has expired")
-    except jose.JWTError as e:
+        raise jwt.InvalidTokenError("Token has expired")
+    except jwt.InvalidTokenError as e:
         # Handle all other validation errors
-        raise jose.JWTError(f"Invalid token: {str(e)}")
+        raise jwt.InvalidTokenError(f"Invalid token: {str(e)}")
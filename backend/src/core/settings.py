@@ -1,5 +1,7 @@
+from functools import lru_cache
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -21,12 +23,15 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     ENVIRONMENT: str = "development"
 
-    DEFAULT_LLM_PROVIDER: str = "groq" if ENVIRONMENT == "development" else "openai"
+    # Defaults to groq in development and openai elsewhere (see below)
+    DEFAULT_LLM_PROVIDER: Optional[str] = None
     DEFAULT_LLM_MODEL: str = "llama3-70b-8192"  # "gpt-4o-mini"
     DEFAULT_OPENAI_MODEL: str = "gpt-4o-mini"
     DEFAULT_GROQ_MODEL: str = "llama3-8b-8192"
     EMBEDDING_MODEL: str = "text-embedding-3-small"
-    EMBEDDING_DIMENSION: str = "1536"
+    EMBEDDING_DIMENSION: int = 1536
+    # Minimum cosine similarity for reusing a cached LLM response
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
     OPENAI_API_KEY: str
     GROQ_API_KEY: str
 
@@ -37,6 +42,14 @@ class Settings(BaseSettings):
     POSTGRES_POOL_SIZE: int = 10
     POSTGRES_MAX_OVERFLOW: int = 10
     POSTGRES_POOL_TIMEOUT: int = 30
+    # Set when connecting through PgBouncer in transaction pooling mode
+    POSTGRES_USE_PGBOUNCER: bool = False
+    # Dev/test only: lazy relationship loads raise instead of emitting SQL
+    POSTGRES_STRICT_LOADING: bool = False
+    # How often materialized views (e.g. user_progress_summary) are refreshed
+    POSTGRES_VIEW_REFRESH_SECONDS: int = 300
+    # Monthly partitions created ahead of time for range-partitioned tables
+    POSTGRES_PARTITION_MONTHS_AHEAD: int = 3
 
     MIN_PASSWORD_LENGTH: int = 8
     MAX_PASSWORD_LENGTH: int = 128
@@ -53,6 +66,25 @@ class Settings(BaseSettings):
     # Qdrant settings
     QDRANT_HOST: str
     QDRANT_API_KEY: str
+    # Courses embedded and upserted per request when indexing in bulk
+    COURSE_EMBEDDING_BATCH_SIZE: int = 32
+    # Maximum upsert requests in flight at once during bulk indexing
+    QDRANT_UPSERT_CONCURRENCY: int = 4
 
+    @model_validator(mode="after")
+    def default_llm_provider(self) -> "Settings":
+        """Pick the LLM provider from the loaded ENVIRONMENT when not set"""
+        if not self.DEFAULT_LLM_PROVIDER:
+            self.DEFAULT_LLM_PROVIDER = (
+                "groq" if self.ENVIRONMENT == "development" else "openai"
+            )
+        return self
 
-settings = Settings()
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, loading them on first use"""
+    return Settings()
+
+
+settings = get_settings()
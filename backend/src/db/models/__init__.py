@@ -1,146 +1,153 @@
-"""Initialize database models and handle circular imports."""
+"""Initialize database models and handle circular imports.
 
-# Import all models in a way that avoids circular import issues
-from typing import Dict, Type
-from sqlmodel import SQLModel
-
-# Import all model files - the imports themselves register the models
-from .user import User, Guardian, UserFile
-from .content import Subject, Topic, Lesson, Course, CourseTopic, UserSubjectInterest
-from .progress import Enrollment, Activity, Achievement
-from .recommendations import Recommendation, ExplorationTopic
-from .tutoring import (
-    TutoringSession,
-    DetailedTutoringSession,
-    TutoringExchange,
-    SessionResource,
-)
-from .communication import Notification, Message
-from .community import StudySession, StudyGroup, StudyGroupMember, ForumPost, ForumReply
-
-# Import school-related models
-from .school import (
-    School,
-    Department,
-    SchoolClass,
-    SchoolStaff,
-    DepartmentStaffAssignment,
-    SchoolCourse,
-    SchoolStudent,
-    ClassEnrollment,
-    CourseEnrollment,
-    ClassSchedule,
-    Assignment,
-    AssignmentSubmission,
-    LessonPlan,
-    AttendanceRecord,
-    SchoolAnnouncement,
-    ProfessorClassCourses,
-)
-
-# Import professor-related models
-from .professor import (
-    SchoolProfessor,
-    ProfessorCourse,
-    CourseMaterial,
-)
-
-# Import whiteboard models
-from .whiteboard import WhiteboardSession, WhiteboardInteraction
-
-# Import note-related models
-from .notes import Note, NoteFolder, NoteCollaborator, AISuggestion
-
-# Also import CourseAITutoringSession model to fix relationships
-from .tutoring_integration import CourseAITutoringSession
-
-from .flashcard import Flashcard
-
-from .course_generation import CourseGenerationSession, CourseGenerationExport
+Model modules are imported lazily on first access (PEP 562), so callers that
+only need a few models don't pay for importing every table. Call
+configure_models() once at startup to import them all and configure the
+mappers before the first query.
+"""
 
-# Dictionary to store all model classes
-models: Dict[str, Type[SQLModel]] = {}
+import importlib
+from typing import Any, Dict, List, Type
+from sqlalchemy.orm import configure_mappers
+from sqlmodel import SQLModel
 
-# Expose all models in __all__ for star imports
-__all__ = [
+# Model name -> module defining it
+_LAZY_MODELS: Dict[str, str] = {
     # User models
-    "User",
-    "UserFile",
-    "Guardian",
+    "User": ".user",
+    "UserFile": ".user",
+    "Guardian": ".user",
     # Content models
-    "Subject",
-    "Topic",
-    "Lesson",
-    "Course",
-    "CourseTopic",
-    "UserSubjectInterest",
+    "Subject": ".content",
+    "Topic": ".content",
+    "Lesson": ".content",
+    "Course": ".content",
+    "CourseTopic": ".content",
+    "UserSubjectInterest": ".content",
     # Progress tracking models
-    "Enrollment",
-    "Activity",
-    "Achievement",
+    "Enrollment": ".progress",
+    "Activity": ".progress",
+    "Achievement": ".progress",
     # AI Tutoring models
-    "TutoringSession",
-    "DetailedTutoringSession",
-    "TutoringExchange",
-    "SessionResource",
-    "CourseAITutoringSession",
+    "TutoringSession": ".tutoring",
+    "DetailedTutoringSession": ".tutoring",
+    "TutoringExchange": ".tutoring",
+    "SessionResource": ".tutoring",
+    "CourseAITutoringSession": ".tutoring_integration",
     # Recommendation models
-    "Recommendation",
-    "ExplorationTopic",
+    "Recommendation": ".recommendations",
+    "ExplorationTopic": ".recommendations",
     # Communication models
-    "Notification",
-    "Message",
+    "Notification": ".communication",
+    "Message": ".communication",
     # Community and social learning models
-    "StudySession",
-    "StudyGroup",
-    "StudyGroupMember",
-    "ForumPost",
-    "ForumReply",
+    "StudySession": ".community",
+    "StudyGroup": ".community",
+    "StudyGroupMember": ".community",
+    "Tag": ".community",
+    "PostTag": ".community",
+    "ForumPost": ".community",
+    "ForumReply": ".community",
+    "StudyGroupMessage": ".community",
+    "CommunityFeedItem": ".community",
     # School models
-    "School",
-    "Department",
-    "SchoolClass",
-    "SchoolStaff",
-    "DepartmentStaffAssignment",
-    "SchoolCourse",
-    "SchoolStudent",
-    "ClassEnrollment",
-    "CourseEnrollment",
-    "ClassSchedule",
-    "Assignment",
-    "AssignmentSubmission",
-    "LessonPlan",
-    "AttendanceRecord",
-    "SchoolAnnouncement",
+    "School": ".school",
+    "Department": ".school",
+    "SchoolClass": ".school",
+    "SchoolStaff": ".school",
+    "DepartmentStaffAssignment": ".school",
+    "SchoolCourse": ".school",
+    "SchoolStudent": ".school",
+    "ClassEnrollment": ".school",
+    "CourseEnrollment": ".school",
+    "ClassSchedule": ".school",
+    "Assignment": ".school",
+    "AssignmentSubmission": ".school",
+    "LessonPlan": ".school",
+    "AttendanceRecord": ".school",
+    "SchoolAnnouncement": ".school",
+    "ProfessorClassCourses": ".school",
     # Professor models
-    "SchoolProfessor",
-    "ProfessorCourse",
-    "CourseMaterial",
+    "SchoolProfessor": ".professor",
+    "ProfessorCourse": ".professor",
+    "ProfessorAvailability": ".professor",
+    "CourseMaterial": ".professor",
     # Whiteboard models
-    "WhiteboardSession",
-    "WhiteboardInteraction",
+    "WhiteboardSession": ".whiteboard",
+    "WhiteboardInteraction": ".whiteboard",
     # Notes models
-    "Note",
-    "NoteFolder",
-    "NoteCollaborator",
-    "AISuggestion",
+    "Note": ".notes",
+    "NoteFolder": ".notes",
+    "NoteCollaborator": ".notes",
+    "AISuggestion": ".notes",
+    "NoteRenderCache": ".notes",
     # Flashcard models
-    "Flashcard",
-    "ProfessorClassCourses",
-    "CourseGenerationSession",
-    "CourseGenerationExport",
-]
+    "Flashcard": ".flashcard",
+    # Course generation models
+    "CourseGenerationSession": ".course_generation",
+    "CourseGenerationExport": ".course_generation",
+    "CourseGenerationMessage": ".course_generation",
+}
+
+# Dictionary to store all model classes
+models: Dict[str, Type[SQLModel]] = {}
+
+# Expose all models in __all__ for star imports
+__all__ = list(_LAZY_MODELS)
+
+_ALL_MODELS = frozenset(__all__)
+
+
+def __getattr__(name: str) -> Any:
+    """Import a model's module on first access and cache the model"""
+    module_name = _LAZY_MODELS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    model = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = model
+    return model
+
+
+def __dir__() -> List[str]:
+    return sorted(_ALL_MODELS.union(globals()))
 
 
 # Verify that all models are properly loaded
 def verify_models():
     """Verify that all expected models are loaded and registered."""
-    missing_models = [model for model in __all__ if model not in globals()]
+    missing_models = sorted(_ALL_MODELS.difference(globals()))
     if missing_models:
         raise ImportError(
             f"Failed to import the following models: {', '.join(missing_models)}"
         )
 
+    # Each table must be declared once; a second declaration of the same
+    # table name would replace the registered Table object
+    redeclared_tables = [
+        model
+        for model in sorted(_ALL_MODELS)
+        if SQLModel.metadata.tables.get(globals()[model].__tablename__)
+        is not globals()[model].__table__
+    ]
+    if redeclared_tables:
+        raise ImportError(
+            f"Tables declared more than once for models: {', '.join(redeclared_tables)}"
+        )
+
+
+def configure_models():
+    """
+    Import every model and configure all mappers.
+
+    Relationships refer to each other by name, so all models must be imported
+    before the first query or SQLModel.metadata.create_all.
+    """
+    for name in __all__:
+        __getattr__(name)
+
+    # Skipped under python -O
+    if __debug__:
+        verify_models()
 
-# Run verification when the module is imported
-verify_models()
+    configure_mappers()
@@ -1,34 +1,75 @@
 from datetime import datetime
-from typing import Optional, Dict, Any
-from sqlmodel import Field, SQLModel, Relationship, JSON
+from enum import Enum
+from .timestamps import UTC_NOW, utcnow
+from typing import Optional, Dict, Any, List
+from sqlalchemy import Enum as SAEnum, Index, desc, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import Field, SQLModel, Relationship
+from .types import JSONDocument
 
 from .user import User
 
 
+class NotificationType(str, Enum):
+    """Kinds of notification shown to users"""
+
+    ACHIEVEMENT = "achievement"
+    REMINDER = "reminder"
+    SYSTEM = "system"
+    PROGRESS = "progress"
+    SOCIAL = "social"
+    PROFESSOR = "professor"
+    ASSIGNMENT = "assignment"
+
+
 class Notification(SQLModel, table=True):
     """Model for user notifications."""
 
+    # Serves "latest (unread) notifications for a user" with one index scan
+    __table_args__ = (
+        Index("ix_notification_user_unread", "user_id", "is_read", desc("created_at")),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id")
 
     title: str
     content: str
-    type: str  # "achievement", "reminder", "system", "progress", "social"
+    # Stored as the enum values in a VARCHAR, so adding a kind needs no DDL
+    type: NotificationType = Field(
+        sa_type=SAEnum(
+            NotificationType,
+            native_enum=False,
+            length=16,
+            values_callable=lambda kinds: [kind.value for kind in kinds],
+        )
+    )
     is_read: bool = False
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     read_at: Optional[datetime] = None
 
     # Link to relevant content
     action_type: Optional[str] = None  # "open_session", "view_progress", etc.
-    action_data: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    action_data: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Relationships
-    user: User = Relationship(back_populates="notifications")
+    user: User = Relationship(
+        back_populates="notifications", sa_relationship_kwargs={"lazy": "raise"}
+    )
 
 
 class Message(SQLModel, table=True):
     """Model for messages between users."""
 
+    # Serves "latest (unread) messages for a recipient" with one index scan
+    __table_args__ = (
+        Index(
+            "ix_message_recipient_unread", "recipient_id", "is_read", desc("created_at")
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id")  # Sender
     recipient_id: int = Field(foreign_key="users.id")
@@ -36,18 +77,40 @@ class Message(SQLModel, table=True):
     subject: str
     content: str
     is_read: bool = False
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     read_at: Optional[datetime] = None
 
     # Attachments and metadata
     has_attachments: bool = False
-    attachments: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    attachments: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Relationships
     user: User = Relationship(
         back_populates="messages",
-        sa_relationship_kwargs={"foreign_keys": "[Message.user_id]"},
+        sa_relationship_kwargs={
+            "lazy": "raise",
+            "foreign_keys": lambda: [Message.user_id],
+        },
     )
     recipient: User = Relationship(
-        sa_relationship_kwargs={"foreign_keys": "[Message.recipient_id]"}
+        sa_relationship_kwargs={
+            "lazy": "raise",
+            "foreign_keys": lambda: [Message.recipient_id],
+        }
     )
+
+
+async def bulk_create_notifications(
+    session: AsyncSession, rows: List[Dict[str, Any]]
+) -> None:
+    """
+    Insert many notifications in one executemany, without building ORM objects.
+
+    Args:
+        session: Database session; the caller commits
+        rows: Column values for each notification
+    """
+    if rows:
+        await session.execute(insert(Notification), rows)
@@ -1,6 +1,11 @@
 from datetime import datetime
-from typing import Optional, List
-from sqlmodel import Field, SQLModel, Relationship, JSON
+from .timestamps import UTC_NOW, utcnow
+from typing import Optional, List, Dict, Any
+from sqlalchemy import Index, desc, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Field, SQLModel, Relationship, select
+from .types import JSONDocument
 
 from .user import User
 from .content import Subject, Topic
@@ -28,12 +33,12 @@ class StudySession(SQLModel, table=True):
     # Results
     summary: Optional[str] = None
     productivity_score: Optional[float] = None
-    achievements: List[str] = Field(default=[], sa_type=JSON)
+    achievements: List[str] = Field(default_factory=list, sa_type=JSONDocument)
 
     # Relationships
-    user: User = Relationship()
-    subject: Optional[Subject] = Relationship()
-    topic: Optional[Topic] = Relationship()
+    user: User = Relationship(sa_relationship_kwargs={"lazy": "raise"})
+    subject: Optional[Subject] = Relationship(sa_relationship_kwargs={"lazy": "raise"})
+    topic: Optional[Topic] = Relationship(sa_relationship_kwargs={"lazy": "raise"})
 
 
 class StudyGroup(SQLModel, table=True):
@@ -50,36 +55,84 @@ class StudyGroup(SQLModel, table=True):
     is_private: bool = False
 
     # Status
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     active: bool = True
 
     # Relationships
     creator: User = Relationship(
-        sa_relationship_kwargs={"foreign_keys": "[StudyGroup.created_by]"}
+        sa_relationship_kwargs={
+            "lazy": "raise",
+            "foreign_keys": lambda: [StudyGroup.created_by],
+        }
+    )
+    subject: Optional[Subject] = Relationship(sa_relationship_kwargs={"lazy": "raise"})
+    # Deleting a group leaves its members, messages and feed items to the
+    # database's ON DELETE CASCADE instead of loading and deleting each row
+    members: List["StudyGroupMember"] = Relationship(
+        back_populates="group",
+        sa_relationship_kwargs={
+            "lazy": "raise",
+            "order_by": "StudyGroupMember.joined_at",
+            "cascade": "all, delete",
+            "passive_deletes": True,
+        },
     )
-    subject: Optional[Subject] = Relationship()
-    members: List["StudyGroupMember"] = Relationship(back_populates="group")
 
 
 class StudyGroupMember(SQLModel, table=True):
     """Model for study group membership."""
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    group_id: int = Field(foreign_key="studygroup.id")
+    group_id: int = Field(foreign_key="studygroup.id", ondelete="CASCADE", index=True)
     user_id: int = Field(foreign_key="users.id")
 
     # Membership details
     role: str = "member"  # "member", "moderator", "admin"
-    joined_at: datetime = Field(default_factory=datetime.utcnow)
+    joined_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
 
     # Relationships
-    group: StudyGroup = Relationship(back_populates="members")
-    user: User = Relationship()
+    group: StudyGroup = Relationship(
+        back_populates="members", sa_relationship_kwargs={"lazy": "raise"}
+    )
+    user: User = Relationship(sa_relationship_kwargs={"lazy": "raise"})
+
+
+class Tag(SQLModel, table=True):
+    """Model for forum post tags."""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(unique=True, index=True)
+
+
+class PostTag(SQLModel, table=True):
+    """Association between forum posts and their tags."""
+
+    post_id: int = Field(
+        foreign_key="forumpost.id", ondelete="CASCADE", primary_key=True
+    )
+    # The primary key only serves lookups by post; "posts tagged X" needs tag_id first
+    tag_id: int = Field(
+        foreign_key="tag.id", ondelete="CASCADE", primary_key=True, index=True
+    )
 
 
 class ForumPost(SQLModel, table=True):
     """Model for community forum posts."""
 
+    # Serves per-subject listings with pinned posts first, newest first
+    __table_args__ = (
+        Index(
+            "ix_forumpost_subject_pinned_created",
+            "subject_id",
+            "is_pinned",
+            desc("created_at"),
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     author_id: int = Field(foreign_key="users.id")
 
@@ -89,10 +142,11 @@ class ForumPost(SQLModel, table=True):
     # Categorization
     subject_id: Optional[int] = Field(default=None, foreign_key="subject.id")
     topic_id: Optional[int] = Field(default=None, foreign_key="topic.id")
-    tags: List[str] = Field(default=[], sa_type=JSON)
 
     # Status
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
     is_pinned: bool = False
     is_approved: bool = True
@@ -102,23 +156,37 @@ class ForumPost(SQLModel, table=True):
     upvote_count: int = 0
 
     # Relationships
-    author: User = Relationship()
-    subject: Optional[Subject] = Relationship()
-    topic: Optional[Topic] = Relationship()
-    replies: List["ForumReply"] = Relationship(back_populates="post")
+    author: User = Relationship(sa_relationship_kwargs={"lazy": "raise"})
+    subject: Optional[Subject] = Relationship(sa_relationship_kwargs={"lazy": "raise"})
+    topic: Optional[Topic] = Relationship(sa_relationship_kwargs={"lazy": "raise"})
+    replies: List["ForumReply"] = Relationship(
+        back_populates="post",
+        sa_relationship_kwargs={
+            "lazy": "raise",
+            "order_by": "ForumReply.created_at",
+            "cascade": "all, delete",
+            "passive_deletes": True,
+        },
+    )
+    # A handful per post, so always loaded alongside it
+    tags: List[Tag] = Relationship(
+        link_model=PostTag, sa_relationship_kwargs={"lazy": "selectin"}
+    )
 
 
 class ForumReply(SQLModel, table=True):
     """Model for replies to forum posts."""
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    post_id: int = Field(foreign_key="forumpost.id")
+    post_id: int = Field(foreign_key="forumpost.id", ondelete="CASCADE", index=True)
     author_id: int = Field(foreign_key="users.id")
 
     content: str
 
     # Status
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
     is_solution: bool = False
 
@@ -126,27 +194,36 @@ class ForumReply(SQLModel, table=True):
     upvote_count: int = 0
 
     # Relationships
-    post: ForumPost = Relationship(back_populates="replies")
-    author: User = Relationship()
+    post: ForumPost = Relationship(
+        back_populates="replies", sa_relationship_kwargs={"lazy": "raise"}
+    )
+    author: User = Relationship(sa_relationship_kwargs={"lazy": "raise"})
 
 
 class StudyGroupMessage(SQLModel, table=True):
     """Model for messages in study group chats."""
 
+    # Serves a group's chat history, newest first
+    __table_args__ = (
+        Index("ix_studygroupmsg_group_created", "group_id", desc("created_at")),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    group_id: int = Field(foreign_key="studygroup.id", index=True)
+    group_id: int = Field(foreign_key="studygroup.id", ondelete="CASCADE", index=True)
     user_id: int = Field(foreign_key="users.id", index=True)
 
     content: str
     is_system_message: bool = False
     is_deleted: bool = False
 
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
-    group: "StudyGroup" = Relationship()
-    user: "User" = Relationship()
+    group: "StudyGroup" = Relationship(sa_relationship_kwargs={"lazy": "raise"})
+    user: "User" = Relationship(sa_relationship_kwargs={"lazy": "raise"})
 
 
 class CommunityFeedItem(SQLModel, table=True):
@@ -166,7 +243,7 @@ class CommunityFeedItem(SQLModel, table=True):
     # Visibility and targeting
     is_public: bool = True
     group_id: Optional[int] = Field(
-        default=None, foreign_key="studygroup.id", index=True
+        default=None, foreign_key="studygroup.id", ondelete="CASCADE", index=True
     )
     target_user_id: Optional[int] = Field(
         default=None, foreign_key="users.id", index=True
@@ -177,13 +254,77 @@ class CommunityFeedItem(SQLModel, table=True):
     related_reply_id: Optional[int] = Field(default=None, foreign_key="forumreply.id")
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     expires_at: Optional[datetime] = None
 
     # Relationships
-    group: Optional["StudyGroup"] = Relationship()
+    group: Optional["StudyGroup"] = Relationship(
+        sa_relationship_kwargs={"lazy": "raise"}
+    )
     target_user: Optional["User"] = Relationship(
-        sa_relationship_kwargs={"foreign_keys": "[CommunityFeedItem.target_user_id]"}
+        sa_relationship_kwargs={
+            "lazy": "raise",
+            "foreign_keys": lambda: [CommunityFeedItem.target_user_id],
+        }
+    )
+    related_post: Optional["ForumPost"] = Relationship(
+        sa_relationship_kwargs={"lazy": "raise"}
+    )
+    related_reply: Optional["ForumReply"] = Relationship(
+        sa_relationship_kwargs={"lazy": "raise"}
+    )
+
+
+async def bulk_create_group_messages(
+    session: AsyncSession, rows: List[Dict[str, Any]]
+) -> None:
+    """
+    Insert many study group messages in one executemany, without building ORM objects.
+
+    Args:
+        session: Database session; the caller commits
+        rows: Column values for each message
+    """
+    if rows:
+        await session.execute(insert(StudyGroupMessage), rows)
+
+
+async def bulk_create_feed_items(
+    session: AsyncSession, rows: List[Dict[str, Any]]
+) -> None:
+    """
+    Insert many community feed items in one executemany, without building ORM objects.
+
+    Args:
+        session: Database session; the caller commits
+        rows: Column values for each feed item
+    """
+    if rows:
+        await session.execute(insert(CommunityFeedItem), rows)
+
+
+async def get_or_create_tags(session: AsyncSession, names: List[str]) -> List[Tag]:
+    """
+    Resolve tag names to Tag rows, creating the ones that don't exist yet.
+
+    Args:
+        session: Database session; the caller commits
+        names: Tag names, deduplicated after stripping whitespace
+
+    Returns:
+        List of tags in the order the names were given
+    """
+    unique_names = list(dict.fromkeys(name.strip() for name in names if name.strip()))
+    if not unique_names:
+        return []
+
+    await session.execute(
+        pg_insert(Tag)
+        .values([{"name": name} for name in unique_names])
+        .on_conflict_do_nothing(index_elements=["name"])
     )
-    related_post: Optional["ForumPost"] = Relationship()
-    related_reply: Optional["ForumReply"] = Relationship()
+    result = await session.execute(select(Tag).where(Tag.name.in_(unique_names)))
+    tags_by_name = {tag.name: tag for tag in result.scalars()}
+    return [tags_by_name[name] for name in unique_names]
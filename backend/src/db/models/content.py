@@ -1,6 +1,16 @@
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from sqlmodel import Field, SQLModel, Relationship, JSON
+from .timestamps import UTC_NOW, utcnow
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
+from sqlalchemy import SmallInteger
+from sqlmodel import Field, SQLModel, Relationship
+from .types import JSONDocument
+
+if TYPE_CHECKING:
+    # Only for type checkers; the modules import this one, and the mapper
+    # resolves the relationship names from the class registry
+    from .progress import Activity, Enrollment
+    from .tutoring import DetailedTutoringSession, TutoringSession
+    from .user import User
 
 
 class Subject(SQLModel, table=True):
@@ -15,7 +25,7 @@ class Subject(SQLModel, table=True):
     description: str
     icon: Optional[str] = None
     color_scheme: Optional[str] = None
-    meta_data: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSON)
+    meta_data: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSONDocument)
 
     # Added fields to match subject options in onboarding
     subject_code: str = Field(index=True)  # mathematics, physics, arabic, etc.
@@ -28,13 +38,19 @@ class Subject(SQLModel, table=True):
     academic_track: Optional[str] = None  # sciences_math_a, lettres_phil, etc.
 
     # Relationships (existing)
-    topics: List["Topic"] = Relationship(back_populates="subject")
-    enrollments: List["Enrollment"] = Relationship(back_populates="subject")  # noqa: F821
-    courses: List["Course"] = Relationship(back_populates="subject")  # noqa: F821
+    topics: List["Topic"] = Relationship(
+        back_populates="subject", sa_relationship_kwargs={"lazy": "raise"}
+    )
+    enrollments: List["Enrollment"] = Relationship(
+        back_populates="subject", sa_relationship_kwargs={"lazy": "raise"}
+    )
+    courses: List["Course"] = Relationship(
+        back_populates="subject", sa_relationship_kwargs={"lazy": "raise"}
+    )
 
     # New relationships for onboarding preferences
     interested_users: List["UserSubjectInterest"] = Relationship(
-        back_populates="subject"
+        back_populates="subject", sa_relationship_kwargs={"lazy": "raise"}
     )
 
 
@@ -44,12 +60,20 @@ class UserSubjectInterest(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True)
     subject_id: int = Field(foreign_key="subject.id", index=True)
-    interest_level: int = 5  # Scale 1-5, default high since selected in onboarding
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    interest_level: int = Field(
+        default=5, sa_type=SmallInteger
+    )  # Scale 1-5, default high since selected in onboarding
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
 
     # Relationships
-    user: "User" = Relationship(back_populates="subject_interests")  # noqa: F821
-    subject: "Subject" = Relationship(back_populates="interested_users")  # noqa: F821
+    user: "User" = Relationship(
+        back_populates="subject_interests", sa_relationship_kwargs={"lazy": "raise"}
+    )
+    subject: "Subject" = Relationship(
+        back_populates="interested_users", sa_relationship_kwargs={"lazy": "raise"}
+    )
 
 
 class Course(SQLModel, table=True):
@@ -59,10 +83,12 @@ class Course(SQLModel, table=True):
     title: str
     subject_id: int = Field(foreign_key="subject.id")
     description: str
-    difficulty_level: int = 3  # 1-5 scale
+    difficulty_level: int = Field(default=3, sa_type=SmallInteger)  # 1-5 scale
     is_featured: bool = False
     is_new: bool = False
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
 
     # Added fields to match education levels and tracks
     education_level: str = Field(index=True)  # primary_1, bac_2, university, etc.
@@ -73,11 +99,15 @@ class Course(SQLModel, table=True):
     region: Optional[str] = None  # For region-specific curriculum
 
     # Metadata enhanced to store preferences that would make this course relevant
-    meta_data: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSON)
+    meta_data: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSONDocument)
 
     # Relationships (existing)
-    subject: Subject = Relationship(back_populates="courses")
-    course_topics: List["CourseTopic"] = Relationship(back_populates="course")
+    subject: Subject = Relationship(
+        back_populates="courses", sa_relationship_kwargs={"lazy": "raise"}
+    )
+    course_topics: List["CourseTopic"] = Relationship(
+        back_populates="course", sa_relationship_kwargs={"lazy": "raise"}
+    )
 
 
 class Topic(SQLModel, table=True):
@@ -87,19 +117,25 @@ class Topic(SQLModel, table=True):
     name: str
     subject_id: int = Field(foreign_key="subject.id")
     description: str
-    order: int  # Sequence within subject
-    difficulty: int = 3  # 1-5 scale
+    order: int = Field(sa_type=SmallInteger)  # Sequence within subject
+    difficulty: int = Field(default=3, sa_type=SmallInteger)  # 1-5 scale
     estimated_duration_minutes: Optional[int] = None
     meta_data: Optional[Dict[str, Any]] = Field(
-        default=None, sa_type=JSON
+        default=None, sa_type=JSONDocument
     )  # For time periods, prerequisites, etc.
 
     # Relationships
-    subject: Subject = Relationship(back_populates="topics")
-    lessons: List["Lesson"] = Relationship(back_populates="topic")
-    tutoring_sessions: List["TutoringSession"] = Relationship(back_populates="topic")  # noqa: F821
-    detailed_tutoring_sessions: List["DetailedTutoringSession"] = Relationship(  # noqa: F821
-        back_populates="topic"
+    subject: Subject = Relationship(
+        back_populates="topics", sa_relationship_kwargs={"lazy": "raise"}
+    )
+    lessons: List["Lesson"] = Relationship(
+        back_populates="topic", sa_relationship_kwargs={"lazy": "raise"}
+    )
+    tutoring_sessions: List["TutoringSession"] = Relationship(
+        back_populates="topic", sa_relationship_kwargs={"lazy": "raise"}
+    )
+    detailed_tutoring_sessions: List["DetailedTutoringSession"] = Relationship(
+        back_populates="topic", sa_relationship_kwargs={"lazy": "raise"}
     )
 
 
@@ -109,11 +145,13 @@ class CourseTopic(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     course_id: int = Field(foreign_key="course.id")
     topic_id: int = Field(foreign_key="topic.id")
-    order: int  # Sequence within course
+    order: int = Field(sa_type=SmallInteger)  # Sequence within course
 
     # Relationships
-    course: Course = Relationship(back_populates="course_topics")
-    topic: Topic = Relationship()
+    course: Course = Relationship(
+        back_populates="course_topics", sa_relationship_kwargs={"lazy": "raise"}
+    )
+    topic: Topic = Relationship(sa_relationship_kwargs={"lazy": "raise"})
 
 
 class Lesson(SQLModel, table=True):
@@ -124,13 +162,17 @@ class Lesson(SQLModel, table=True):
     topic_id: int = Field(foreign_key="topic.id")
     content_type: str  # "video", "text", "interactive", "quiz", etc.
     content: Dict[str, Any] = Field(
-        default={}, sa_type=JSON
+        default_factory=dict, sa_type=JSONDocument
     )  # Flexible content storage
-    order: int  # Sequence within topic
+    order: int = Field(sa_type=SmallInteger)  # Sequence within topic
     duration_minutes: Optional[int] = None
-    difficulty: int = 3  # 1-5 scale
-    meta_data: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSON)
+    difficulty: int = Field(default=3, sa_type=SmallInteger)  # 1-5 scale
+    meta_data: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSONDocument)
 
     # Relationships
-    topic: Topic = Relationship(back_populates="lessons")
-    activities: List["Activity"] = Relationship(back_populates="lesson")  # noqa: F821
+    topic: Topic = Relationship(
+        back_populates="lessons", sa_relationship_kwargs={"lazy": "raise"}
+    )
+    activities: List["Activity"] = Relationship(
+        back_populates="lesson", sa_relationship_kwargs={"lazy": "raise"}
+    )
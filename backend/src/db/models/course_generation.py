@@ -1,14 +1,56 @@
+import uuid
 from datetime import datetime
+from .timestamps import UTC_NOW, utcnow
 from typing import Optional, Dict, Any, List
-from sqlmodel import Field, SQLModel, Relationship, JSON
+from sqlalchemy import Index, SmallInteger, desc, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.types import TypeDecorator
+from sqlmodel import Field, SQLModel, Relationship
+from .types import JSONDocument
+
+SESSION_ID_PREFIX = "course-gen-"
+
+
+class SessionId(TypeDecorator):
+    """
+    Course generation session id, "course-gen-<uuid>" in Python and the API
+    but stored as a native 16-byte uuid.
+    """
+
+    impl = UUID(as_uuid=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return uuid.UUID(str(value).removeprefix(SESSION_ID_PREFIX))
+        except ValueError:
+            # A malformed id can't match any session; compare against NULL
+            return None
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return f"{SESSION_ID_PREFIX}{value}"
 
 
 class CourseGenerationSession(SQLModel, table=True):
     """Model for tracking course generation sessions."""
 
     __tablename__ = "course_generation_session"
+    __table_args__ = (
+        # Sessions still being generated, ignoring the finished history
+        Index(
+            "ix_coursegen_active",
+            "last_activity",
+            postgresql_where=text("status NOT IN ('complete', 'error', 'exported')"),
+        ),
+        # Serves a user's session list filtered by status, most recent first
+        Index("ix_coursegen_user_status", "user_id", "status", desc("last_activity")),
+    )
 
-    id: str = Field(primary_key=True)  # Using string for UUID-like IDs
+    id: str = Field(primary_key=True, sa_type=SessionId)
     user_id: int = Field(foreign_key="users.id", index=True)
     professor_id: Optional[int] = Field(
         default=None, foreign_key="schoolprofessor.id", index=True
@@ -26,29 +68,69 @@ class CourseGenerationSession(SQLModel, table=True):
 
     # Session state
     status: str = "created"  # 'created', 'brainstorming', 'structuring', 'detailing', 'finalizing', 'complete', 'error'
-    progress: int = 0  # 0-100
+    progress: int = Field(default=0, sa_type=SmallInteger)  # 0-100
     current_step: Optional[str] = None
 
     # Generated content
-    course_data: Dict[str, Any] = Field(default={}, sa_type=JSON)
-    messages: List[Dict[str, Any]] = Field(default=[], sa_type=JSON)
-    preferences: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    course_data: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
+    preferences: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Error handling
     error_message: Optional[str] = None
-    retry_count: int = 0
+    retry_count: int = Field(default=0, sa_type=SmallInteger)
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
-    last_activity: datetime = Field(default_factory=datetime.utcnow)
+    last_activity: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
 
     # Relationships
-    user: "User" = Relationship()  # noqa: F821
-    professor: Optional["SchoolProfessor"] = Relationship()  # noqa: F821
+    user: "User" = Relationship(sa_relationship_kwargs={"lazy": "raise"})  # noqa: F821
+    professor: Optional["SchoolProfessor"] = Relationship(  # noqa: F821
+        sa_relationship_kwargs={"lazy": "raise"}
+    )
     generated_course: Optional["SchoolCourse"] = Relationship(  # noqa: F821
-        back_populates="generation_session"
+        back_populates="generation_session", sa_relationship_kwargs={"lazy": "raise"}
+    )
+    # Chat transcript, one row per message so appends don't rewrite it
+    messages: List["CourseGenerationMessage"] = Relationship(
+        back_populates="session",
+        sa_relationship_kwargs={
+            "lazy": "raise",
+            "order_by": "CourseGenerationMessage.id",
+            "cascade": "all, delete-orphan",
+            "passive_deletes": True,
+        },
+    )
+
+
+class CourseGenerationMessage(SQLModel, table=True):
+    """Model for messages exchanged during a course generation session."""
+
+    __tablename__ = "course_generation_message"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    session_id: str = Field(
+        foreign_key="course_generation_session.id",
+        ondelete="CASCADE",
+        index=True,
+        sa_type=SessionId,
+    )
+    message_id: str  # Client-facing "msg-<uuid>" identifier
+    role: str  # 'user', 'assistant', 'system'
+    content: str
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
+
+    # Relationships
+    session: CourseGenerationSession = Relationship(
+        back_populates="messages", sa_relationship_kwargs={"lazy": "raise"}
     )
 
 
@@ -58,7 +140,12 @@ class CourseGenerationExport(SQLModel, table=True):
     __tablename__ = "course_generation_export"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    session_id: str = Field(foreign_key="course_generation_session.id", index=True)
+    session_id: str = Field(
+        foreign_key="course_generation_session.id",
+        ondelete="CASCADE",
+        index=True,
+        sa_type=SessionId,
+    )
 
     # Export details
     format: str  # 'pdf', 'docx', 'json', 'markdown'
@@ -67,9 +154,13 @@ class CourseGenerationExport(SQLModel, table=True):
     download_count: int = 0
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     last_downloaded: Optional[datetime] = None
     expires_at: Optional[datetime] = None
 
     # Relationships
-    session: CourseGenerationSession = Relationship()
+    session: CourseGenerationSession = Relationship(
+        sa_relationship_kwargs={"lazy": "raise"}
+    )
@@ -1,7 +1,11 @@
 from datetime import datetime
+from .timestamps import UTC_NOW, utcnow
+from .types import StringList
 from typing import List, Optional
-from sqlmodel import Field, SQLModel, Relationship, JSON
+from sqlmodel import Field, SQLModel, Relationship
 import uuid
+from sqlalchemy import Index
+from sqlalchemy.dialects.postgresql import UUID
 
 from .user import User
 from .tutoring import DetailedTutoringSession
@@ -10,17 +14,35 @@ from .tutoring import DetailedTutoringSession
 class Flashcard(SQLModel, table=True):
     """Model for storing flashcards associated with tutoring sessions."""
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    # Tag filters (tags @> ARRAY['algebra']) probe the index instead of scanning
+    __table_args__ = (
+        Index(
+            "ix_flashcard_tags_gin",
+            "tags",
+            postgresql_using="gin",
+        ),
+    )
+
+    id: uuid.UUID = Field(
+        default_factory=uuid.uuid4, primary_key=True, sa_type=UUID(as_uuid=True)
+    )
+    # Tutoring session ids are client-chosen strings, not necessarily uuids
     session_id: str = Field(foreign_key="detailed_tutoring_session.id", index=True)
     user_id: int = Field(foreign_key="users.id", index=True)
 
     # Content
     front: str  # Question or term
     back: str  # Answer or explanation
-    tags: List[str] = Field(default=[], sa_type=JSON)
+    tags: List[str] = Field(
+        default_factory=list,
+        sa_type=StringList,
+        sa_column_kwargs={"server_default": "{}"},
+    )
 
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Study metrics
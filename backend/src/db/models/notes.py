@@ -1,8 +1,12 @@
 from datetime import datetime
-from typing import Optional, List
-from sqlmodel import Field, SQLModel, Relationship, JSON
+from .timestamps import UTC_NOW, utcnow
+from .types import JSONDocument, StringList
+from typing import Any, Dict, Optional, List
+from sqlmodel import Field, SQLModel, Relationship
 import uuid
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint, desc, event, inspect, select, update
+from sqlalchemy.orm import object_session
+from sqlalchemy.dialects.postgresql import UUID
 
 from .user import User
 
@@ -11,25 +15,48 @@ class Note(SQLModel, table=True):
     """Model for user notes."""
 
     __tablename__ = "notes"
+    # Tag filters (tags @> ARRAY['algebra']) probe the index instead of scanning
+    __table_args__ = (
+        Index("ix_notes_tags_gin", "tags", postgresql_using="gin"),
+        # Serves a user's notes list, sorted by last update by default
+        Index("ix_notes_owner_updated", "owner_id", desc("updated_at")),
+    )
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    id: uuid.UUID = Field(
+        default_factory=uuid.uuid4, primary_key=True, sa_type=UUID(as_uuid=True)
+    )
     title: str
     content: str
-    folder_id: Optional[str] = Field(
-        default=None, foreign_key="note_folders.id", index=True
+    folder_id: Optional[uuid.UUID] = Field(
+        default=None,
+        foreign_key="note_folders.id",
+        index=True,
+        sa_type=UUID(as_uuid=True),
+    )
+    tags: List[str] = Field(
+        default_factory=list,
+        sa_type=StringList,
+        sa_column_kwargs={"server_default": "{}"},
+    )
+    owner_id: int = Field(foreign_key="users.id")
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
+    updated_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
     )
-    tags: List[str] = Field(default=[], sa_type=JSON)
-    owner_id: int = Field(foreign_key="users.id", index=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
     version: int = Field(default=1)
+    # Bumped on any change to the rendered note; invalidates NoteRenderCache
+    render_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     ai_enhanced: bool = Field(default=False)
 
     # Relationships
     owner: "User" = Relationship(back_populates="notes")
     folder: Optional["NoteFolder"] = Relationship(back_populates="notes")
+    # Always shown with the note, so loaded in one IN query per batch of notes
     collaborators: List["NoteCollaborator"] = Relationship(
-        back_populates="note", sa_relationship_kwargs={"cascade": "all, delete-orphan"}
+        back_populates="note",
+        sa_relationship_kwargs={"lazy": "selectin", "cascade": "all, delete-orphan"},
     )
     ai_suggestions: List["AISuggestion"] = Relationship(
         back_populates="note", sa_relationship_kwargs={"cascade": "all, delete-orphan"}
@@ -41,23 +68,30 @@ class NoteFolder(SQLModel, table=True):
 
     __tablename__ = "note_folders"
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    id: uuid.UUID = Field(
+        default_factory=uuid.uuid4, primary_key=True, sa_type=UUID(as_uuid=True)
+    )
     name: str
-    parent_id: Optional[str] = Field(default=None, foreign_key="note_folders.id")
+    parent_id: Optional[uuid.UUID] = Field(
+        default=None, foreign_key="note_folders.id", sa_type=UUID(as_uuid=True)
+    )
     owner_id: int = Field(foreign_key="users.id", index=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
+    updated_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
 
     # Relationships
     owner: "User" = Relationship(back_populates="note_folders")
     notes: List["Note"] = Relationship(back_populates="folder")
     # Self-referential relationship for parent-child folders
     parent: Optional["NoteFolder"] = Relationship(
-        sa_relationship_kwargs={"remote_side": "NoteFolder.id"}
-    )
-    children: List["NoteFolder"] = Relationship(
-        sa_relationship_kwargs={"back_populates": "parent"}
+        back_populates="children",
+        sa_relationship_kwargs={"remote_side": "NoteFolder.id"},
     )
+    children: List["NoteFolder"] = Relationship(back_populates="parent")
 
 
 class NoteCollaborator(SQLModel, table=True):
@@ -65,17 +99,26 @@ class NoteCollaborator(SQLModel, table=True):
 
     __tablename__ = "note_collaborators"
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    note_id: str = Field(foreign_key="notes.id", index=True)
+    id: uuid.UUID = Field(
+        default_factory=uuid.uuid4, primary_key=True, sa_type=UUID(as_uuid=True)
+    )
+    note_id: uuid.UUID = Field(
+        foreign_key="notes.id", index=True, sa_type=UUID(as_uuid=True)
+    )
     user_id: int = Field(foreign_key="users.id", index=True)
     permissions: str = Field(
         default="read", description="Permission level: read, write, admin"
     )
-    joined_at: datetime = Field(default_factory=datetime.utcnow)
+    joined_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
 
     # Relationships
     note: Note = Relationship(back_populates="collaborators")
-    user: "User" = Relationship(back_populates="note_collaborations")
+    # Collaborators are listed with their name and email
+    user: "User" = Relationship(
+        back_populates="note_collaborations", sa_relationship_kwargs={"lazy": "joined"}
+    )
 
     # Unique constraint to ensure one collaboration per user per note
     __table_args__ = (UniqueConstraint("note_id", "user_id", name="uix_note_user"),)
@@ -86,14 +129,86 @@ class AISuggestion(SQLModel, table=True):
 
     __tablename__ = "ai_suggestions"
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    note_id: str = Field(foreign_key="notes.id", index=True)
+    id: uuid.UUID = Field(
+        default_factory=uuid.uuid4, primary_key=True, sa_type=UUID(as_uuid=True)
+    )
+    note_id: uuid.UUID = Field(
+        foreign_key="notes.id", index=True, sa_type=UUID(as_uuid=True)
+    )
     content: str
     type: str = Field(
         description="Suggestion type: completion, clarification, connection, insight"
     )
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     applied: bool = Field(default=False)
 
     # Relationships
     note: Note = Relationship(back_populates="ai_suggestions")
+
+
+class NoteRenderCache(SQLModel, table=True):
+    """Pre-rendered note payload served when a note is opened.
+
+    A row is only served while its version matches Note.render_version, which
+    is bumped whenever the note, its collaborators, its suggestions or a
+    collaborator's name or email change. The next read re-renders it.
+    """
+
+    __tablename__ = "note_render_cache"
+
+    note_id: uuid.UUID = Field(
+        foreign_key="notes.id",
+        ondelete="CASCADE",
+        primary_key=True,
+        sa_type=UUID(as_uuid=True),
+    )
+    payload: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
+    version: int  # Note.render_version the payload was rendered from
+
+
+def _bump_render_versions(connection, condition) -> None:
+    """Bump Note.render_version in the flushing transaction.
+
+    A render that raced the change was stored under the old version and is
+    never served.
+    """
+    connection.execute(
+        update(Note).where(condition).values(render_version=Note.render_version + 1)
+    )
+
+
+@event.listens_for(Note, "before_update")
+def _note_updating(mapper, connection, target: Note) -> None:
+    # Bumped in the note's own UPDATE rather than a second statement
+    if object_session(target).is_modified(target, include_collections=False):
+        target.render_version = Note.render_version + 1
+
+
+@event.listens_for(NoteCollaborator, "after_insert")
+@event.listens_for(NoteCollaborator, "after_update")
+@event.listens_for(NoteCollaborator, "after_delete")
+@event.listens_for(AISuggestion, "after_insert")
+@event.listens_for(AISuggestion, "after_update")
+@event.listens_for(AISuggestion, "after_delete")
+def _note_child_changed(mapper, connection, target) -> None:
+    _bump_render_versions(connection, Note.id == target.note_id)
+
+
+@event.listens_for(User, "after_update")
+def _collaborator_profile_changed(mapper, connection, target: User) -> None:
+    # Collaborator names and emails are part of the rendered payload
+    state = inspect(target)
+    if (
+        state.attrs.full_name.history.has_changes()
+        or state.attrs.email.history.has_changes()
+    ):
+        _bump_render_versions(
+            connection,
+            Note.id.in_(
+                select(NoteCollaborator.note_id).where(
+                    NoteCollaborator.user_id == target.id
+                )
+            ),
+        )
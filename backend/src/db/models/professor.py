@@ -1,6 +1,10 @@
-from datetime import datetime
+from datetime import datetime, time
+from .timestamps import UTC_NOW, utcnow
+from .types import JSONDocument, StringList
 from typing import List, Optional, Dict, Any
-from sqlmodel import Field, SQLModel, Relationship, JSON
+from sqlalchemy import Index, SmallInteger, delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import Field, SQLModel, Relationship
 
 
 class SchoolProfessor(SQLModel, table=True):
@@ -13,22 +17,42 @@ class SchoolProfessor(SQLModel, table=True):
     # Academic Profile
     title: str  # Prof., Dr., etc.
     department_id: Optional[int] = Field(default=None, foreign_key="department.id")
-    specializations: List[str] = Field(default=[], sa_type=JSON)
+    specializations: List[str] = Field(
+        default_factory=list,
+        sa_type=StringList,
+        sa_column_kwargs={"server_default": "{}"},
+    )
     academic_rank: str  # Assistant Professor, Associate Professor, etc.
     tenure_status: Optional[str] = None
 
     # Teaching Details
-    teaching_languages: List[str] = Field(default=[], sa_type=JSON)
-    preferred_subjects: List[str] = Field(default=[], sa_type=JSON)
-    education_levels: List[str] = Field(default=[], sa_type=JSON)
+    teaching_languages: List[str] = Field(
+        default_factory=list,
+        sa_type=StringList,
+        sa_column_kwargs={"server_default": "{}"},
+    )
+    preferred_subjects: List[str] = Field(
+        default_factory=list,
+        sa_type=StringList,
+        sa_column_kwargs={"server_default": "{}"},
+    )
+    education_levels: List[str] = Field(
+        default_factory=list,
+        sa_type=StringList,
+        sa_column_kwargs={"server_default": "{}"},
+    )
 
     # Contact & Availability
     office_location: Optional[str] = None
-    office_hours: Dict[str, Any] = Field(default={}, sa_type=JSON)
-    contact_preferences: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    office_hours: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
+    contact_preferences: Dict[str, Any] = Field(
+        default_factory=dict, sa_type=JSONDocument
+    )
 
     # Platform Integration
-    ai_collaboration_preferences: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    ai_collaboration_preferences: Dict[str, Any] = Field(
+        default_factory=dict, sa_type=JSONDocument
+    )
     tutoring_availability: bool = True
     max_students: Optional[int] = None
 
@@ -45,7 +69,9 @@ class SchoolProfessor(SQLModel, table=True):
     )
 
     # Timestamps
-    joined_at: datetime = Field(default_factory=datetime.utcnow)
+    joined_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     last_active: Optional[datetime] = None
 
     # Status
@@ -53,7 +79,7 @@ class SchoolProfessor(SQLModel, table=True):
     account_status: str = "active"  # active, inactive, on_leave
 
     # Metadata
-    meta_data: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    meta_data: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Relationships
     user: "User" = Relationship()  # noqa: F821
@@ -62,6 +88,53 @@ class SchoolProfessor(SQLModel, table=True):
     courses: List["ProfessorCourse"] = Relationship(back_populates="professor")  # noqa: F821
     course_materials: List["CourseMaterial"] = Relationship(back_populates="professor")  # noqa: F821
     assignments: List["Assignment"] = Relationship(back_populates="professor")  # noqa: F821
+    availability_slots: List["ProfessorAvailability"] = Relationship(
+        back_populates="professor",
+        sa_relationship_kwargs={
+            "lazy": "raise",
+            "order_by": "ProfessorAvailability.day_of_week, ProfessorAvailability.start_time",
+            "cascade": "all, delete",
+            "passive_deletes": True,
+        },
+    )
+
+
+# Weekday names used as keys of SchoolProfessor.office_hours, Monday first
+WEEKDAYS = [
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+]
+
+
+class ProfessorAvailability(SQLModel, table=True):
+    """Weekly availability slot of a professor, one row per day and time range.
+
+    Mirrors the office_hours JSON of SchoolProfessor, which is kept for display,
+    so availability can be filtered with an index instead of reading JSON.
+    """
+
+    # Serves "who is available on day X around time Y" and a professor's week
+    __table_args__ = (
+        Index("ix_profavailability_day_start", "day_of_week", "start_time"),
+        Index("ix_profavailability_professor_day", "professor_id", "day_of_week"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    professor_id: int = Field(foreign_key="schoolprofessor.id", ondelete="CASCADE")
+    day_of_week: int = Field(sa_type=SmallInteger)  # 0 = Monday ... 6 = Sunday
+    start_time: time
+    end_time: time
+    kind: str = "office_hours"
+
+    # Relationships
+    professor: SchoolProfessor = Relationship(
+        back_populates="availability_slots", sa_relationship_kwargs={"lazy": "raise"}
+    )
 
 
 class ProfessorCourse(SQLModel, table=True):
@@ -73,7 +146,11 @@ class ProfessorCourse(SQLModel, table=True):
 
     # Role and Responsibilities
     role: str = "primary"  # primary, secondary, guest, advisor
-    responsibilities: List[str] = Field(default=[], sa_type=JSON)
+    responsibilities: List[str] = Field(
+        default_factory=list,
+        sa_type=StringList,
+        sa_column_kwargs={"server_default": "{}"},
+    )
 
     # Time Period
     academic_year: str = Field(index=True)
@@ -82,14 +159,18 @@ class ProfessorCourse(SQLModel, table=True):
     end_date: Optional[datetime] = None
 
     # Course Customization
-    custom_syllabus: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSON)
-    teaching_notes: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSON)
+    custom_syllabus: Optional[Dict[str, Any]] = Field(
+        default=None, sa_type=JSONDocument
+    )
+    teaching_notes: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSONDocument)
 
     # Status
     status: str = "active"  # active, completed, planned
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
@@ -100,6 +181,15 @@ class ProfessorCourse(SQLModel, table=True):
 class CourseMaterial(SQLModel, table=True):
     """Model for managing course materials and resources."""
 
+    # Tag filters (tags @> ARRAY['algebra']) probe the index instead of scanning
+    __table_args__ = (
+        Index(
+            "ix_coursematerial_tags_gin",
+            "tags",
+            postgresql_using="gin",
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     course_id: int = Field(foreign_key="schoolcourse.id", index=True)
     professor_id: int = Field(foreign_key="schoolprofessor.id", index=True)
@@ -110,7 +200,7 @@ class CourseMaterial(SQLModel, table=True):
     material_type: str  # lecture_notes, presentation, worksheet, example, reference
 
     # Content - for text-based materials or JSON structured content
-    content: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    content: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # File association - link to UserFile
     file_id: Optional[int] = Field(default=None, foreign_key="user_files.id")
@@ -118,7 +208,11 @@ class CourseMaterial(SQLModel, table=True):
     # Organization
     unit: Optional[str] = None
     sequence: Optional[int] = None
-    tags: List[str] = Field(default=[], sa_type=JSON)
+    tags: List[str] = Field(
+        default_factory=list,
+        sa_type=StringList,
+        sa_column_kwargs={"server_default": "{}"},
+    )
 
     # Access Control
     visibility: str = "students"  # students, professors, public
@@ -126,13 +220,60 @@ class CourseMaterial(SQLModel, table=True):
 
     # AI Integration
     ai_enhanced: bool = False
-    ai_features: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    ai_features: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
     course: "SchoolCourse" = Relationship(back_populates="materials")  # noqa: F821
     professor: SchoolProfessor = Relationship(back_populates="course_materials")  # noqa: F821
     file: Optional["UserFile"] = Relationship()  # One-way reference # noqa: F821
+
+
+async def replace_professor_availability(
+    session: AsyncSession,
+    professor_id: int,
+    office_hours: Dict[str, Any],
+    kind: str = "office_hours",
+) -> None:
+    """
+    Rewrite a professor's availability slots of one kind from office_hours JSON.
+
+    Args:
+        session: Database session; the caller commits
+        professor_id: Professor whose slots are replaced
+        office_hours: Mapping of weekday name to {"start": "HH:MM", "end": "HH:MM"};
+            unknown days and malformed times are skipped
+        kind: Slot kind to replace
+    """
+    rows = []
+    for day, hours in (office_hours or {}).items():
+        if day.lower() not in WEEKDAYS or not isinstance(hours, dict):
+            continue
+        try:
+            start_time = time.fromisoformat(hours["start"])
+            end_time = time.fromisoformat(hours["end"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        rows.append(
+            {
+                "professor_id": professor_id,
+                "day_of_week": WEEKDAYS.index(day.lower()),
+                "start_time": start_time,
+                "end_time": end_time,
+                "kind": kind,
+            }
+        )
+
+    await session.execute(
+        delete(ProfessorAvailability).where(
+            ProfessorAvailability.professor_id == professor_id,
+            ProfessorAvailability.kind == kind,
+        )
+    )
+    if rows:
+        await session.execute(insert(ProfessorAvailability), rows)
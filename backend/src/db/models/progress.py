@@ -1,6 +1,8 @@
 from typing import Optional, Dict, Any, List
-from sqlmodel import JSON
-from datetime import datetime, timezone
+from sqlalchemy import DDL, Index, Sequence, desc, event, text
+from datetime import datetime
+from .timestamps import UTC_NOW, utcnow
+from .types import JSONDocument
 
 from .user import User
 from .content import Subject, Lesson
@@ -11,10 +13,17 @@ from sqlmodel import Relationship, SQLModel, Field
 class Enrollment(SQLModel, table=True):
     """Model for subject enrollments."""
 
+    # Dashboards only list active enrollments; inactive rows stay out of the index
+    __table_args__ = (
+        Index("ix_enrollment_active", "user_id", postgresql_where=text("active")),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id")
     subject_id: int = Field(foreign_key="subject.id")
-    enrolled_at: datetime = Field(default_factory=datetime.now(timezone.utc))
+    enrolled_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     active: bool = True
     completed: bool = False
     completed_at: Optional[datetime] = None
@@ -22,7 +31,7 @@ class Enrollment(SQLModel, table=True):
 
     # Progress tracking
     progress_percentage: float = 0.0
-    progress_data: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    progress_data: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Relationships
     user: User = Relationship(back_populates="enrollments")
@@ -32,14 +41,39 @@ class Enrollment(SQLModel, table=True):
 class Activity(SQLModel, table=True):
     """Model for all learning activities including assessments."""
 
-    id: Optional[int] = Field(default=None, primary_key=True)
+    __table_args__ = (
+        # Serves a user's activity history, newest first, straight from the index
+        Index("ix_activity_user_time", "user_id", desc("start_time")),
+        # Same history filtered to one activity type (quizzes, homework, ...)
+        Index("ix_activity_user_type_time", "user_id", "type", desc("start_time")),
+        # Streaks and completion counts only look at completed activities
+        Index(
+            "ix_activity_user_completed",
+            "user_id",
+            desc("start_time"),
+            postgresql_where=text("status = 'completed'"),
+        ),
+        # Monthly range partitions (created by PostgresDatabase) keep the hot
+        # indexes to recent months; the partition key must be part of the PK
+        {"postgresql_partition_by": "RANGE (start_time)"},
+    )
+
+    # Composite keys aren't autoincremented, so ids come from an explicit sequence
+    # (also the column's server default on PostgreSQL, see below)
+    id: Optional[int] = Field(
+        default=None, primary_key=True, sa_column_args=[Sequence("activity_id_seq")]
+    )
     user_id: int = Field(foreign_key="users.id")
     lesson_id: Optional[int] = Field(default=None, foreign_key="lesson.id")
 
     # Activity details
     type: str  # "lesson", "quiz", "practice", "tutoring", "homework"
     status: str = "started"  # "started", "in_progress", "completed", "abandoned"
-    start_time: datetime = Field(default_factory=datetime.now(timezone.utc))
+    start_time: datetime = Field(
+        default_factory=utcnow,
+        primary_key=True,
+        sa_column_kwargs={"server_default": UTC_NOW},
+    )
     end_time: Optional[datetime] = None
     duration_seconds: Optional[int] = None
 
@@ -49,14 +83,25 @@ class Activity(SQLModel, table=True):
     mastery_level: Optional[float] = None  # 0-1 scale
 
     # Flexible data fields for different activity types
-    data: Dict[str, Any] = Field(default={}, sa_type=JSON)
-    results: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    data: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
+    results: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Relationships
     user: User = Relationship(back_populates="activities")
     lesson: Optional[Lesson] = Relationship(back_populates="activities")
 
 
+# Inserts that bypass the ORM (raw SQL, COPY) draw ids from the sequence too;
+# added as DDL because SQLite, used in tests, has no nextval()
+event.listen(
+    Activity.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE activity ALTER COLUMN id SET DEFAULT nextval('activity_id_seq')"
+    ).execute_if(dialect="postgresql"),
+)
+
+
 class Achievement(SQLModel, table=True):
     """Model for user achievements and badges."""
 
@@ -67,9 +112,11 @@ class Achievement(SQLModel, table=True):
     description: str
     type: str  # "badge", "milestone", "certificate", "streak"
     icon: str
-    awarded_at: datetime = Field(default_factory=datetime.now(timezone.utc))
+    awarded_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     points: int = 0
-    meta_data: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    meta_data: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Relationships
     user: User = Relationship(back_populates="achievements")
@@ -78,8 +125,11 @@ class Achievement(SQLModel, table=True):
 class ScheduleEntry(SQLModel, table=True):
     """Model for user's personal schedule entries (not directly tied to classes)."""
 
+    # Serves a user's entries within a date range; also covers user_id lookups
+    __table_args__ = (Index("ix_scheduleentry_user_time", "user_id", "start_time"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id", index=True)
+    user_id: int = Field(foreign_key="users.id")
 
     # Schedule details
     title: str
@@ -96,7 +146,7 @@ class ScheduleEntry(SQLModel, table=True):
     recurrence_end_date: Optional[datetime] = None
 
     # For recurring events, store which days of week (0-6 for Monday-Sunday)
-    days_of_week: List[int] = Field(default=[], sa_type=JSON)
+    days_of_week: List[int] = Field(default_factory=list, sa_type=JSONDocument)
 
     # For school-related entries
     school_class_id: Optional[int] = Field(
@@ -125,10 +175,12 @@ class ScheduleEntry(SQLModel, table=True):
     is_cancelled: bool = False
 
     # Metadata
-    meta_data: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    meta_data: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
@@ -1,6 +1,9 @@
 from datetime import datetime
+from .timestamps import UTC_NOW, utcnow
 from typing import Optional, Dict, Any
-from sqlmodel import Field, SQLModel, Relationship, JSON
+from sqlalchemy import Index, desc, text
+from sqlmodel import Field, SQLModel, Relationship
+from .types import JSONDocument
 
 from .user import User
 from .content import Subject, Lesson, Topic
@@ -13,6 +16,18 @@ from typing import List
 class Recommendation(SQLModel, table=True):
     """Model for personalized learning recommendations."""
 
+    # Serves a user's pending recommendations in display order; acted-upon
+    # history stays out of the index
+    __table_args__ = (
+        Index(
+            "ix_reco_pending",
+            "user_id",
+            "priority",
+            desc("created_at"),
+            postgresql_where=text("NOT acted_upon"),
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id")
 
@@ -30,25 +45,45 @@ class Recommendation(SQLModel, table=True):
     course_id: Optional[int] = Field(default=None, foreign_key="course.id")
 
     # Additional data
-    data: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    data: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Status
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     viewed_at: Optional[datetime] = None
     acted_upon: bool = False
     expires_at: Optional[datetime] = None
 
     # Relationships
     user: User = Relationship(back_populates="recommendations")
-    subject: Optional[Subject] = Relationship()
-    topic: Optional[Topic] = Relationship()
-    lesson: Optional[Lesson] = Relationship()
-    course: Optional[Course] = Relationship()
+    # Lists load the references they show with selectinload, one IN query
+    # per target table, instead of a lazy load per row
+    subject: Optional[Subject] = Relationship(sa_relationship_kwargs={"lazy": "raise"})
+    topic: Optional[Topic] = Relationship(sa_relationship_kwargs={"lazy": "raise"})
+    lesson: Optional[Lesson] = Relationship(sa_relationship_kwargs={"lazy": "raise"})
+    course: Optional[Course] = Relationship(sa_relationship_kwargs={"lazy": "raise"})
 
 
 class ExplorationTopic(SQLModel, table=True):
     """Model for curated exploration topics shown on dashboard."""
 
+    # Serves the explore search's containment filters on both lists
+    __table_args__ = (
+        Index(
+            "ix_explorationtopic_concepts_gin",
+            "connects_concepts",
+            postgresql_using="gin",
+            postgresql_ops={"connects_concepts": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_explorationtopic_subjects_gin",
+            "related_subjects",
+            postgresql_using="gin",
+            postgresql_ops={"related_subjects": "jsonb_path_ops"},
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
     description: str
@@ -58,14 +93,16 @@ class ExplorationTopic(SQLModel, table=True):
     is_new: bool = False
 
     # Topic connections
-    connects_concepts: List[str] = Field(default=[], sa_type=JSON)
-    related_subjects: List[str] = Field(default=[], sa_type=JSON)
+    connects_concepts: List[str] = Field(default_factory=list, sa_type=JSONDocument)
+    related_subjects: List[str] = Field(default_factory=list, sa_type=JSONDocument)
 
     # Display details
     color_scheme: Optional[str] = None
     icon: Optional[str] = None
 
     # Content and metadata
-    content: Dict[str, Any] = Field(default={}, sa_type=JSON)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    meta_data: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    content: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
+    meta_data: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
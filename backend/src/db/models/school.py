@@ -1,8 +1,11 @@
 from datetime import datetime
+from .timestamps import UTC_NOW, utcnow
 from typing import List, Optional, Dict, Any
-from sqlmodel import Field, SQLModel, Relationship, JSON
+from sqlmodel import Field, SQLModel, Relationship
+from .types import JSONDocument
 
 from .professor import SchoolProfessor
+from .course_generation import SessionId
 
 
 class School(SQLModel, table=True):
@@ -18,7 +21,7 @@ class School(SQLModel, table=True):
     region: str = Field(index=True)
     school_type: str = Field(index=True)  # public, private, mission, international
     education_levels: List[str] = Field(
-        default=[], sa_type=JSON
+        default_factory=list, sa_type=JSONDocument
     )  # primary, college, lycee, university
 
     # Contact information
@@ -37,11 +40,15 @@ class School(SQLModel, table=True):
     color_scheme: Optional[str] = None
 
     # Integration settings
-    integration_settings: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    integration_settings: Dict[str, Any] = Field(
+        default_factory=dict, sa_type=JSONDocument
+    )
     api_key: Optional[str] = None
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
@@ -68,7 +75,9 @@ class Department(SQLModel, table=True):
     head_staff_id: Optional[int] = Field(default=None, foreign_key="schoolstaff.id")
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
@@ -103,7 +112,9 @@ class SchoolClass(SQLModel, table=True):
     )
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
@@ -125,8 +136,8 @@ class SchoolStaff(SQLModel, table=True):
 
     # Teacher-specific fields
     is_teacher: bool = Field(default=False, index=True)
-    qualifications: List[str] = Field(default=[], sa_type=JSON)
-    expertise_subjects: List[str] = Field(default=[], sa_type=JSON)
+    qualifications: List[str] = Field(default_factory=list, sa_type=JSONDocument)
+    expertise_subjects: List[str] = Field(default_factory=list, sa_type=JSONDocument)
 
     # Administrative
     hire_date: Optional[datetime] = None
@@ -137,7 +148,9 @@ class SchoolStaff(SQLModel, table=True):
     work_phone: Optional[str] = None
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
@@ -162,7 +175,9 @@ class DepartmentStaffAssignment(SQLModel, table=True):
     is_primary: bool = False
 
     # Timestamps
-    assigned_at: datetime = Field(default_factory=datetime.utcnow)
+    assigned_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
@@ -193,22 +208,28 @@ class SchoolCourse(SQLModel, table=True):
     credits: Optional[float] = None
 
     # Course Structure
-    syllabus: Dict[str, Any] = Field(default={}, sa_type=JSON)
-    learning_objectives: List[str] = Field(default=[], sa_type=JSON)
-    prerequisites: List[str] = Field(default=[], sa_type=JSON)
+    syllabus: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
+    learning_objectives: List[str] = Field(default_factory=list, sa_type=JSONDocument)
+    prerequisites: List[str] = Field(default_factory=list, sa_type=JSONDocument)
 
     # AI Tutoring Integration
     ai_tutoring_enabled: bool = True
-    ai_tutoring_config: Dict[str, Any] = Field(default={}, sa_type=JSON)
-    suggested_topics: List[str] = Field(default=[], sa_type=JSON)
+    ai_tutoring_config: Dict[str, Any] = Field(
+        default_factory=dict, sa_type=JSONDocument
+    )
+    suggested_topics: List[str] = Field(default_factory=list, sa_type=JSONDocument)
 
     # Course Materials
-    required_materials: Dict[str, Any] = Field(default={}, sa_type=JSON)
-    supplementary_resources: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    required_materials: Dict[str, Any] = Field(
+        default_factory=dict, sa_type=JSONDocument
+    )
+    supplementary_resources: Dict[str, Any] = Field(
+        default_factory=dict, sa_type=JSONDocument
+    )
 
     # Assessment Configuration
-    grading_schema: Dict[str, Any] = Field(default={}, sa_type=JSON)
-    assessment_types: List[str] = Field(default=[], sa_type=JSON)
+    grading_schema: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
+    assessment_types: List[str] = Field(default_factory=list, sa_type=JSONDocument)
 
     # Collaboration Settings
     allow_group_work: bool = True
@@ -221,7 +242,9 @@ class SchoolCourse(SQLModel, table=True):
     end_date: Optional[datetime] = None
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
@@ -238,8 +261,11 @@ class SchoolCourse(SQLModel, table=True):
         back_populates="course"
     )
     generation_session_id: Optional[str] = Field(
-        default=None, foreign_key="course_generation_session.id"
-    )  # noqa: F821
+        default=None,
+        foreign_key="course_generation_session.id",
+        ondelete="SET NULL",
+        sa_type=SessionId,
+    )
     generation_session: Optional["CourseGenerationSession"] = Relationship(  # noqa: F821
         back_populates="generated_course"
     )
@@ -265,7 +291,9 @@ class SchoolStudent(SQLModel, table=True):
     graduation_year: Optional[str] = None
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
@@ -289,13 +317,17 @@ class ClassEnrollment(SQLModel, table=True):
 
     # Enrollment details
     academic_year: str = Field(index=True)  # e.g., "2024-2025"
-    enrollment_date: datetime = Field(default_factory=datetime.utcnow)
+    enrollment_date: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
 
     # Status
     status: str = "active"  # active, inactive, transferred, graduated
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
@@ -312,7 +344,9 @@ class CourseEnrollment(SQLModel, table=True):
 
     # Enrollment details
     academic_year: str = Field(index=True)  # e.g., "2024-2025"
-    enrollment_date: datetime = Field(default_factory=datetime.utcnow)
+    enrollment_date: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
 
     # Performance tracking
     grade: Optional[float] = None
@@ -324,7 +358,9 @@ class CourseEnrollment(SQLModel, table=True):
     completion_date: Optional[datetime] = None
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
@@ -361,7 +397,9 @@ class ClassSchedule(SQLModel, table=True):
     is_cancelled: bool = False  # Add cancelled status for one-off cancellations
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
@@ -383,23 +421,27 @@ class Assignment(SQLModel, table=True):
     assignment_type: str  # homework, project, quiz, exam
 
     # Timeframe
-    assigned_date: datetime = Field(default_factory=datetime.utcnow)
+    assigned_date: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     due_date: datetime
 
     # Grading
     points_possible: float
-    grading_criteria: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    grading_criteria: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Content
     instructions: str
-    materials: Dict[str, Any] = Field(default={}, sa_type=JSON)
-    resources: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    materials: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
+    resources: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Status
     is_published: bool = True
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
@@ -418,9 +460,11 @@ class AssignmentSubmission(SQLModel, table=True):
     student_id: int = Field(foreign_key="schoolstudent.id", index=True)
 
     # Submission details
-    submission_date: datetime = Field(default_factory=datetime.utcnow)
+    submission_date: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     content: Dict[str, Any] = Field(
-        sa_type=JSON
+        sa_type=JSONDocument
     )  # Flexible storage for various submission types
 
     # Status
@@ -433,7 +477,9 @@ class AssignmentSubmission(SQLModel, table=True):
     graded_at: Optional[datetime] = None
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
@@ -454,11 +500,11 @@ class LessonPlan(SQLModel, table=True):
     # Lesson details
     title: str
     description: str
-    objectives: List[str] = Field(default=[], sa_type=JSON)
+    objectives: List[str] = Field(default_factory=list, sa_type=JSONDocument)
 
     # Content
-    content: Dict[str, Any] = Field(default={}, sa_type=JSON)
-    resources: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    content: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
+    resources: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Scheduling
     planned_date: Optional[datetime] = None
@@ -469,10 +515,12 @@ class LessonPlan(SQLModel, table=True):
 
     # AI integration
     ai_enhanced: bool = False
-    ai_contributions: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    ai_contributions: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
 
@@ -492,7 +540,9 @@ class AttendanceRecord(SQLModel, table=True):
     recorded_by: Optional[int] = Field(default=None, foreign_key="schoolstaff.id")
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
 
@@ -509,11 +559,13 @@ class SchoolAnnouncement(SQLModel, table=True):
 
     # Publishing details
     published_by: int = Field(foreign_key="schoolstaff.id")
-    published_at: datetime = Field(default_factory=datetime.utcnow)
+    published_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
 
     # Target audience
     audience_type: str  # all, staff, students, parents, department
-    target_classes: List[int] = Field(default=[], sa_type=JSON)
+    target_classes: List[int] = Field(default_factory=list, sa_type=JSONDocument)
 
     # Display settings
     priority: str = "normal"  # low, normal, high, urgent
@@ -523,7 +575,9 @@ class SchoolAnnouncement(SQLModel, table=True):
     is_published: bool = True
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
 
@@ -535,7 +589,7 @@ class ProfessorClassCourses(SQLModel, table=True):
     professor_id: int = Field(foreign_key="schoolprofessor.id", index=True)
 
     # Multiple courses assigned to this professor for this class
-    course_ids: List[int] = Field(default=[], sa_type=JSON)
+    course_ids: List[int] = Field(default_factory=list, sa_type=JSONDocument)
 
     # Academic period
     academic_year: str = Field(index=True)
@@ -548,7 +602,9 @@ class ProfessorClassCourses(SQLModel, table=True):
     is_active: bool = True
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships
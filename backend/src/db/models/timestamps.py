@@ -0,0 +1,12 @@
+"""Timestamp defaults shared by the database models."""
+
+from datetime import datetime, timezone
+from sqlalchemy import text
+
+# Server-side counterpart of utcnow() for rows inserted without the ORM
+UTC_NOW = text("timezone('utc', now())")
+
+
+def utcnow() -> datetime:
+    """Return the current UTC time as a naive datetime, as the columns store it."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -1,7 +1,9 @@
 from datetime import datetime
+from .timestamps import UTC_NOW, utcnow
 from typing import List, Optional, Dict, Any
-from sqlmodel import Field, SQLModel, Relationship, JSON
-from sqlalchemy import Column, String
+from sqlmodel import Field, SQLModel, Relationship
+from sqlalchemy import Column, Index, String, desc
+from .types import JSONDocument
 
 from .user import User
 from .content import Topic
@@ -16,21 +18,23 @@ class TutoringSession(SQLModel, table=True):
 
     # Session details
     title: str  # Derived from initial question or topic
-    start_time: datetime = Field(default_factory=datetime.utcnow)
+    start_time: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     end_time: Optional[datetime] = None
     duration_seconds: Optional[int] = None
     status: str = "active"  # "active", "completed", "abandoned"
 
     # Session data
-    context: Dict[str, Any] = Field(default={}, sa_type=JSON)
-    feedback: Dict[str, Any] = Field(default={}, sa_type=JSON)
-    messages: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    context: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
+    feedback: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
+    messages: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Analytics
     total_messages: int = 0
     user_messages: int = 0
     ai_messages: int = 0
-    topics_covered: List[str] = Field(default=[], sa_type=JSON)
+    topics_covered: List[str] = Field(default_factory=list, sa_type=JSONDocument)
 
     # Relationships
     user: User = Relationship(back_populates="tutoring_sessions")
@@ -41,10 +45,14 @@ class DetailedTutoringSession(SQLModel, table=True):
     """Advanced model for AI tutoring sessions with various interaction modes."""
 
     __tablename__ = "detailed_tutoring_session"
+    # Serves a user's recent sessions, newest first; also covers user_id lookups
+    __table_args__ = (
+        Index("ix_detailed_tutoring_user_time", "user_id", desc("start_time")),
+    )
 
     # Keep string ID type to support UUIDs, but properly configure it using Column
     id: str = Field(sa_column=Column(String, primary_key=True))
-    user_id: int = Field(foreign_key="users.id", index=True)
+    user_id: int = Field(foreign_key="users.id")
     topic_id: Optional[int] = Field(default=None, foreign_key="topic.id", index=True)
 
     # Session core info
@@ -52,8 +60,10 @@ class DetailedTutoringSession(SQLModel, table=True):
     session_type: str = Field(index=True)  # "chat", "whiteboard", "video", "notes"
     interaction_mode: str  # "text-only", "voice", "ocr-enabled", "interactive-diagram"
 
-    # Use datetime.utcnow without timezone info for PostgreSQL compatibility
-    start_time: datetime = Field(default_factory=datetime.utcnow)
+    # Naive UTC timestamps for PostgreSQL compatibility
+    start_time: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     end_time: Optional[datetime] = None
     duration_seconds: Optional[int] = None
     status: str = "active"  # "active", "paused", "completed", "abandoned"
@@ -66,11 +76,11 @@ class DetailedTutoringSession(SQLModel, table=True):
     provider: Optional[str] = None  # openai, groq, etc.
     model: Optional[str] = None
     # Session configuration
-    config: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    config: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Learning outcomes
-    concepts_learned: List[str] = Field(default=[], sa_type=JSON)
-    skills_practiced: List[str] = Field(default=[], sa_type=JSON)
+    concepts_learned: List[str] = Field(default_factory=list, sa_type=JSONDocument)
+    skills_practiced: List[str] = Field(default_factory=list, sa_type=JSONDocument)
 
     # Relationships
     user: User = Relationship(back_populates="detailed_tutoring_sessions")
@@ -87,18 +97,20 @@ class TutoringExchange(SQLModel, table=True):
     # Reference string ID (UUID) from detailed_tutoring_session
     session_id: str = Field(foreign_key="detailed_tutoring_session.id", index=True)
     sequence: int  # Order in the conversation
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
 
     # Student input
     student_input_type: str  # "text", "voice", "ocr", "drawing", "file-upload"
-    student_input: Dict[str, Any] = Field(sa_type=JSON)
+    student_input: Dict[str, Any] = Field(sa_type=JSONDocument)
 
     # AI response
     ai_response_type: str  # "text", "voice", "diagram", "annotation", "correction"
-    ai_response: Dict[str, Any] = Field(sa_type=JSON)
+    ai_response: Dict[str, Any] = Field(sa_type=JSONDocument)
 
     # Learning signals
-    learning_signals: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    learning_signals: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Bookmarked status
     is_bookmarked: bool = False
@@ -118,8 +130,10 @@ class SessionResource(SQLModel, table=True):
     # Resource info
     resource_type: str  # "formula", "diagram", "example", "summary", "practice-problem"
     title: str
-    content: Dict[str, Any] = Field(sa_type=JSON)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    content: Dict[str, Any] = Field(sa_type=JSONDocument)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
 
     # Usage
     student_saved: bool = False
@@ -1,6 +1,8 @@
 from datetime import datetime
+from .timestamps import UTC_NOW, utcnow
 from typing import Optional, Dict, Any
-from sqlmodel import Field, SQLModel, Relationship, JSON
+from sqlmodel import Field, SQLModel, Relationship
+from .types import JSONDocument
 
 
 class CourseAITutoringSession(SQLModel, table=True):
@@ -12,13 +14,17 @@ class CourseAITutoringSession(SQLModel, table=True):
 
     # Session details
     title: str
-    start_time: datetime = Field(default_factory=datetime.utcnow)
+    start_time: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     end_time: Optional[datetime] = None
     duration_seconds: Optional[int] = None
 
     # Session data
-    context: Dict[str, Any] = Field(default={}, sa_type=JSON)
-    learning_objectives: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    context: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
+    learning_objectives: Dict[str, Any] = Field(
+        default_factory=dict, sa_type=JSONDocument
+    )
 
     # Status
     status: str = "active"  # active, completed, paused
@@ -27,5 +33,7 @@ class CourseAITutoringSession(SQLModel, table=True):
     course: "SchoolCourse" = Relationship(back_populates="tutoring_sessions")  # noqa: F821
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
@@ -0,0 +1,12 @@
+"""Column types shared by the database models."""
+
+from sqlalchemy import JSON, String
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+
+# Text array on PostgreSQL (GIN-indexable, @> filters); stored as JSON on
+# SQLite, which the test suite runs against and which has no array type
+StringList = ARRAY(String).with_variant(JSON(), "sqlite")
+
+# Binary JSON on PostgreSQL (indexable, ->> and @> operators); plain JSON on
+# SQLite, which has no JSONB type
+JSONDocument = JSONB().with_variant(JSON(), "sqlite")
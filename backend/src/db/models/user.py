@@ -1,8 +1,10 @@
 from sqlmodel import SQLModel, Field
 from datetime import datetime
+from .timestamps import UTC_NOW, utcnow
 from typing import Optional, Dict, Any, List
-from sqlmodel import JSON
 from sqlmodel import Relationship
+from sqlalchemy import Index, text
+from .types import JSONDocument
 
 
 class User(SQLModel, table=True):
@@ -21,7 +23,7 @@ class User(SQLModel, table=True):
     # Enhanced Avatar support
     avatar: Optional[str] = None  # URL to avatar image
     avatar_metadata: Dict[str, Any] = Field(
-        default={}, sa_type=JSON
+        default_factory=dict, sa_type=JSONDocument
     )  # Stores metadata about the avatar
     avatar_updated_at: Optional[datetime] = None  # When the avatar was last updated
 
@@ -52,9 +54,9 @@ class User(SQLModel, table=True):
     # Learning preferences
     learning_style: Optional[str] = Field(default=None)
     # Options: visual, auditory, reading, kinesthetic
-    study_habits: List[str] = Field(default=[], sa_type=JSON)
+    study_habits: List[str] = Field(default_factory=list, sa_type=JSONDocument)
     # Options: morning, evening, concentrated, spaced, group, individual
-    academic_goals: List[str] = Field(default=[], sa_type=JSON)
+    academic_goals: List[str] = Field(default_factory=list, sa_type=JSONDocument)
     # Options: academic-excellence, bac-preparation, etc.
 
     # Account status
@@ -69,7 +71,9 @@ class User(SQLModel, table=True):
     token_revoked_at: Optional[datetime] = None
 
     # Account creation and updates
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Password reset tracking
@@ -77,7 +81,7 @@ class User(SQLModel, table=True):
     reset_token_expires: Optional[datetime] = None
 
     # User settings and preferences
-    settings: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    settings: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
 
     # Privacy and data preferences
     data_consent: bool = Field(default=False)
@@ -126,6 +130,13 @@ class UserFile(SQLModel, table=True):
     """Enhanced model for tracking file uploads across the application"""
 
     __tablename__ = "user_files"
+    # Material listings filter on these metadata keys with ->>; expression
+    # indexes let those equality filters use a btree instead of reading JSON
+    __table_args__ = (
+        Index("ix_user_files_meta_type", text("(file_metadata ->> 'type')")),
+        Index("ix_user_files_meta_subject", text("(file_metadata ->> 'subject_id')")),
+        Index("ix_user_files_meta_topic", text("(file_metadata ->> 'topic_id')")),
+    )
 
     id: int = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True)
@@ -156,7 +167,7 @@ class UserFile(SQLModel, table=True):
     is_deleted: bool = Field(default=False)
     is_public: bool = Field(default=False)  # Globally accessible
     shared_with: List[Dict[str, Any]] = Field(
-        default=[], sa_type=JSON
+        default_factory=list, sa_type=JSONDocument
     )  # List of user IDs or roles with access
     sharing_level: str = Field(
         default="private"
@@ -168,7 +179,7 @@ class UserFile(SQLModel, table=True):
     department_id: Optional[int] = Field(default=None, index=True)
 
     # Content metadata
-    file_metadata: Dict[str, Any] = Field(default={}, sa_type=JSON)
+    file_metadata: Dict[str, Any] = Field(default_factory=dict, sa_type=JSONDocument)
     content_status: str = Field(default="ready")  # ready, processing, error
 
     # Source tracking
@@ -176,7 +187,9 @@ class UserFile(SQLModel, table=True):
     source_type: Optional[str] = None  # upload, generation, system, etc.
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
     expires_at: Optional[datetime] = None  # For temporary files
 
@@ -194,7 +207,9 @@ class Guardian(SQLModel, table=True):
     can_view_progress: bool = True
     can_view_messages: bool = True
     can_edit_profile: bool = False
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
 
     # Relationships
     student: User = Relationship(
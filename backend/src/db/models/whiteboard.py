@@ -1,7 +1,9 @@
 from datetime import datetime
+from .timestamps import UTC_NOW, utcnow
 from typing import List, Optional, Dict, Any
-from sqlmodel import Field, SQLModel, Relationship, JSON
+from sqlmodel import Field, SQLModel, Relationship
 import uuid
+from .types import JSONDocument
 
 from .user import User
 from .tutoring import DetailedTutoringSession
@@ -28,14 +30,18 @@ class WhiteboardSession(SQLModel, table=True):
     education_level: Optional[str] = None  # primary_1, bac_2, etc.
 
     # Session timing
-    start_time: datetime = Field(default_factory=datetime.utcnow)
+    start_time: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     end_time: Optional[datetime] = None
     duration_seconds: Optional[int] = None
 
     # Content storage
-    current_state: Dict[str, Any] = Field(default={}, sa_type=JSON)  # Desmos state
+    current_state: Dict[str, Any] = Field(
+        default_factory=dict, sa_type=JSONDocument
+    )  # Desmos state
     snapshots: List[Dict[str, Any]] = Field(
-        default=[], sa_type=JSON
+        default_factory=list, sa_type=JSONDocument
     )  # List of board states during session
 
     # AI integration
@@ -43,7 +49,9 @@ class WhiteboardSession(SQLModel, table=True):
     ai_model: Optional[str] = None
 
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
     updated_at: Optional[datetime] = None
 
     # Relationships - keeping these optional since we're no longer enforcing foreign keys
@@ -61,7 +69,7 @@ class WhiteboardInteraction(SQLModel, table=True):
     # Interaction details
     type: str  # "screenshot", "query", "response", "annotation", "equation"
     content: Dict[str, Any] = Field(
-        sa_type=JSON
+        sa_type=JSONDocument
     )  # Flexible storage for various interaction types
 
     # Screenshot specific fields
@@ -69,11 +77,13 @@ class WhiteboardInteraction(SQLModel, table=True):
     ocr_text: Optional[str] = None
 
     # Timing
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"server_default": UTC_NOW}
+    )
 
     # AI processing
     ai_processed: bool = False
-    ai_response: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSON)
+    ai_response: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSONDocument)
     processing_time_ms: Optional[int] = None
 
     # Relationships
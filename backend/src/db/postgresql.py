@@ -1,16 +1,58 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import ORMExecuteState, Session, raiseload, sessionmaker
 from sqlalchemy.sql import text
+from sqlalchemy.schema import CreateIndex
 from typing import AsyncGenerator, Dict, Any
 from contextlib import asynccontextmanager
 import asyncio
-from datetime import datetime
+from datetime import date, datetime
 from sqlmodel import SQLModel
 from urllib.parse import urlparse
 from loguru import logger
 import ssl
 import os
+import uuid
 from src.core.settings import settings
+from src.db.models.timestamps import utcnow
+from src.db.views import MATERIALIZED_VIEWS
+
+
+def _month_start(day: date, months_ahead: int) -> date:
+    """First day of the month months_ahead months after day's month."""
+    month_index = day.year * 12 + day.month - 1 + months_ahead
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _partition_key(table) -> str:
+    """Column a table is range-partitioned on, e.g. "start_time"."""
+    partition_by = table.dialect_options["postgresql"]["partition_by"]
+    return partition_by[partition_by.index("(") + 1 : partition_by.rindex(")")].strip()
+
+
+def _raise_on_lazy_loads(orm_execute_state: ORMExecuteState) -> None:
+    """
+    Make relationships that would lazy-load on access raise instead.
+
+    Only applies to sessions flagged with info["strict_loading"], so N+1
+    access patterns fail loudly in development. Relationships with an eager
+    default (selectin/joined) keep loading as declared.
+    """
+    if (
+        not orm_execute_state.is_select
+        or orm_execute_state.is_relationship_load
+        or not orm_execute_state.session.info.get("strict_loading")
+    ):
+        return
+
+    options = [
+        raiseload(relationship.class_attribute, sql_only=True)
+        for mapper in orm_execute_state.all_mappers
+        for relationship in mapper.relationships
+        if relationship.lazy in ("select", True)
+    ]
+    if options:
+        orm_execute_state.statement = orm_execute_state.statement.options(*options)
 
 
 class PostgresDatabase:
@@ -54,6 +96,16 @@ class PostgresDatabase:
         if ssl_context:
             connect_args["ssl"] = ssl_context
 
+        # PgBouncer in transaction mode hands each transaction a different
+        # server connection, so prepared statements can't be cached per
+        # connection and their names must be unique across clients
+        if settings.POSTGRES_USE_PGBOUNCER:
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = (
+                lambda: f"__asyncpg_{uuid.uuid4()}__"
+            )
+
         # Configure connection pool
         self.pool_size = settings.POSTGRES_POOL_SIZE
         self.max_overflow = settings.POSTGRES_MAX_OVERFLOW
@@ -84,8 +136,13 @@ class PostgresDatabase:
 
             # Create async session factory
             self.async_session_maker = sessionmaker(
-                self.engine, class_=AsyncSession, expire_on_commit=False
+                self.engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+                info={"strict_loading": settings.POSTGRES_STRICT_LOADING},
             )
+            if settings.POSTGRES_STRICT_LOADING:
+                event.listen(Session, "do_orm_execute", _raise_on_lazy_loads)
 
             logger.info(
                 f"PostgreSQL connection initialized: host={self.db_host}, "
@@ -132,6 +189,17 @@ class PostgresDatabase:
                     # Create tables in the specified schema
                     await conn.run_sync(lambda conn: SQLModel.metadata.create_all(conn))
 
+                    # Materialized views are built over the tables above
+                    for _, statements in MATERIALIZED_VIEWS:
+                        for statement in statements:
+                            await conn.execute(text(statement))
+
+                await self.create_partitions()
+
+                # create_all only indexes tables it creates, so add indexes
+                # declared since on existing tables
+                await self.create_missing_indexes()
+
                 logger.info(
                     f"PostgreSQL tables created or verified in schema '{self.schema}'"
                 )
@@ -157,6 +225,268 @@ class PostgresDatabase:
         # If we get here, all retries failed
         raise last_error or RuntimeError("Failed to connect to database")
 
+    async def create_missing_indexes(self):
+        """
+        Create declared indexes that don't exist yet without blocking writes.
+
+        Indexes are built with CREATE INDEX CONCURRENTLY, which can't run in a
+        transaction, so this uses an autocommit connection. An advisory lock
+        keeps several workers from building the same index, and a failing
+        index is logged and skipped so it can't keep the app from starting.
+        """
+        async with self.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text(f"SET search_path TO {self.schema}, public"))
+            await conn.execute(
+                text("SELECT pg_advisory_lock(hashtext('create_missing_indexes'))")
+            )
+            try:
+                # A failed CONCURRENTLY build leaves an INVALID index behind,
+                # which IF NOT EXISTS would skip forever
+                invalid_indexes = set(
+                    (
+                        await conn.execute(
+                            text(
+                                "SELECT c.relname FROM pg_index i "
+                                "JOIN pg_class c ON c.oid = i.indexrelid "
+                                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                                "WHERE NOT i.indisvalid AND n.nspname = :schema"
+                            ),
+                            {"schema": self.schema},
+                        )
+                    ).scalars()
+                )
+
+                for table in SQLModel.metadata.sorted_tables:
+                    # CONCURRENTLY isn't supported on partitioned tables; their
+                    # indexes are built on each partition instead
+                    partitioned = table.dialect_options["postgresql"]["partition_by"]
+                    column_types = None
+                    for index in table.indexes:
+                        options = index.dialect_options["postgresql"]
+                        if options["using"] == "gin" or options["ops"]:
+                            # GIN and operator classes need the column type the
+                            # model declares (jsonb, arrays); columns that still
+                            # have an older type wait for their manual ALTER
+                            if column_types is None:
+                                column_types = await self._column_types(
+                                    conn, table.name
+                                )
+                            mismatched = [
+                                column.name
+                                for column in index.columns
+                                if column_types.get(column.name)
+                                != self._declared_data_type(column, conn.dialect)
+                            ]
+                            if mismatched:
+                                logger.warning(
+                                    f"Skipping index {index.name}: column(s) "
+                                    f"{', '.join(mismatched)} don't have the "
+                                    f"declared type yet"
+                                )
+                                continue
+                        try:
+                            if index.name in invalid_indexes:
+                                logger.warning(f"Rebuilding invalid index {index.name}")
+                                await conn.execute(
+                                    text(
+                                        f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}"
+                                    )
+                                )
+                            await conn.execute(
+                                self._create_index_ddl(
+                                    index, conn.dialect, concurrently=not partitioned
+                                )
+                            )
+                        except Exception as e:
+                            logger.error(
+                                f"Failed to create index {index.name}: {str(e)}"
+                            )
+            finally:
+                await conn.execute(
+                    text(
+                        "SELECT pg_advisory_unlock(hashtext('create_missing_indexes'))"
+                    )
+                )
+
+    async def _column_types(self, conn, table_name: str) -> Dict[str, str]:
+        """Map column names of a table to their information_schema data_type."""
+        result = await conn.execute(
+            text(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_schema = :schema AND table_name = :table"
+            ),
+            {"schema": self.schema, "table": table_name},
+        )
+        return {name: data_type.lower() for name, data_type in result.all()}
+
+    @staticmethod
+    def _declared_data_type(column, dialect) -> str:
+        """The information_schema data_type the model declares for a column."""
+        compiled = column.type.compile(dialect=dialect).lower()
+        return "array" if compiled.endswith("[]") else compiled
+
+    @staticmethod
+    def _create_index_ddl(index, dialect, concurrently: bool):
+        """Compile CREATE INDEX IF NOT EXISTS, optionally CONCURRENTLY."""
+        options = index.dialect_options["postgresql"]
+        declared = options["concurrently"]
+        options["concurrently"] = concurrently
+        try:
+            return text(
+                str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect))
+            )
+        finally:
+            # create_all runs in a transaction, where CONCURRENTLY is not allowed
+            options["concurrently"] = declared
+
+    async def create_partitions(self):
+        """
+        Create the partitions of range-partitioned tables that don't exist yet.
+
+        Each table gets one partition per month from the current month through
+        POSTGRES_PARTITION_MONTHS_AHEAD months ahead, plus a DEFAULT partition
+        so rows outside that window are never rejected. Rows the DEFAULT
+        partition already holds for a new month are moved into it; any failure
+        is raised rather than leaving the month without its partition.
+        """
+        this_month = utcnow().date().replace(day=1)
+
+        async with self.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text(f"SET search_path TO {self.schema}, public"))
+
+            for table in SQLModel.metadata.sorted_tables:
+                if not table.dialect_options["postgresql"]["partition_by"]:
+                    continue
+
+                # create_all leaves a table created before partitioning was
+                # declared as a plain table until it is rebuilt by hand
+                is_partitioned = (
+                    await conn.execute(
+                        text(
+                            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+                            "WHERE partrelid = to_regclass(:name))"
+                        ),
+                        {"name": table.name},
+                    )
+                ).scalar()
+                if not is_partitioned:
+                    logger.warning(
+                        f"Table {table.name} is declared partitioned but is a plain "
+                        f"table in the database; skipping partition creation"
+                    )
+                    continue
+
+                await conn.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {table.name}_default "
+                        f"PARTITION OF {table.name} DEFAULT"
+                    )
+                )
+                key = _partition_key(table)
+                for months_ahead in range(settings.POSTGRES_PARTITION_MONTHS_AHEAD + 1):
+                    start = _month_start(this_month, months_ahead)
+                    end = _month_start(this_month, months_ahead + 1)
+                    partition = f"{table.name}_{start:%Y_%m}"
+                    bounds = f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                    in_range = f"{key} >= '{start}' AND {key} < '{end}'"
+
+                    # PostgreSQL refuses to create a partition while the default
+                    # partition holds rows that belong in it
+                    in_default = (
+                        await conn.execute(
+                            text(
+                                f"SELECT to_regclass(:name) IS NULL AND EXISTS "
+                                f"(SELECT 1 FROM {table.name}_default WHERE {in_range})"
+                            ),
+                            {"name": partition},
+                        )
+                    ).scalar()
+                    if in_default:
+                        await self._create_partition_from_default(
+                            table.name, partition, bounds, in_range
+                        )
+                    else:
+                        await conn.execute(
+                            text(
+                                f"CREATE TABLE IF NOT EXISTS {partition} "
+                                f"PARTITION OF {table.name} {bounds}"
+                            )
+                        )
+
+    async def _create_partition_from_default(
+        self,
+        table_name: str,
+        partition: str,
+        bounds: str,
+        in_range: str,
+    ):
+        """
+        Create a partition for rows that were routed to the DEFAULT partition.
+
+        The default partition is detached while its rows for the new range are
+        moved through the parent table, all in one transaction, so concurrent
+        writers wait instead of seeing the rows missing.
+        """
+        logger.info(f"Moving rows from {table_name}_default into {partition}")
+        async with self.engine.begin() as conn:
+            await conn.execute(text(f"SET LOCAL search_path TO {self.schema}, public"))
+            await conn.execute(
+                text(f"ALTER TABLE {table_name} DETACH PARTITION {table_name}_default")
+            )
+            await conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {partition} "
+                    f"PARTITION OF {table_name} {bounds}"
+                )
+            )
+            await conn.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {table_name}_default "
+                    f"WHERE {in_range} RETURNING *) "
+                    f"INSERT INTO {table_name} SELECT * FROM moved"
+                )
+            )
+            await conn.execute(
+                text(
+                    f"ALTER TABLE {table_name} ATTACH PARTITION "
+                    f"{table_name}_default DEFAULT"
+                )
+            )
+
+    async def refresh_materialized_views(self):
+        """
+        Recompute the materialized views.
+
+        REFRESH ... CONCURRENTLY keeps the views readable while they are
+        rebuilt; like CREATE INDEX CONCURRENTLY it can't run in a transaction.
+        """
+        async with self.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text(f"SET search_path TO {self.schema}, public"))
+
+            for name, _ in MATERIALIZED_VIEWS:
+                await conn.execute(
+                    text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {name}")
+                )
+
+    async def run_maintenance_periodically(self, interval_seconds: int):
+        """
+        Refresh the materialized views and create upcoming partitions every
+        interval_seconds until cancelled.
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.refresh_materialized_views()
+            except Exception as e:
+                logger.error(f"Failed to refresh materialized views: {str(e)}")
+            try:
+                await self.create_partitions()
+            except Exception as e:
+                logger.error(f"Failed to create partitions: {str(e)}")
+
     async def _set_schema(self, session):
         """Set the search path to include our schema."""
         await session.execute(text(f"SET search_path TO {self.schema}, public"))
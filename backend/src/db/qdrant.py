@@ -5,15 +5,33 @@ This module provides a wrapper around the Qdrant client for vector similarity se
 It handles connection, collection management, and search operations.
 """
 
+import asyncio
 import os
 from typing import List, Dict, Any, Optional, Union
 import numpy as np
 import logging
 from qdrant_client import models
 from qdrant_client.async_qdrant_client import AsyncQdrantClient
+from src.core.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Qdrant's default size, in kilobytes, of unindexed vectors a segment holds
+# before HNSW indexing starts
+DEFAULT_INDEXING_THRESHOLD = 20000
+
+# Searches on int8-quantized collections rescore an oversampled candidate set
+# with the original float32 vectors to preserve recall
+QUANTIZED_SEARCH_PARAMS = models.SearchParams(
+    quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0)
+)
+
+# Searches on int8-quantized collections that return the quantized ranking as
+# is, for callers that rescore the candidates themselves
+QUANTIZED_CANDIDATE_PARAMS = models.SearchParams(
+    quantization=models.QuantizationSearchParams(rescore=False)
+)
+
 
 class QdrantClientWrapper:
     """Wrapper for Qdrant client with async operations"""
@@ -24,6 +42,7 @@ class QdrantClientWrapper:
         api_key: Optional[str] = None,
         prefer_grpc: bool = False,
         timeout: float = 10.0,
+        pool_size: Optional[int] = None,
     ):
         """Initialize Qdrant client connection parameters"""
         self.url = url or os.getenv("QDRANT_HOST", "localhost")
@@ -32,12 +51,17 @@ class QdrantClientWrapper:
             "QDRANT_PREFER_GRPC", ""
         ).lower() in ("true", "1", "yes")
         self.timeout = timeout
+        # Connections kept open to Qdrant, so concurrent requests don't queue
+        self.pool_size = pool_size or int(os.getenv("QDRANT_POOL_SIZE", "100"))
         self.client = None
 
         # Client will be initialized at application startup
 
     async def init_client(self):
         """Initialize the async Qdrant client"""
+        if self.client:
+            return True
+
         logger.info(f"Initializing Qdrant client connection to {self.url}")
 
         try:
@@ -47,6 +71,7 @@ class QdrantClientWrapper:
                 api_key=self.api_key,
                 timeout=self.timeout,
                 prefer_grpc=self.prefer_grpc,
+                pool_size=self.pool_size,
             )
 
             # Test the connection
@@ -62,12 +87,15 @@ class QdrantClientWrapper:
 
         except Exception as e:
             logger.error(f"Failed to connect to Qdrant: {str(e)}")
+            # Let the next call retry instead of reusing a half-initialized client
+            self.client = None
             raise
 
     async def close(self):
         """Close the Qdrant client connection"""
         if self.client:
             await self.client.close()
+            self.client = None
             logger.info("Qdrant client connection closed")
 
     async def init_collections(self):
@@ -76,7 +104,16 @@ class QdrantClientWrapper:
         collections_config = {
             "course_content": {
                 "vector_size": 1536,  # OpenAI embeddings dimension
-                "distance": models.Distance.COSINE,
+                # Course embeddings are L2-normalized before upsert, so the dot
+                # product equals cosine similarity
+                "distance": models.Distance.DOT,
+                # int8 scalar quantization keeps a 4x smaller copy of each
+                # vector in RAM for scoring
+                "quantization": models.ScalarQuantization(
+                    scalar=models.ScalarQuantizationConfig(
+                        type=models.ScalarType.INT8, quantile=0.99, always_ram=True
+                    )
+                ),
             },
             "student_profiles": {
                 "vector_size": 1536,
@@ -86,6 +123,10 @@ class QdrantClientWrapper:
                 "vector_size": 1536,
                 "distance": models.Distance.COSINE,
             },
+            "insights_cache": {
+                "vector_size": 1536,
+                "distance": models.Distance.COSINE,
+            },
         }
 
         # Get existing collections
@@ -104,7 +145,9 @@ class QdrantClientWrapper:
 
                 # Create collection
                 await self.client.create_collection(
-                    collection_name=collection_name, vectors_config=vector_params
+                    collection_name=collection_name,
+                    vectors_config=vector_params,
+                    quantization_config=config.get("quantization"),
                 )
 
                 # Define schema for collection
@@ -144,6 +187,18 @@ class QdrantClientWrapper:
                         field_schema=models.PayloadSchemaType.FLOAT,
                     )
 
+                elif collection_name == "insights_cache":
+                    await self.client.create_payload_index(
+                        collection_name=collection_name,
+                        field_name="scope",
+                        field_schema=models.PayloadSchemaType.KEYWORD,
+                    )
+                    await self.client.create_payload_index(
+                        collection_name=collection_name,
+                        field_name="created_ts",
+                        field_schema=models.PayloadSchemaType.FLOAT,
+                    )
+
                 logger.info(f"Collection '{collection_name}' created successfully")
             else:
                 logger.info(f"Collection '{collection_name}' already exists")
@@ -152,8 +207,9 @@ class QdrantClientWrapper:
         self,
         collection_name: str,
         vectors: List[np.ndarray],
-        ids: List[str],
+        ids: List[Union[int, str]],
         payloads: List[Dict[str, Any]],
+        wait: bool = True,
     ) -> bool:
         """
         Insert or update vectors in the collection
@@ -161,8 +217,9 @@ class QdrantClientWrapper:
         Args:
             collection_name: Name of the collection
             vectors: List of vector embeddings
-            ids: List of unique IDs for the vectors
+            ids: List of unique IDs for the vectors (unsigned integers or UUIDs)
             payloads: List of metadata payloads
+            wait: Whether to wait until the points are persisted and searchable
 
         Returns:
             bool: Success status
@@ -184,7 +241,7 @@ class QdrantClientWrapper:
 
             # Upsert vectors
             await self.client.upsert(
-                collection_name=collection_name, points=vector_data
+                collection_name=collection_name, points=vector_data, wait=wait
             )
 
             return True
@@ -193,12 +250,108 @@ class QdrantClientWrapper:
             logger.error(f"Failed to upsert vectors: {str(e)}")
             return False
 
+    async def get_indexing_threshold(self, collection_name: str) -> Optional[int]:
+        """
+        Get the indexing threshold a collection is configured with
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            Optional[int]: Threshold in kilobytes of vectors, or None on failure
+        """
+        if not self.client:
+            raise ValueError("Qdrant client not initialized")
+
+        try:
+            info = await self.client.get_collection(collection_name)
+            return info.config.optimizer_config.indexing_threshold
+
+        except Exception as e:
+            logger.error(
+                f"Failed to get indexing threshold of '{collection_name}': {str(e)}"
+            )
+            return None
+
+    async def set_indexing_threshold(
+        self, collection_name: str, indexing_threshold: int
+    ) -> bool:
+        """
+        Change how much unindexed vector data a segment holds before it is indexed
+
+        A threshold of 0 disables HNSW indexing, e.g. during bulk ingestion.
+
+        Args:
+            collection_name: Name of the collection
+            indexing_threshold: New threshold (in kilobytes of vectors)
+
+        Returns:
+            bool: Success status
+        """
+        if not self.client:
+            raise ValueError("Qdrant client not initialized")
+
+        try:
+            return await self.client.update_collection(
+                collection_name=collection_name,
+                optimizers_config=models.OptimizersConfigDiff(
+                    indexing_threshold=indexing_threshold
+                ),
+            )
+
+        except Exception as e:
+            logger.error(
+                f"Failed to update indexing threshold of '{collection_name}': {str(e)}"
+            )
+            return False
+
+    async def wait_for_collection(
+        self,
+        collection_name: str,
+        poll_interval: float = 0.5,
+        timeout: float = 300.0,
+    ) -> bool:
+        """
+        Wait until pending updates and optimizations of a collection finish
+
+        Args:
+            collection_name: Name of the collection
+            poll_interval: Seconds between status checks
+            timeout: Maximum seconds to wait
+
+        Returns:
+            bool: Whether the collection became ready before the timeout
+        """
+        if not self.client:
+            raise ValueError("Qdrant client not initialized")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        while True:
+            try:
+                info = await self.client.get_collection(collection_name)
+                if info.status == models.CollectionStatus.GREEN:
+                    return True
+            except Exception as e:
+                logger.error(f"Failed to get status of '{collection_name}': {str(e)}")
+                return False
+
+            if loop.time() >= deadline:
+                logger.warning(f"Timed out waiting for collection '{collection_name}'")
+                return False
+
+            await asyncio.sleep(poll_interval)
+
     async def search_similar(
         self,
         collection_name: str,
         query_vector: Union[List[float], np.ndarray],
         limit: int = 10,
         filter_condition: Optional[models.Filter] = None,
+        score_threshold: Optional[float] = None,
+        search_params: Optional[models.SearchParams] = None,
+        with_vectors: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Search for similar vectors in the collection
@@ -208,6 +361,9 @@ class QdrantClientWrapper:
             query_vector: Query embedding vector
             limit: Maximum number of results
             filter_condition: Optional filter condition
+            score_threshold: Optional minimum similarity score for results
+            search_params: Optional search parameters, e.g. quantization rescoring
+            with_vectors: Whether to include the stored vectors under "vector"
 
         Returns:
             List of search results with scores and payloads
@@ -226,7 +382,10 @@ class QdrantClientWrapper:
                 query_vector=query_vector,
                 limit=limit,
                 query_filter=filter_condition,
+                score_threshold=score_threshold,
+                search_params=search_params,
                 with_payload=True,
+                with_vectors=with_vectors,
             )
 
             # Format results
@@ -235,6 +394,8 @@ class QdrantClientWrapper:
                 results.append(
                     {"id": result.id, "score": result.score, **result.payload}
                 )
+                if with_vectors:
+                    results[-1]["vector"] = result.vector
 
             return results
 
@@ -242,11 +403,159 @@ class QdrantClientWrapper:
             logger.error(f"Failed to search similar vectors: {str(e)}")
             return []
 
+    async def query_batch_points(
+        self,
+        collection_name: str,
+        query_vectors: List[Union[List[float], np.ndarray]],
+        limit: int = 10,
+        filter_condition: Optional[models.Filter] = None,
+        search_params: Optional[models.SearchParams] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run several similarity searches in a single request
+
+        Args:
+            collection_name: Name of the collection
+            query_vectors: Query embedding vectors
+            limit: Maximum number of results per query
+            filter_condition: Optional filter condition applied to every query
+            search_params: Optional search parameters applied to every query
+
+        Returns:
+            One list of search results with scores and payloads per query vector
+        """
+        if not self.client:
+            raise ValueError("Qdrant client not initialized")
+
+        if not query_vectors:
+            return []
+
+        try:
+            responses = await self.client.query_batch_points(
+                collection_name=collection_name,
+                requests=[
+                    models.QueryRequest(
+                        query=vector.tolist()
+                        if isinstance(vector, np.ndarray)
+                        else vector,
+                        limit=limit,
+                        filter=filter_condition,
+                        params=search_params,
+                        with_payload=True,
+                    )
+                    for vector in query_vectors
+                ],
+            )
+
+            return [
+                [
+                    {"id": point.id, "score": point.score, **(point.payload or {})}
+                    for point in response.points
+                ]
+                for response in responses
+            ]
+
+        except Exception as e:
+            logger.error(f"Failed to run batched vector search: {str(e)}")
+            return [[] for _ in query_vectors]
+
+    async def retrieve_points(
+        self,
+        collection_name: str,
+        ids: List[Union[int, str]],
+        with_vectors: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch points by their IDs
+
+        Args:
+            collection_name: Name of the collection
+            ids: IDs of the points to fetch
+            with_vectors: Whether to include the stored vectors
+
+        Returns:
+            List of the points found, with their vectors and payloads
+        """
+        if not self.client:
+            raise ValueError("Qdrant client not initialized")
+
+        if not ids:
+            return []
+
+        try:
+            points = await self.client.retrieve(
+                collection_name=collection_name,
+                ids=ids,
+                with_payload=True,
+                with_vectors=with_vectors,
+            )
+
+            return [
+                {"id": point.id, "vector": point.vector, **(point.payload or {})}
+                for point in points
+            ]
+
+        except Exception as e:
+            logger.error(f"Failed to retrieve points: {str(e)}")
+            return []
+
+    async def retrieve_by_field(
+        self,
+        collection_name: str,
+        field_name: str,
+        values: List[Union[str, int]],
+        with_vectors: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch all points whose payload field matches any of the given values
+
+        Args:
+            collection_name: Name of the collection
+            field_name: Payload field to match on
+            values: Accepted values for the payload field
+            with_vectors: Whether to include the stored vectors
+
+        Returns:
+            List of points with their vectors and payloads
+        """
+        if not self.client:
+            raise ValueError("Qdrant client not initialized")
+
+        if not values:
+            return []
+
+        try:
+            # A single scroll request replaces one filtered search per value
+            points, _ = await self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key=field_name, match=models.MatchAny(any=values)
+                        )
+                    ]
+                ),
+                limit=len(values),
+                with_payload=True,
+                with_vectors=with_vectors,
+            )
+
+            return [
+                {"id": point.id, "vector": point.vector, **(point.payload or {})}
+                for point in points
+            ]
+
+        except Exception as e:
+            logger.error(f"Failed to retrieve points by {field_name}: {str(e)}")
+            return []
+
     async def search_similar_courses(
         self,
         query_vector: Union[List[float], np.ndarray],
         limit: int = 10,
         exclude_ids: Optional[List[int]] = None,
+        search_params: Optional[models.SearchParams] = None,
+        with_vectors: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Search for similar courses based on content embeddings
@@ -255,6 +564,9 @@ class QdrantClientWrapper:
             query_vector: Query embedding vector
             limit: Maximum number of results
             exclude_ids: Optional list of course IDs to exclude
+            search_params: Optional search parameters, defaults to
+                QUANTIZED_SEARCH_PARAMS
+            with_vectors: Whether to include the stored vectors under "vector"
 
         Returns:
             List of similar courses with similarity scores
@@ -276,6 +588,8 @@ class QdrantClientWrapper:
             query_vector=query_vector,
             limit=limit,
             filter_condition=filter_condition,
+            search_params=search_params or QUANTIZED_SEARCH_PARAMS,
+            with_vectors=with_vectors,
         )
 
     async def delete_by_course_id(self, collection_name: str, course_id: int) -> bool:
@@ -313,3 +627,17 @@ class QdrantClientWrapper:
         except Exception as e:
             logger.error(f"Failed to delete vectors for course {course_id}: {str(e)}")
             return False
+
+
+# Process-wide wrapper, so every caller shares one connection pool
+_qdrant_client: Optional[QdrantClientWrapper] = None
+
+
+def get_qdrant_client() -> QdrantClientWrapper:
+    """Return the shared Qdrant client wrapper, creating it on first use"""
+    global _qdrant_client
+    if _qdrant_client is None:
+        _qdrant_client = QdrantClientWrapper(
+            url=settings.QDRANT_HOST, api_key=settings.QDRANT_API_KEY
+        )
+    return _qdrant_client
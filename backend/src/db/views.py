@@ -0,0 +1,53 @@
+"""
+Materialized views over the model tables.
+
+Views are kept out of SQLModel.metadata so create_all never tries to create
+them as tables; PostgresDatabase creates them at startup and refreshes them
+periodically.
+"""
+
+from sqlalchemy import Column, DateTime, Float, Integer, MetaData, Table
+
+views_metadata = MetaData()
+
+# Per user and enrolled subject: activity totals over the subject's lessons
+USER_PROGRESS_SUMMARY_DDL = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS user_progress_summary AS
+SELECT
+    e.user_id,
+    e.subject_id,
+    COUNT(a.id) AS activity_count,
+    COALESCE(SUM(a.duration_seconds), 0) AS total_seconds,
+    MAX(a.start_time) AS last_activity_at,
+    AVG(a.mastery_level) AS mastery_avg
+FROM (SELECT DISTINCT user_id, subject_id FROM enrollment) e
+LEFT JOIN topic t ON t.subject_id = e.subject_id
+LEFT JOIN lesson l ON l.topic_id = t.id
+LEFT JOIN activity a ON a.lesson_id = l.id AND a.user_id = e.user_id
+GROUP BY e.user_id, e.subject_id
+"""
+
+# REFRESH ... CONCURRENTLY requires a unique index on the view
+USER_PROGRESS_SUMMARY_INDEX_DDL = """
+CREATE UNIQUE INDEX IF NOT EXISTS ix_user_progress_summary_user_subject
+ON user_progress_summary (user_id, subject_id)
+"""
+
+user_progress_summary = Table(
+    "user_progress_summary",
+    views_metadata,
+    Column("user_id", Integer, primary_key=True),
+    Column("subject_id", Integer, primary_key=True),
+    Column("activity_count", Integer),
+    Column("total_seconds", Integer),
+    Column("last_activity_at", DateTime),
+    Column("mastery_avg", Float),
+)
+
+# (view name, DDL statements creating it and its indexes)
+MATERIALIZED_VIEWS = [
+    (
+        "user_progress_summary",
+        [USER_PROGRESS_SUMMARY_DDL, USER_PROGRESS_SUMMARY_INDEX_DDL],
+    ),
+]
@@ -19,14 +19,14 @@ class NoteAIService:
 
     @staticmethod
     async def generate_suggestions(
-        note_id: str, db: AsyncSession, background_tasks: BackgroundTasks
+        note_id: uuid.UUID, db: AsyncSession, background_tasks: BackgroundTasks
     ):
         """Queue suggestion generation in the background to avoid blocking API response."""
         background_tasks.add_task(NoteAIService._generate_suggestions_task, note_id, db)
         return {"message": "Suggestion generation queued successfully"}
 
     @staticmethod
-    async def _generate_suggestions_task(note_id: str, db: AsyncSession):
+    async def _generate_suggestions_task(note_id: uuid.UUID, db: AsyncSession):
         """Background task to generate AI suggestions for a note."""
         # Get the note
         result = await db.execute(select(Note).where(Note.id == note_id))
@@ -65,7 +65,7 @@ class NoteAIService:
             if completion:
                 suggestions.append(
                     AISuggestion(
-                        id=str(uuid.uuid4()),
+                        id=uuid.uuid4(),
                         note_id=note_id,
                         content=completion,
                         type="completion",
@@ -77,7 +77,7 @@ class NoteAIService:
             if clarification:
                 suggestions.append(
                     AISuggestion(
-                        id=str(uuid.uuid4()),
+                        id=uuid.uuid4(),
                         note_id=note_id,
                         content=clarification,
                         type="clarification",
@@ -89,7 +89,7 @@ class NoteAIService:
             if connections:
                 suggestions.append(
                     AISuggestion(
-                        id=str(uuid.uuid4()),
+                        id=uuid.uuid4(),
                         note_id=note_id,
                         content=connections,
                         type="connection",
@@ -101,7 +101,7 @@ class NoteAIService:
             if insights:
                 suggestions.append(
                     AISuggestion(
-                        id=str(uuid.uuid4()),
+                        id=uuid.uuid4(),
                         note_id=note_id,
                         content=insights,
                         type="insight",
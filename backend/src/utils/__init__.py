@@ -1,13 +1,15 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from loguru import logger
+import asyncio
 import time
 import sys
 
+from src.db.models import configure_models
 from src.db.postgresql import postgres_db
-from src.db.qdrant import QdrantClientWrapper  # noqa: F401
+from src.db.qdrant import get_qdrant_client
 from src.core.ai.embeddings import EmbeddingModel  # noqa: F401
-from src.core.llm import LLM
+from src.core.llm import LLM, close_clients as close_llm_clients
 from src.core.settings import settings
 
 
@@ -32,6 +34,9 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting application in {settings.ENVIRONMENT} mode")
     logger.info(f"API Version: {app.version}")
 
+    # Import all models and resolve their relationships before any query
+    configure_models()
+
     # Startup: Initialize database connection
     logger.info("Starting up application and connecting to database...")
     try:
@@ -48,6 +53,13 @@ async def lifespan(app: FastAPI):
         app.state.db = postgres_db
         app.state.db_available = True
 
+        # Keep the dashboard rollups fresh and upcoming partitions in place
+        app.state.db_maintenance_task = asyncio.create_task(
+            postgres_db.run_maintenance_periodically(
+                settings.POSTGRES_VIEW_REFRESH_SECONDS
+            )
+        )
+
     except Exception as e:
         # Log detailed error information
         logger.error(f"Failed to initialize database: {str(e)}")
@@ -67,14 +79,10 @@ async def lifespan(app: FastAPI):
             )
             app.state.db_available = False
 
-    """
-    # Initialize Qdrant for vector database
+    # Initialize the shared Qdrant client for the vector database
     logger.info("Initializing Qdrant vector database connection...")
     try:
-        qdrant_client = QdrantClientWrapper(
-            url=settings.QDRANT_HOST,
-            api_key=settings.QDRANT_API_KEY,
-        )
+        qdrant_client = get_qdrant_client()
         await qdrant_client.init_client()
 
         # Add Qdrant client to app state
@@ -95,6 +103,7 @@ async def lifespan(app: FastAPI):
                 "Vector search features will not be available."
             )
 
+    """
     # Initialize Embedding Model
     logger.info("Initializing embedding model...")
     try:
@@ -160,6 +169,10 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down application and cleaning up resources...")
     shutdown_start = time.time()
 
+    # Stop the periodic database maintenance
+    if hasattr(app.state, "db_maintenance_task"):
+        app.state.db_maintenance_task.cancel()
+
     # Close Qdrant client if available
     if hasattr(app.state, "qdrant_client") and app.state.qdrant_available:
         try:
@@ -171,7 +184,7 @@ async def lifespan(app: FastAPI):
     # Close LLM client if available
     if hasattr(app.state, "llm_client") and app.state.llm_available:
         try:
-            await app.state.llm_client.close()
+            await close_llm_clients()
             logger.info("LLM client closed successfully")
         except Exception as e:
             logger.error(f"Error closing LLM client: {str(e)}")
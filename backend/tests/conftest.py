@@ -1,17 +1,23 @@
+import asyncio
 import pytest
 from typing import Any, Dict
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
 from src.main import app as main_app
 from src.db import get_session
+from src.db.models import configure_models
 
 # Import all models to ensure they're registered with SQLModel
+configure_models()
 
 # Test database settings
 TEST_DATABASE_URL = "sqlite:///:memory:"
+TEST_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 
 @pytest.fixture(name="engine")
@@ -27,6 +33,29 @@ def engine_fixture():
     SQLModel.metadata.drop_all(engine)
 
 
+@pytest.fixture(name="async_engine")
+def async_engine_fixture():
+    """Create an in-memory SQLite test database engine for async code."""
+    engine = create_async_engine(
+        TEST_ASYNC_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # Enforce foreign keys like PostgreSQL does
+    @event.listens_for(engine.sync_engine, "connect")
+    def enable_foreign_keys(connection, _):
+        connection.execute("PRAGMA foreign_keys=ON")
+
+    async def create_all():
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    asyncio.run(create_all())
+    yield engine
+    asyncio.run(engine.dispose())
+
+
 @pytest.fixture(name="session")
 def session_fixture(engine):
     """Create a new database session for each test."""
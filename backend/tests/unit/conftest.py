@@ -3,21 +3,14 @@ from datetime import datetime, timedelta
 from typing import List
 
 from sqlmodel import Session
-from passlib.context import CryptContext
 
 from src.db.models.user import User, Guardian
 from src.db.models.content import Subject, Topic, Lesson
-from src.db.models.progress import Enrollment, Activity, TutoringSession
+from src.db.models.progress import Enrollment, Activity
+from src.db.models.tutoring import TutoringSession
 from src.db.models.tutoring import TutoringExchange
 from src.db.models.recommendations import Recommendation
-
-# Setup password handling
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def get_password_hash(password: str) -> str:
-    """Generate password hash."""
-    return pwd_context.hash(password)
+from src.core.security import get_password_hash
 
 
 @pytest.fixture
@@ -0,0 +1,141 @@
+# backend/tests/unit/test_analytics_engine.py
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.core.ai.analytics_engine import AnalyticsEngine
+
+
+class FakeQdrantClient:
+    """Records retrieve_by_field calls and serves points from memory."""
+
+    def __init__(self, points):
+        self.client = object()
+        self.points = points
+        self.requests = []
+
+    async def retrieve_by_field(self, collection_name, field_name, values):
+        self.requests.append(list(values))
+        return [p for p in self.points if p[field_name] in values]
+
+
+@pytest.fixture
+def engine() -> AnalyticsEngine:
+    return AnalyticsEngine()
+
+
+def _session(session_id: str, topic_id: int = 1):
+    return SimpleNamespace(
+        id=session_id,
+        topic_id=topic_id,
+        topic_name="Algebra",
+        initial_query="How do I solve quadratic equations?",
+    )
+
+
+def test_session_embeddings_are_cached_as_uint8(engine: AnalyticsEngine):
+    """Test that fetched embeddings are cached quantized and dequantized on reuse."""
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(3, 16)).astype(np.float32)
+    engine.qdrant_client = FakeQdrantClient(
+        [
+            {"session_id": f"s{i}", "vector": vector.tolist()}
+            for i, vector in enumerate(vectors)
+        ]
+    )
+    sessions = [_session(f"s{i}") for i in range(3)]
+
+    first = asyncio.run(engine.fetch_session_embeddings(sessions[:2]))
+    second = asyncio.run(engine.fetch_session_embeddings(sessions))
+
+    # Only sessions missing from the cache are fetched
+    assert engine.qdrant_client.requests == [["s0", "s1"], ["s2"]]
+    assert [e["id"] for e in second] == ["s0", "s1", "s2"]
+    assert engine._embedding_cache["s0"][1].dtype == np.uint8
+
+    # Dequantized vectors stay within half a quantization step of the originals
+    for embeddings in (first, second):
+        for embedding in embeddings:
+            original = vectors[int(embedding["id"][1:])]
+            step = (original.max() - original.min()) / 255
+            assert embedding["embedding"].dtype == np.float32
+            np.testing.assert_allclose(
+                embedding["embedding"], original, atol=step / 2 + 1e-6
+            )
+
+
+def test_sessions_without_embeddings_are_skipped(engine: AnalyticsEngine):
+    """Test that sessions with no stored vector are left out."""
+    engine.qdrant_client = FakeQdrantClient([])
+
+    assert asyncio.run(engine.fetch_session_embeddings([_session("s0")])) == []
+
+
+def test_projection_reprojects_sessions_whose_text_changed(engine: AnalyticsEngine):
+    """Test that cached coordinates are only reused for unchanged session text."""
+    texts = [
+        "quadratic equations and the discriminant",
+        "photosynthesis in plant cells",
+        "newton laws of motion and forces",
+        "french revolution causes and outcomes",
+    ]
+    session_ids = [f"s{i}" for i in range(len(texts))]
+    cache_key = ("user", 1)
+
+    first = engine._project_session_texts(cache_key, session_ids, texts)
+    again = engine._project_session_texts(cache_key, session_ids, texts)
+    np.testing.assert_array_equal(first, again)
+
+    # s0 gained exchanges about a different topic since it was projected
+    changed = [texts[2]] + texts[1:]
+    coords = engine._project_session_texts(cache_key, session_ids, changed)
+
+    np.testing.assert_array_equal(coords[1:], first[1:])
+    np.testing.assert_allclose(coords[0], first[2])
+
+
+def test_unique_sparse_rows_finds_duplicates():
+    """Test that identical CSR rows map to the first occurrence."""
+    matrix = TfidfVectorizer().fit_transform(
+        ["derivatives", "integrals", "derivatives", "", "integrals", ""]
+    )
+
+    unique_rows, inverse = AnalyticsEngine._unique_sparse_rows(matrix)
+
+    assert unique_rows.tolist() == [0, 1, 3]
+    assert inverse.tolist() == [0, 1, 0, 2, 1, 2]
+    np.testing.assert_array_equal(
+        matrix[unique_rows].toarray()[inverse], matrix.toarray()
+    )
+
+
+def test_repeated_session_texts_share_coordinates(engine: AnalyticsEngine):
+    """Test that sessions with identical text are projected to the same point."""
+    texts = [
+        "thanks",
+        "quadratic equations and the discriminant",
+        "thanks",
+        "photosynthesis in plant cells",
+        "newton laws of motion and forces",
+        "thanks",
+    ]
+
+    coords = engine._project_session_texts(None, [f"s{i}" for i in range(6)], texts)
+
+    assert coords.shape == (6, 3)
+    np.testing.assert_array_equal(coords[0], coords[2])
+    np.testing.assert_array_equal(coords[0], coords[5])
+    assert len({tuple(row) for row in coords}) == 4
+
+
+def test_projection_falls_back_with_few_distinct_texts(engine: AnalyticsEngine):
+    """Test that fewer distinct texts than components still project every session."""
+    texts = ["limits and continuity", "vector spaces", "limits and continuity"]
+
+    coords = engine._project_session_texts(None, ["s0", "s1", "s2"], texts)
+
+    assert coords.shape == (3, 3)
+    np.testing.assert_allclose(coords[0], coords[2], atol=1e-12)
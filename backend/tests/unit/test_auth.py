@@ -1,12 +1,13 @@
 # backend/tests/unit/test_auth.py
 from datetime import datetime, timedelta
 
-from jose import jwt
-from passlib.context import CryptContext
+import bcrypt
+import jwt
 
-from src.api.endpoints.auth import (
+from src.core.security import (
     get_password_hash,
     verify_password,
+    verify_and_update_password,
     create_access_token,
 )
 from src.core.settings import settings
@@ -14,8 +15,6 @@ from src.core.settings import settings
 
 def test_password_hashing():
     """Test that password hashing works correctly."""
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")  # noqa: F841
-
     # Test password hashing
     raw_password = "testpassword123"
     hashed_password = get_password_hash(raw_password)
@@ -28,6 +27,25 @@ def test_password_hashing():
     assert verify_password("wrongpassword", hashed_password) is False
 
 
+def test_bcrypt_password_is_rehashed_with_argon2():
+    """Test that a legacy bcrypt hash verifies and is replaced by argon2."""
+    raw_password = "testpassword123"
+    bcrypt_hash = bcrypt.hashpw(raw_password.encode(), bcrypt.gensalt()).decode()
+
+    # The legacy hash still verifies, and a replacement hash is returned
+    is_valid, new_hash = verify_and_update_password(raw_password, bcrypt_hash)
+    assert is_valid is True
+    assert new_hash is not None
+    assert new_hash.startswith("$argon2")
+    assert verify_password(raw_password, new_hash) is True
+
+    # A current argon2 hash needs no replacement
+    assert verify_and_update_password(raw_password, new_hash) == (True, None)
+
+    # A wrong password is rejected without a replacement hash
+    assert verify_and_update_password("wrongpassword", bcrypt_hash) == (False, None)
+
+
 def test_access_token_creation():
     """Test that JWT token creation works correctly."""
     # Create a token with test data
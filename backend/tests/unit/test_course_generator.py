@@ -0,0 +1,170 @@
+# backend/tests/unit/test_course_generator.py
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from src.api.endpoints import course_generator
+from src.api.endpoints.course_generator import CourseGenerator, active_sessions
+from src.db.models.course_generation import (
+    CourseGenerationMessage,
+    CourseGenerationSession,
+    SessionId,
+)
+from src.db.models.user import User
+from src.db.postgresql import postgres_db
+
+
+@pytest.fixture(autouse=True)
+def stored_sessions(async_engine, monkeypatch):
+    """Back postgres_db.get_session with the async test database."""
+
+    @asynccontextmanager
+    async def get_test_session():
+        async with AsyncSession(async_engine) as session:
+            yield session
+
+    monkeypatch.setattr(postgres_db, "get_session", get_test_session)
+    yield
+    active_sessions.clear()
+
+
+async def _create_user(engine) -> int:
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        user = User(
+            email="professor@example.com",
+            username="professor",
+            full_name="Professor",
+            hashed_password="hashed_password",
+            user_type="professor",
+        )
+        db.add(user)
+        await db.commit()
+        return user.id
+
+
+async def _stored_messages(engine, session_id: str):
+    async with AsyncSession(engine) as db:
+        result = await db.execute(
+            select(CourseGenerationMessage)
+            .where(CourseGenerationMessage.session_id == session_id)
+            .order_by(CourseGenerationMessage.id)
+        )
+        return [(m.role, m.content) for m in result.scalars().all()]
+
+
+def test_started_generation_stores_its_messages(async_engine):
+    """Test that messages of a generation started via /start are stored."""
+    session_id = f"course-gen-{uuid.uuid4()}"
+
+    async def run():
+        user_id = await _create_user(async_engine)
+
+        async with AsyncSession(async_engine) as db:
+            await CourseGenerator.start_generation(
+                session_id,
+                str(user_id),
+                {"subject_area": "Physics", "education_level": "university"},
+                BackgroundTasks(),
+                db,
+            )
+
+        # Messages are queued and written at the next status checkpoint
+        await CourseGenerator.add_message(session_id, "assistant", "First draft")
+        assert await _stored_messages(async_engine, session_id) == []
+
+        await CourseGenerator.update_status(session_id, "structuring", 30, "Next")
+        return await _stored_messages(async_engine, session_id)
+
+    assert asyncio.run(run()) == [("assistant", "First draft")]
+    assert active_sessions[session_id]["pending_messages"] == []
+
+
+def test_messages_without_a_session_row_are_dropped(async_engine):
+    """Test that a batch failing its foreign key isn't re-queued forever."""
+    session_id = f"course-gen-{uuid.uuid4()}"
+    active_sessions[session_id] = {"messages": [], "pending_messages": []}
+
+    async def run():
+        await CourseGenerator.add_message(session_id, "assistant", "Orphan")
+        await CourseGenerator.flush_messages(session_id)
+        return await _stored_messages(async_engine, session_id)
+
+    assert asyncio.run(run()) == []
+    assert active_sessions[session_id]["pending_messages"] == []
+
+
+def test_failed_flushes_keep_a_bounded_queue(async_engine, monkeypatch):
+    """Test that messages are re-queued on transient errors, up to the cap."""
+    session_id = f"course-gen-{uuid.uuid4()}"
+    active_sessions[session_id] = {"messages": [], "pending_messages": []}
+
+    @asynccontextmanager
+    async def unavailable_session():
+        raise ConnectionError("database unavailable")
+        yield
+
+    monkeypatch.setattr(postgres_db, "get_session", unavailable_session)
+    monkeypatch.setattr(course_generator, "MAX_PENDING_MESSAGES", 3)
+
+    async def run():
+        for i in range(5):
+            await CourseGenerator.add_message(session_id, "assistant", f"msg {i}")
+            await CourseGenerator.flush_messages(session_id)
+
+    asyncio.run(run())
+    pending = active_sessions[session_id]["pending_messages"]
+    assert [m["content"] for m in pending] == ["msg 2", "msg 3", "msg 4"]
+
+
+def test_session_ids_bind_as_uuids():
+    """Test that "course-gen-<uuid>" ids are stored as bare uuids and back."""
+    session_uuid = uuid.uuid4()
+    session_id = SessionId()
+    dialect = postgresql.dialect()
+
+    bound = session_id.process_bind_param(f"course-gen-{session_uuid}", dialect)
+    assert bound == session_uuid
+    assert session_id.process_bind_param(str(session_uuid), dialect) == session_uuid
+    assert (
+        session_id.process_result_value(session_uuid, dialect)
+        == f"course-gen-{session_uuid}"
+    )
+
+    # Malformed ids compare against NULL instead of raising
+    assert session_id.process_bind_param("course-gen-not-a-uuid", dialect) is None
+    assert session_id.process_bind_param(None, dialect) is None
+
+
+def test_sessions_are_loaded_by_their_prefixed_id(async_engine):
+    """Test that a stored session round-trips and malformed ids find nothing."""
+    session_uuid = uuid.uuid4()
+    session_id = f"course-gen-{session_uuid}"
+
+    async def run():
+        user_id = await _create_user(async_engine)
+        async with AsyncSession(async_engine) as db:
+            await CourseGenerator.ensure_session_record(
+                session_id, str(user_id), {"subjectArea": "Chemistry"}, db
+            )
+
+        async with AsyncSession(async_engine) as db:
+            stored = (
+                await db.execute(text("SELECT id FROM course_generation_session"))
+            ).scalar_one()
+            session = await db.get(CourseGenerationSession, session_id)
+            missing = await db.get(CourseGenerationSession, "course-gen-garbage")
+            return stored, session, missing
+
+    stored, session, missing = asyncio.run(run())
+
+    assert stored == session_uuid.hex
+    assert session.id == session_id
+    assert session.subject == "Chemistry"
+    assert missing is None
@@ -0,0 +1,140 @@
+# backend/tests/unit/test_embeddings.py
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.core.ai.embeddings import EmbeddingModel
+
+
+class HangingEmbeddingsClient:
+    """OpenAI client stand-in whose embedding requests never complete."""
+
+    def __init__(self):
+        self.embeddings = SimpleNamespace(create=self.create)
+        self.requests = []
+        self.closed = False
+
+    async def create(self, model, input, encoding_format):
+        self.requests.append(list(input))
+        await asyncio.Event().wait()
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def model() -> EmbeddingModel:
+    return EmbeddingModel(
+        model_name="test-embedding", api_key="test-key", embedding_dimension=4
+    )
+
+
+def test_close_fails_in_flight_requests(model: EmbeddingModel):
+    """Test that requests already sent to the API fail when the model closes."""
+    client = HangingEmbeddingsClient()
+    model.client = client
+
+    async def run():
+        model._start_batch_worker()
+        requests = [
+            asyncio.create_task(model.generate_embedding(text))
+            for text in ("first", "second")
+        ]
+        while not client.requests:
+            await asyncio.sleep(0)
+
+        await model.close()
+        return await asyncio.gather(*requests, return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert client.requests == [["first", "second"]]
+    assert [str(result) for result in results] == ["Embedding model closed"] * 2
+    assert client.closed
+    assert model.client is None
+    assert not model._inflight_batches
+
+
+def test_close_fails_queued_requests(model: EmbeddingModel):
+    """Test that texts still waiting in the queue fail when the model closes."""
+    model.client = HangingEmbeddingsClient()
+
+    async def run():
+        # No worker is running, so the text stays queued
+        model._queue = asyncio.Queue()
+        future = asyncio.get_running_loop().create_future()
+        model._queue.put_nowait(("queued", future))
+
+        await model.close()
+        return future.exception()
+
+    assert str(asyncio.run(run())) == "Embedding model closed"
+    assert model._queue is None
+
+
+def test_embeddings_are_normalized_to_unit_length():
+    """Test that normalize_embeddings yields unit rows and keeps zero rows zero."""
+    embeddings = np.array([[3.0, 4.0], [0.0, 0.0], [-2.0, 0.0]])
+
+    normalized = EmbeddingModel.normalize_embeddings(embeddings)
+
+    assert normalized.dtype == np.float32
+    np.testing.assert_allclose(normalized, [[0.6, 0.8], [0.0, 0.0], [-1.0, 0.0]])
+    np.testing.assert_allclose(
+        EmbeddingModel.normalize_embeddings(np.array([0.0, 5.0])), [0.0, 1.0]
+    )
+
+
+def test_pairwise_similarity_matches_cosine_similarity(model: EmbeddingModel):
+    """Test that the batched similarity agrees with the single-pair version."""
+    rng = np.random.default_rng(0)
+    queries = rng.normal(size=(3, 8)).astype(np.float32)
+    candidates = rng.normal(size=(5, 8)).astype(np.float32)
+
+    scores = EmbeddingModel.pairwise_cosine_similarity(queries, candidates)
+
+    assert scores.shape == (3, 5)
+    expected = [[model.cosine_similarity(q, c) for c in candidates] for q in queries]
+    np.testing.assert_allclose(scores, expected, rtol=1e-5)
+
+
+def test_find_most_similar_ranks_candidates(model: EmbeddingModel):
+    """Test that candidates come back sorted by similarity, ties in input order."""
+    query = np.array([1.0, 0.0])
+    candidates = [
+        np.array([0.0, 1.0]),
+        np.array([2.0, 0.0]),
+        np.array([1.0, 1.0]),
+        np.array([5.0, 0.0]),
+    ]
+
+    ranked = asyncio.run(model.find_most_similar(query, candidates))
+
+    assert [r["index"] for r in ranked] == [1, 3, 2, 0]
+    np.testing.assert_allclose(
+        [r["similarity"] for r in ranked], [1.0, 1.0, np.sqrt(0.5), 0.0], atol=1e-6
+    )
+
+
+def test_find_most_similar_top_k(model: EmbeddingModel):
+    """Test that top_k keeps the k best candidates, including pre-normalized ones."""
+    rng = np.random.default_rng(1)
+    query = rng.normal(size=8)
+    candidates = rng.normal(size=(20, 8))
+
+    ranked = asyncio.run(model.find_most_similar(query, candidates))
+    top = asyncio.run(model.find_most_similar(query, candidates, top_k=5))
+    normalized = asyncio.run(
+        model.find_most_similar(
+            query,
+            EmbeddingModel.normalize_embeddings(candidates),
+            top_k=5,
+            normalized=True,
+        )
+    )
+
+    assert [r["index"] for r in top] == [r["index"] for r in ranked[:5]]
+    assert [r["index"] for r in normalized] == [r["index"] for r in top]
+    assert asyncio.run(model.find_most_similar(query, [])) == []
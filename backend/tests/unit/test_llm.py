@@ -0,0 +1,144 @@
+# backend/tests/unit/test_llm.py
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.core import llm as llm_module
+from src.core.llm import LLM, LLMConfig, Message, SemanticCache
+
+
+class FakeCompletions:
+    """Chat completions stand-in that numbers its responses."""
+
+    def __init__(self):
+        self.requests = []
+
+    async def create(self, **kwargs):
+        self.requests.append(kwargs["messages"])
+        content = f"response {len(self.requests)}"
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+        )
+
+
+class FakeSemanticCache(SemanticCache):
+    """Semantic cache with fixed embeddings instead of an embedding model."""
+
+    def __init__(self, embeddings):
+        super().__init__(threshold=0.9)
+        self.embeddings = embeddings
+
+    async def embed(self, text):
+        return self.embedding_model.normalize_embeddings(self.embeddings[text])
+
+
+@pytest.fixture
+def llm(monkeypatch) -> LLM:
+    monkeypatch.setattr(llm_module, "_exact_cache", llm_module.OrderedDict())
+    monkeypatch.setattr(llm_module, "_semantic_cache", None)
+    model = LLM("openai")
+    model.client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+    return model
+
+
+def _requests(model: LLM):
+    return model.client.chat.completions.requests
+
+
+def test_semantic_cache_serves_reworded_questions(llm: LLM, monkeypatch):
+    """Test that a near-identical final message reuses the cached response."""
+    monkeypatch.setattr(
+        llm_module,
+        "_semantic_cache",
+        FakeSemanticCache(
+            {
+                "What is a derivative?": np.array([1.0, 0.0, 0.1]),
+                "What's a derivative?": np.array([1.0, 0.0, 0.12]),
+                "What is an integral?": np.array([0.0, 1.0, 0.0]),
+            }
+        ),
+    )
+    config = LLMConfig(model="gpt-4o-mini", semantic_cache=True)
+
+    async def ask(question):
+        return await llm.generate([Message(role="user", content=question)], config)
+
+    assert asyncio.run(ask("What is a derivative?")) == "response 1"
+    assert asyncio.run(ask("What's a derivative?")) == "response 1"
+    assert asyncio.run(ask("What is an integral?")) == "response 2"
+    assert len(_requests(llm)) == 2
+
+
+def test_semantic_cache_is_scoped_to_the_conversation():
+    """Test that earlier messages and the config are part of the cache scope."""
+    question = Message(role="user", content="Explain it again")
+    config = LLMConfig(model="gpt-4o-mini", semantic_cache=True)
+
+    physics = SemanticCache.scope(
+        llm_module.LLMProvider.OPENAI,
+        [Message(role="system", content="Physics tutor"), question],
+        config,
+    )
+    history = SemanticCache.scope(
+        llm_module.LLMProvider.OPENAI,
+        [Message(role="system", content="History tutor"), question],
+        config,
+    )
+    warmer = SemanticCache.scope(
+        llm_module.LLMProvider.OPENAI,
+        [Message(role="system", content="Physics tutor"), question],
+        config.model_copy(update={"temperature": 1.0}),
+    )
+
+    assert len({physics, history, warmer}) == 3
+
+
+def test_semantic_cache_is_only_built_on_opt_in(llm: LLM):
+    """Test that requests without semantic_cache don't set up embeddings."""
+    config = LLMConfig(model="gpt-4o-mini")
+
+    asyncio.run(llm.generate([Message(role="user", content="Hi")], config))
+
+    assert llm_module._semantic_cache is None
+
+
+def test_deterministic_requests_are_cached_exactly(llm: LLM):
+    """Test that identical temperature 0 requests are only sent once."""
+    config = LLMConfig(model="gpt-4o-mini", temperature=0)
+
+    async def ask(question):
+        return await llm.generate([Message(role="user", content=question)], config)
+
+    assert asyncio.run(ask("Define velocity")) == "response 1"
+    assert asyncio.run(ask("Define velocity")) == "response 1"
+    assert asyncio.run(ask("Define acceleration")) == "response 2"
+    assert len(_requests(llm)) == 2
+
+
+def test_sampled_requests_are_not_cached(llm: LLM):
+    """Test that requests with a positive temperature always reach the API."""
+    config = LLMConfig(model="gpt-4o-mini", temperature=0.7)
+    messages = [Message(role="user", content="Write a poem about vectors")]
+
+    first = asyncio.run(llm.generate(messages, config))
+    second = asyncio.run(llm.generate(messages, config))
+
+    assert (first, second) == ("response 1", "response 2")
+    assert not llm_module._exact_cache
+
+
+def test_exact_cache_evicts_least_recently_used(llm: LLM, monkeypatch):
+    """Test that the exact cache keeps at most EXACT_CACHE_MAXSIZE responses."""
+    monkeypatch.setattr(llm_module, "EXACT_CACHE_MAXSIZE", 2)
+    config = LLMConfig(model="gpt-4o-mini", temperature=0)
+
+    async def ask(question):
+        return await llm.generate([Message(role="user", content=question)], config)
+
+    for question in ("a", "b", "a", "c", "a", "b"):
+        asyncio.run(ask(question))
+
+    # "b" was evicted by "c" while "a" stayed recently used
+    assert [m[0]["content"] for m in _requests(llm)] == ["a", "b", "c", "b"]
@@ -0,0 +1,110 @@
+# backend/tests/unit/test_notes.py
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.endpoints.notes import get_note
+from src.db.models.notes import Note, NoteCollaborator, NoteRenderCache
+from src.db.models.user import User
+
+
+def _user(name: str) -> User:
+    return User(
+        email=f"{name}@example.com",
+        username=name,
+        full_name=name.title(),
+        hashed_password="hashed_password",
+        user_type="student",
+    )
+
+
+@pytest.fixture
+def note_setup(async_engine):
+    """Create an owner, a collaborator and a note shared between them."""
+
+    async def create():
+        async with AsyncSession(async_engine, expire_on_commit=False) as db:
+            owner, collaborator = _user("owner"), _user("collaborator")
+            db.add_all([owner, collaborator])
+            await db.commit()
+
+            note = Note(title="Limits", content="Epsilon-delta", owner_id=owner.id)
+            db.add(note)
+            await db.commit()
+            return owner, collaborator, note.id
+
+    return asyncio.run(create())
+
+
+async def _read_note(engine, note_id, user):
+    async with AsyncSession(engine) as db:
+        return await get_note(note_id=note_id, current_user=user, db=db)
+
+
+async def _cache_entry(engine, note_id):
+    async with AsyncSession(engine) as db:
+        return await db.get(NoteRenderCache, note_id)
+
+
+def test_rendered_note_is_served_from_cache(async_engine, note_setup):
+    """Test that a second read returns the stored payload."""
+    owner, _, note_id = note_setup
+
+    async def run():
+        first = await _read_note(async_engine, note_id, owner)
+        entry = await _cache_entry(async_engine, note_id)
+        assert entry.version == 0
+        assert entry.payload == first
+
+        # Mark the stored payload to prove the next read doesn't re-render
+        async with AsyncSession(async_engine) as db:
+            entry = await db.get(NoteRenderCache, note_id)
+            entry.payload = {**entry.payload, "title": "From cache"}
+            await db.commit()
+        return await _read_note(async_engine, note_id, owner)
+
+    assert asyncio.run(run())["title"] == "From cache"
+
+
+def test_cached_note_is_invalidated_by_changes(async_engine, note_setup):
+    """Test that note, collaborator and user changes re-render the note."""
+    owner, collaborator, note_id = note_setup
+
+    async def run():
+        await _read_note(async_engine, note_id, owner)
+
+        async with AsyncSession(async_engine) as db:
+            db.add(
+                NoteCollaborator(
+                    note_id=note_id, user_id=collaborator.id, permissions="read"
+                )
+            )
+            await db.commit()
+        shared = await _read_note(async_engine, note_id, owner)
+
+        async with AsyncSession(async_engine) as db:
+            user = await db.get(User, collaborator.id)
+            user.full_name = "Renamed Collaborator"
+            await db.commit()
+        renamed = await _read_note(async_engine, note_id, owner)
+
+        async with AsyncSession(async_engine) as db:
+            note = await db.get(Note, note_id)
+            note.title = "Continuity"
+            await db.commit()
+        retitled = await _read_note(async_engine, note_id, owner)
+
+        entry = await _cache_entry(async_engine, note_id)
+        return shared, renamed, retitled, entry
+
+    shared, renamed, retitled, entry = asyncio.run(run())
+
+    assert shared["is_shared"] is True
+    assert renamed["collaborators"][0]["name"] == "Renamed Collaborator"
+    assert retitled["title"] == "Continuity"
+    assert entry.version == 3
+    assert entry.payload == retitled
+
+    # Cache invalidation leaves the user-visible version alone
+    assert shared["version"] == renamed["version"] == retitled["version"] == 1
@@ -0,0 +1,200 @@
+# backend/tests/unit/test_postgresql.py
+import asyncio
+from contextlib import asynccontextmanager
+
+from sqlalchemy import create_mock_engine
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from src.db import postgresql
+from src.db.models.progress import Activity
+from src.db.models.timestamps import utcnow
+from src.db.postgresql import _month_start, postgres_db
+
+
+class RecordingConnection:
+    """Records executed SQL and answers scalar queries from a callback."""
+
+    dialect = asyncpg_dialect()
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.statements = []
+
+    async def execution_options(self, **options):
+        return self
+
+    async def execute(self, statement, parameters=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        return _Result(self.answer(sql, parameters or {}))
+
+
+class _Result:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+    def scalars(self):
+        return self.value or []
+
+    def all(self):
+        return self.value or []
+
+
+class RecordingEngine:
+    def __init__(self, connection):
+        self.connection = connection
+
+    @asynccontextmanager
+    async def connect(self):
+        yield self.connection
+
+    @asynccontextmanager
+    async def begin(self):
+        yield self.connection
+
+
+def _months():
+    this_month = utcnow().date().replace(day=1)
+    return [_month_start(this_month, months_ahead) for months_ahead in range(2)]
+
+
+def test_partitions_are_created_for_upcoming_months(monkeypatch):
+    """Test that each upcoming month gets its own partition next to DEFAULT."""
+    connection = RecordingConnection(lambda sql, params: "pg_partitioned_table" in sql)
+    monkeypatch.setattr(postgres_db, "engine", RecordingEngine(connection))
+    monkeypatch.setattr(postgresql.settings, "POSTGRES_PARTITION_MONTHS_AHEAD", 1)
+
+    asyncio.run(postgres_db.create_partitions())
+
+    created = [sql for sql in connection.statements if sql.startswith("CREATE")]
+    assert created == [
+        "CREATE TABLE IF NOT EXISTS activity_default PARTITION OF activity DEFAULT",
+        *(
+            f"CREATE TABLE IF NOT EXISTS activity_{start:%Y_%m} PARTITION OF "
+            f"activity FOR VALUES FROM ('{start}') TO ('{_month_start(start, 1)}')"
+            for start in _months()
+        ),
+    ]
+    assert not any("DETACH" in sql for sql in connection.statements)
+
+
+def test_default_partition_rows_move_to_the_new_partition(monkeypatch):
+    """Test that rows already in DEFAULT for a month are moved, not left there."""
+    this_month = _months()[0]
+
+    def answer(sql, params):
+        if "pg_partitioned_table" in sql:
+            return True
+        if "to_regclass" in sql:
+            # Only the current month has rows waiting in the default partition
+            return params["name"] == f"activity_{this_month:%Y_%m}"
+        return None
+
+    connection = RecordingConnection(answer)
+    monkeypatch.setattr(postgres_db, "engine", RecordingEngine(connection))
+    monkeypatch.setattr(postgresql.settings, "POSTGRES_PARTITION_MONTHS_AHEAD", 1)
+
+    asyncio.run(postgres_db.create_partitions())
+
+    statements = connection.statements
+    detach = statements.index("ALTER TABLE activity DETACH PARTITION activity_default")
+    assert statements[detach + 1].startswith(
+        f"CREATE TABLE IF NOT EXISTS activity_{this_month:%Y_%m} PARTITION OF"
+    )
+    assert statements[detach + 2] == (
+        "WITH moved AS (DELETE FROM activity_default "
+        f"WHERE start_time >= '{this_month}' "
+        f"AND start_time < '{_month_start(this_month, 1)}' RETURNING *) "
+        "INSERT INTO activity SELECT * FROM moved"
+    )
+    assert statements[detach + 3] == (
+        "ALTER TABLE activity ATTACH PARTITION activity_default DEFAULT"
+    )
+    assert sum("DETACH" in sql for sql in statements) == 1
+
+
+def test_activity_ids_default_to_the_sequence_on_postgresql():
+    """Test that activity.id gets a nextval() server default on PostgreSQL."""
+    statements = []
+    engine = create_mock_engine(
+        "postgresql+asyncpg://",
+        lambda sql, *args, **kwargs: statements.append(
+            str(sql.compile(dialect=engine.dialect))
+        ),
+    )
+
+    Activity.__table__.create(engine, checkfirst=False)
+
+    assert any(sql.startswith("CREATE SEQUENCE activity_id_seq") for sql in statements)
+    assert (
+        "ALTER TABLE activity ALTER COLUMN id SET DEFAULT nextval('activity_id_seq')"
+        in statements
+    )
+
+
+def _index_statements(monkeypatch, answer):
+    connection = RecordingConnection(answer)
+    monkeypatch.setattr(postgres_db, "engine", RecordingEngine(connection))
+    asyncio.run(postgres_db.create_missing_indexes())
+    return connection.statements
+
+
+def test_missing_indexes_are_built_concurrently(monkeypatch):
+    """Test that indexes are created concurrently except on partitioned tables."""
+    statements = _index_statements(monkeypatch, lambda sql, params: None)
+
+    assert statements[1].startswith("SELECT pg_advisory_lock")
+    assert statements[-1].startswith("SELECT pg_advisory_unlock")
+    assert any(
+        sql.startswith(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notification_user_unread"
+        )
+        for sql in statements
+    )
+    assert any(
+        sql.startswith("CREATE INDEX IF NOT EXISTS ix_activity_user_time")
+        for sql in statements
+    )
+
+
+def test_gin_indexes_wait_for_the_declared_column_type(monkeypatch):
+    """Test that a GIN index is skipped while its column has an older type."""
+
+    def answer(sql, params):
+        if "information_schema.columns" in sql:
+            if params["table"] == "notes":
+                return [("tags", "ARRAY")]
+            return [("tags", "character varying")]
+        return None
+
+    statements = _index_statements(monkeypatch, answer)
+
+    assert any("ix_notes_tags_gin" in sql for sql in statements)
+    assert not any("ix_flashcard_tags_gin" in sql for sql in statements)
+
+
+def test_failing_and_invalid_indexes_dont_stop_startup(monkeypatch):
+    """Test that invalid indexes are rebuilt and a failing one is skipped."""
+
+    def answer(sql, params):
+        if "NOT i.indisvalid" in sql:
+            return ["ix_notification_user_unread"]
+        if sql.startswith("CREATE INDEX") and "ix_activity_user_time" in sql:
+            raise RuntimeError("could not create index")
+        return None
+
+    statements = _index_statements(monkeypatch, answer)
+
+    drop = statements.index(
+        "DROP INDEX CONCURRENTLY IF EXISTS ix_notification_user_unread"
+    )
+    assert "ix_notification_user_unread" in statements[drop + 1]
+    # Indexes after the failing one are still created
+    failed = next(
+        i for i, sql in enumerate(statements) if "ix_activity_user_time" in sql
+    )
+    assert any(sql.startswith("CREATE INDEX") for sql in statements[failed + 1 :])
+    assert statements[-1].startswith("SELECT pg_advisory_unlock")